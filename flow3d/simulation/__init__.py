@@ -1,5 +1,9 @@
 from .base import SimulationBase
+from .cache import SimulationCache
+from .crop import SimulationCrop
+from .flslnk import SimulationFlslnk
 from .huggingface import SimulationHuggingFace
+from .manifest import SimulationManifest
 from .measurements import SimulationMeasurements
 from .name import SimulationName
 from .parameters import SimulationParameters
@@ -10,8 +14,10 @@ from .run import SimulationRun
 from .utils.compression import SimulationUtilsCompression
 from .utils.crop import SimulationUtilsCrop
 from .utils.decorators import SimulationUtilsDecorators
+from .utils.flslnk import SimulationUtilsFlslnk
 from .utils.mesh import SimulationUtilsMesh
 from .utils.multiprocessing import SimulationUtilsMultiprocessing
+from .utils.video import SimulationUtilsVideo
 from .view import SimulationView
 from .visualizations import SimulationVisualizations
 
@@ -19,7 +25,11 @@ class Simulation(
     SimulationBase,
     SimulationParameters,
 
+    SimulationCache,
+    SimulationCrop,
+    SimulationFlslnk,
     SimulationHuggingFace,
+    SimulationManifest,
     SimulationMeasurements,
     SimulationName,
     SimulationPostProcessing,
@@ -29,8 +39,10 @@ class Simulation(
     SimulationUtilsCompression,
     SimulationUtilsCrop,
     SimulationUtilsDecorators,
+    SimulationUtilsFlslnk,
     SimulationUtilsMesh,
     SimulationUtilsMultiprocessing,
+    SimulationUtilsVideo,
     SimulationView,
     SimulationVisualizations,
 ):
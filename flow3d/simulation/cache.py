@@ -0,0 +1,185 @@
+import json
+import numpy as np
+import os
+
+from tqdm import tqdm
+
+from flow3d.simulation.utils.decorators import SimulationUtilsDecorators
+
+class SimulationCache():
+    """
+    Methods for an uncompressed, memory mapped cache of `flslnk_npz` fields so
+    repeated analysis passes avoid decompressing the same files.
+    ```
+    simulation/
+    ├─ flslnk_cache/
+    │  ├─ manifest.json
+    │  ├─ temperature.npy   (t, z, y, x)
+    │  ├─ x_y_z.npy         (t, z, y, x, 3)
+    │  ├─ timestep.npy      (t,)
+    ...
+    ```
+    """
+
+    @staticmethod
+    def flslnk_npz_signature(npz_dir_path = "flslnk_npz"):
+        """
+        Summarizes `flslnk_npz` folder (or `flslnk_npz.zip` if not extracted)
+        by file size and modification time to detect changes, signing the
+        same source read by `iter_flslnk_npz`.
+        """
+        if os.path.isdir(npz_dir_path):
+            stats = [
+                os.stat(os.path.join(npz_dir_path, npz_file))
+                for npz_file in sorted(os.listdir(npz_dir_path))
+            ]
+            return {
+                "source": npz_dir_path,
+                "size": sum(stat.st_size for stat in stats),
+                "mtime_ns": max([stat.st_mtime_ns for stat in stats], default=0),
+                "files": len(stats),
+            }
+
+        zip_path = f"{npz_dir_path}.zip"
+        stat = os.stat(zip_path)
+        return {
+            "source": zip_path,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
+
+    def is_flslnk_cache_valid(
+        self,
+        keys = None,
+        npz_dir_path = "flslnk_npz",
+        cache_dir_path = "flslnk_cache",
+    ):
+        """
+        Checks that cache manifest matches the current `flslnk_npz` source
+        and contains the requested fields.
+        """
+        manifest = self.read_flslnk_cache_manifest(cache_dir_path)
+
+        if manifest is None:
+            return False
+
+        if manifest["signature"] != self.flslnk_npz_signature(npz_dir_path):
+            return False
+
+        if keys is not None and not set(keys).issubset(manifest["keys"]):
+            return False
+
+        return True
+
+    @staticmethod
+    def read_flslnk_cache_manifest(cache_dir_path = "flslnk_cache"):
+        """
+        Reads cache manifest, `None` if cache has not been built.
+        """
+        manifest_path = os.path.join(cache_dir_path, "manifest.json")
+
+        if not os.path.exists(manifest_path):
+            return None
+
+        with open(manifest_path, "r") as f:
+            return json.load(f)
+
+    @SimulationUtilsDecorators.change_working_directory
+    def cache_flslnk_fields(
+        self,
+        keys = None,
+        npz_dir_path = "flslnk_npz",
+        cache_dir_path = "flslnk_cache",
+        **kwargs,
+    ):
+        """
+        Materializes each field of `flslnk_npz` into a raw `.npy` file with
+        time as the first axis.
+
+        @param keys: Fields to cache -> None (all fields)
+        @param npz_dir_path: Folder of `.npz` files.
+        @param cache_dir_path: Output folder for cached `.npy` files.
+
+        @param working_dir: Sets working directory to `simulation.name`.
+        """
+        if not os.path.exists(cache_dir_path):
+            os.makedirs(cache_dir_path)
+
+        # Removes previous manifest so an interrupted cache is never valid.
+        manifest_path = os.path.join(cache_dir_path, "manifest.json")
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
+
+        # Reads `.npz` files from folder or directly from `flslnk_npz.zip`.
+        npz_files = self.list_flslnk_files(npz_dir_path)
+        examples = self.iter_flslnk_npz(npz_dir_path, keys = keys)
+
+        caches = {}
+        for index, npz_file, example in tqdm(examples, total=len(npz_files)):
+            for key, value in example.items():
+                # Values are stored with a leading axis of size 1.
+                if key not in caches:
+                    caches[key] = np.lib.format.open_memmap(
+                        os.path.join(cache_dir_path, f"{key}.npy"),
+                        mode="w+",
+                        dtype=value.dtype,
+                        shape=(len(npz_files), *value.shape[1:]),
+                    )
+
+                caches[key][index] = value[0]
+
+        for cache in caches.values():
+            cache.flush()
+
+        manifest = {
+            "signature": self.flslnk_npz_signature(npz_dir_path),
+            "keys": list(caches.keys()),
+            "length": len(npz_files),
+            "files": npz_files,
+        }
+
+        with open(manifest_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+
+        return self
+
+    @SimulationUtilsDecorators.change_working_directory
+    def load_flslnk_cache(
+        self,
+        keys = None,
+        npz_dir_path = "flslnk_npz",
+        cache_dir_path = "flslnk_cache",
+        **kwargs,
+    ):
+        """
+        Loads cached fields as read only memory maps, (re)building the cache
+        when it is missing or `flslnk_npz` has changed.
+
+        @param keys: Fields to load -> None (all cached fields)
+        @return: Dictionary of field name to `(t, ...)` memory mapped array.
+        """
+        if not self.is_flslnk_cache_valid(keys, npz_dir_path, cache_dir_path):
+            # Previously cached fields are kept alongside requested fields.
+            cache_keys = keys
+            manifest = self.read_flslnk_cache_manifest(cache_dir_path)
+            if keys is not None and manifest is not None:
+                cache_keys = manifest["keys"] + [
+                    key for key in keys if key not in manifest["keys"]
+                ]
+
+            print(f"Caching `{npz_dir_path}` fields to `{cache_dir_path}`...")
+            self.cache_flslnk_fields(
+                keys = cache_keys,
+                npz_dir_path = npz_dir_path,
+                cache_dir_path = cache_dir_path,
+                working_dir = ".",
+            )
+
+        if keys is None:
+            with open(os.path.join(cache_dir_path, "manifest.json"), "r") as f:
+                keys = json.load(f)["keys"]
+
+        return {
+            key: np.load(os.path.join(cache_dir_path, f"{key}.npy"), mmap_mode="r")
+            for key in keys
+        }
@@ -0,0 +1,189 @@
+import numpy as np
+import os
+import pandas as pd
+
+from tqdm import tqdm
+
+from flow3d.simulation.utils.decorators import SimulationUtilsDecorators
+
+class SimulationCrop():
+    """
+    Methods for cropping a fixed size window that follows the laser from each
+    timestep of `flslnk_npz` so downstream stages only process the region
+    around the melt pool.
+    ```
+    simulation/
+    ├─ flslnk_crops/
+    │  ├─ offsets.csv
+    │  ├─ temperature.npy   (t, z, y, x)
+    │  ├─ x_y_z.npy         (t, z, y, x, 3)
+    ...
+    ```
+    """
+
+    @SimulationUtilsDecorators.change_working_directory
+    def generate_laser_crops(
+        self,
+        window_x = (50, 10),
+        crop_y = None,
+        crop_z = None,
+        keys = None,
+        laser_start_x = None,
+        npz_dir_path = "flslnk_npz",
+        crop_dir_path = "flslnk_crops",
+        num_proc = 1,
+        **kwargs,
+    ):
+        """
+        Crops each timestep to a window of `x` cells around the laser, the
+        window is shifted to stay within the domain so all crops share the
+        same shape.
+
+        @param window_x: Cells (behind, ahead) of laser -> (50, 10)
+        @param crop_y: Fixed (start, end) `y` indexes -> None (all)
+        @param crop_z: Fixed (start, end) `z` indexes -> None (all)
+        @param keys: Fields to crop -> None (all fields)
+        @param laser_start_x: Starting `x` position of laser (cm) -> None
+        (`beam_x`)
+        @param num_proc: Number of processes cropping timesteps -> 1
+
+        @param working_dir: Sets working directory to `simulation.name`.
+        """
+        if laser_start_x is None:
+            laser_start_x = self.cgs("beam_x")
+
+        mesh_x = np.load("mesh_x_y_z.npz")["x"]
+
+        if not os.path.exists(crop_dir_path):
+            os.makedirs(crop_dir_path)
+
+        # Each worker loads and crops one `.npz` file.
+        npz_files = self.list_flslnk_files(npz_dir_path)
+        tasks = (
+            (
+                npz_dir_path,
+                npz_file,
+                mesh_x,
+                window_x,
+                crop_y,
+                crop_z,
+                keys,
+                laser_start_x,
+            )
+            for npz_file in npz_files
+        )
+        results = self.imap_ordered(
+            self.crop_flslnk_npz,
+            tasks,
+            num_proc = num_proc,
+        )
+
+        rows = []
+        crops = {}
+
+        for index, (row, cropped) in tqdm(enumerate(results), total=len(npz_files)):
+            for key, value in cropped.items():
+                if key not in crops:
+                    crops[key] = np.lib.format.open_memmap(
+                        os.path.join(crop_dir_path, f"{key}.npy"),
+                        mode="w+",
+                        dtype=value.dtype,
+                        shape=(len(npz_files), *value.shape),
+                    )
+
+                crops[key][index] = value
+
+            rows.append({"index": index, **row})
+
+        for crop in crops.values():
+            crop.flush()
+
+        offsets_df = pd.DataFrame(rows)
+        offsets_df.to_csv(os.path.join(crop_dir_path, "offsets.csv"), index=False)
+
+        return offsets_df
+
+    def crop_flslnk_npz(
+        self,
+        npz_dir_path,
+        npz_file,
+        mesh_x,
+        window_x = (50, 10),
+        crop_y = None,
+        crop_z = None,
+        keys = None,
+        laser_start_x = 0.06,
+    ):
+        """
+        Loads a single `.npz` file and crops its fields around the laser.
+
+        @return: Offsets row and dictionary of field to cropped array.
+        """
+        example = self.load_flslnk_npz(npz_dir_path, npz_file)
+
+        timestep = example["timestep"][0]
+        velocity = example["velocity"][0]
+        laser_x = self.x_distance(timestep, velocity, laser_start_x)
+
+        # Shifts window back within domain rather than shrinking it.
+        behind, ahead = window_x
+        laser_index = self.find_index(laser_x, mesh_x)
+        x_start = min(max(laser_index - behind, 0), max(len(mesh_x) - behind - ahead, 0))
+        x_end = x_start + behind + ahead
+
+        if keys is None:
+            keys = example.keys()
+
+        cropped = {}
+        for key in keys:
+            value = example[key]
+
+            # Metadata such as `timestep` is not cropped.
+            if np.ndim(value) < 4:
+                continue
+
+            cropped[key] = self.crop_3d_array(
+                value[0],
+                crop_x=(x_start, x_end),
+                crop_y=crop_y,
+                crop_z=crop_z,
+            )
+
+        row = {
+            "npz_file": npz_file,
+            "timestep": timestep,
+            "laser_x": laser_x,
+            "laser_index": laser_index,
+            "x_start": x_start,
+            "x_end": x_end,
+            "y_start": None if crop_y is None else crop_y[0],
+            "y_end": None if crop_y is None else crop_y[1],
+            "z_start": None if crop_z is None else crop_z[0],
+            "z_end": None if crop_z is None else crop_z[1],
+        }
+
+        return row, cropped
+
+    @SimulationUtilsDecorators.change_working_directory
+    def load_laser_crops(self, keys = None, crop_dir_path = "flslnk_crops", **kwargs):
+        """
+        Loads cropped fields as read only memory maps along with offsets.
+
+        @param keys: Fields to load -> None (all cropped fields)
+        @return: Dictionary of field to `(t, ...)` array, and offsets.
+        """
+        offsets_df = pd.read_csv(os.path.join(crop_dir_path, "offsets.csv"))
+
+        if keys is None:
+            keys = [
+                crop_file.split(".")[0]
+                for crop_file in sorted(os.listdir(crop_dir_path))
+                if crop_file.endswith(".npy")
+            ]
+
+        crops = {
+            key: np.load(os.path.join(crop_dir_path, f"{key}.npy"), mmap_mode="r")
+            for key in keys
+        }
+
+        return crops, offsets_df
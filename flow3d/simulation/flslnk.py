@@ -0,0 +1,197 @@
+import numpy as np
+import os
+import pandas as pd
+
+from tqdm import tqdm
+
+from flow3d.simulation.utils.decorators import SimulationUtilsDecorators
+
+class SimulationFlslnk():
+    """
+    Methods for random access of timesteps within `flslnk.tmp` without
+    converting the entire file.
+    ```
+    simulation/
+    ├─ flslnk.tmp
+    ├─ flslnk_index.csv
+    ...
+    ```
+    """
+
+    @SimulationUtilsDecorators.change_working_directory
+    def build_flslnk_index(
+        self,
+        flslnk_path = "flslnk.tmp",
+        index_path = "flslnk_index.csv",
+        **kwargs,
+    ):
+        """
+        Records the byte offset, byte length, time, and extents of every
+        timestep chunk within `flslnk.tmp` into a small `.csv` file, along
+        with the size and modification time of `flslnk.tmp` to detect when
+        offsets are stale.
+
+        @param flslnk_path: Path to `flslnk.tmp` file.
+        @param index_path: Output path of index file.
+
+        @param working_dir: Sets working directory to `simulation.name`.
+        """
+        # Seeking requires the unzipped file.
+        zip_path = f"{os.path.splitext(flslnk_path)[0]}.zip"
+        if not os.path.exists(flslnk_path) and \
+            os.path.exists(self.compressed_file_source(zip_path)):
+            self.unzip_file(zip_path, flslnk_path)
+
+        chunks = self.iter_flslnk_timestep_chunks(
+            self.iter_flslnk_chunk_offsets(flslnk_path)
+        )
+
+        stat = os.stat(flslnk_path)
+
+        rows = []
+        with open(flslnk_path, "rb") as f:
+            for chunk_index, offset, length in tqdm(chunks):
+                # Only the header lines are read from each chunk.
+                f.seek(offset)
+                header_lines = [f.readline().decode() for _ in range(3)]
+                metadata = self.parse_flslnk_chunk_header(header_lines)
+
+                rows.append({
+                    "chunk_index": chunk_index,
+                    "offset": offset,
+                    "length": length,
+                    "t": metadata["t"],
+                    "ix_start": metadata["ix"][0],
+                    "ix_end": metadata["ix"][1],
+                    "jy_start": metadata["jy"][0],
+                    "jy_end": metadata["jy"][1],
+                    "kz_start": metadata["kz"][0],
+                    "kz_end": metadata["kz"][1],
+                    "flslnk_size": stat.st_size,
+                    "flslnk_mtime_ns": stat.st_mtime_ns,
+                })
+
+        index_df = pd.DataFrame(rows)
+        index_df.to_csv(index_path, index=False)
+
+        return index_df
+
+    @SimulationUtilsDecorators.change_working_directory
+    def load_flslnk_index(
+        self,
+        flslnk_path = "flslnk.tmp",
+        index_path = "flslnk_index.csv",
+        rebuild = False,
+        **kwargs,
+    ):
+        """
+        Loads `flslnk_index.csv`, building it first if it does not exist or
+        `flslnk.tmp` has changed since it was built.
+
+        @param rebuild: Rebuilds index even if it exists -> False
+        """
+        if os.path.exists(index_path) and not rebuild:
+            index_df = pd.read_csv(index_path)
+
+            if self.is_flslnk_index_valid(index_df, flslnk_path):
+                return index_df
+
+            print(f"`{flslnk_path}` has changed, rebuilding `{index_path}`...")
+
+        return self.build_flslnk_index(
+            flslnk_path = flslnk_path,
+            index_path = index_path,
+            working_dir = ".",
+        )
+
+    @staticmethod
+    def is_flslnk_index_valid(index_df, flslnk_path = "flslnk.tmp"):
+        """
+        Checks that index was built from `flslnk.tmp` with the same size and
+        modification time.
+        """
+        if not os.path.exists(flslnk_path):
+            return False
+
+        if len(index_df) == 0 or "flslnk_size" not in index_df:
+            return False
+
+        stat = os.stat(flslnk_path)
+        return bool(
+            (index_df["flslnk_size"] == stat.st_size).all()
+            and (index_df["flslnk_mtime_ns"] == stat.st_mtime_ns).all()
+        )
+
+    @SimulationUtilsDecorators.change_working_directory
+    def read_flslnk_timestep(
+        self,
+        index,
+        flslnk_path = "flslnk.tmp",
+        index_path = "flslnk_index.csv",
+        **kwargs,
+    ):
+        """
+        Reads a single timestep by seeking directly to it within `flslnk.tmp`.
+
+        @param index: Position of timestep (0 is the first timestep).
+        @return: Dictionary with the same keys and shapes as `flslnk_npz` files.
+        """
+        index_df = self.load_flslnk_index(
+            flslnk_path = flslnk_path,
+            index_path = index_path,
+            working_dir = ".",
+        )
+        row = index_df.iloc[index]
+
+        return self.read_flslnk_indexed_chunk(flslnk_path, row)
+
+    @SimulationUtilsDecorators.change_working_directory
+    def read_flslnk_time_range(
+        self,
+        t_start = None,
+        t_end = None,
+        flslnk_path = "flslnk.tmp",
+        index_path = "flslnk_index.csv",
+        **kwargs,
+    ):
+        """
+        Reads timesteps with time `t` within `[t_start, t_end]`.
+
+        @param t_start: (Inclusive) Start time in seconds -> None (first)
+        @param t_end: (Inclusive) End time in seconds -> None (last)
+        @return: Generator of index and timestep dictionary.
+        """
+        index_df = self.load_flslnk_index(
+            flslnk_path = flslnk_path,
+            index_path = index_path,
+            working_dir = ".",
+        )
+
+        mask = np.ones(len(index_df), dtype=bool)
+        if t_start is not None:
+            mask &= (index_df["t"] >= t_start).to_numpy()
+        if t_end is not None:
+            mask &= (index_df["t"] <= t_end).to_numpy()
+
+        # Generator is consumed after working directory is reverted.
+        flslnk_path = os.path.abspath(flslnk_path)
+
+        def timesteps():
+            for index in np.flatnonzero(mask):
+                row = index_df.iloc[index]
+                yield int(index), self.read_flslnk_indexed_chunk(flslnk_path, row)
+
+        return timesteps()
+
+    def read_flslnk_indexed_chunk(self, flslnk_path, row):
+        """
+        Reads and parses chunk at the byte range of an index row.
+        """
+        chunk_lines = self.read_flslnk_chunk(
+            flslnk_path,
+            int(row["offset"]),
+            int(row["length"]),
+        )
+        row_dict = self.flslnk_chunk_to_numpy(chunk_lines)
+
+        return {key: np.array(value) for key, value in row_dict.items()}
@@ -1,7 +1,5 @@
-import numpy as np
 import os
 import shutil
-import zipfile
 
 from datasets import concatenate_datasets, Dataset, load_from_disk
 from huggingface_hub import HfApi
@@ -17,6 +15,18 @@ class SimulationHuggingFace():
     """
 
     @SimulationUtilsDecorators.change_working_directory 
+    @SimulationUtilsDecorators.stage_manifest(
+        "dataset",
+        inputs = lambda self, arguments: [
+            f"{arguments['npz_dir_path']}.zip",
+            arguments["npz_dir_path"],
+        ],
+        outputs = lambda self, arguments: [
+            *([f"{arguments['dataset_path']}.zip"] if arguments["zip_output"] else []),
+            *([] if arguments["delete_output"] else [arguments["dataset_path"]]),
+        ],
+        parameters = ["dataset_path", "zip_output", "compression", "compresslevel"],
+    )
     def create_flslnk_dataset(
         self,
         npz_dir_path = "flslnk_npz",
@@ -24,27 +34,24 @@ class SimulationHuggingFace():
         delete_output = True,
         delete_source = True,
         zip_output = True,
+        compression = "deflate",
+        compresslevel = None,
         **kwargs
     ):
-        # Unzip npz files
-        if not os.path.exists(npz_dir_path):
-            if os.path.exists(f"{npz_dir_path}.zip"):
-                os.makedirs(npz_dir_path)
-                with zipfile.ZipFile(f"{npz_dir_path}.zip", "r") as zip_ref:
-                    zip_ref.extractall(npz_dir_path)
-            else:
-                raise FileNotFoundError(f"`{npz_dir_path}.zip` file not found")
+        """
+        Creates a HuggingFace dataset from `flslnk_npz` files.
 
-        # Generate and concatenate datasets.
-        npz_data_listdir = sorted(os.listdir(npz_dir_path))
+        @param compression: Codec used to zip output (see `zip_folder`)
+        @param compresslevel: Codec specific compression level -> None
+        @param force: Runs even if `dataset` manifest is up to date -> False
 
+        @param working_dir: Sets working directory to `simulation.name`.
+        """
+        # Generate and concatenate datasets, `.npz` files are read directly
+        # from `flslnk_npz.zip` if not already unzipped.
         dataset = None
 
-        for npz_file in tqdm(npz_data_listdir):
-            npz_file_path = os.path.join(npz_dir_path, npz_file)
-
-            row_dict = np.load(npz_file_path)
-
+        for index, npz_file, row_dict in tqdm(self.iter_flslnk_npz(npz_dir_path)):
             time_step_dataset = Dataset.from_dict(row_dict)
 
             if dataset is None:
@@ -56,9 +63,14 @@ class SimulationHuggingFace():
 
         if zip_output:
             print(f"Zipping `{dataset_path}` folder...")
-            shutil.make_archive(dataset_path, "zip", dataset_path)
-
-        if delete_source:
+            self.zip_folder(
+                dataset_path,
+                f"{dataset_path}.zip",
+                compression = compression,
+                compresslevel = compresslevel,
+            )
+
+        if delete_source and os.path.isdir(npz_dir_path):
             print(f"Deleting `{npz_dir_path}` source folder")
             shutil.rmtree(npz_dir_path)
 
@@ -85,13 +97,7 @@ class SimulationHuggingFace():
         **kwargs
     ):
         # Unzip dataset files
-        if not os.path.exists(dataset_path):
-            if os.path.exists(f"{dataset_path}.zip"):
-                os.makedirs(dataset_path)
-                with zipfile.ZipFile(f"{dataset_path}.zip", "r") as zip_ref:
-                    zip_ref.extractall(dataset_path)
-            else:
-                raise FileNotFoundError(f"`{dataset_path}.zip` file not found")
+        self.unzip_folder(f"{dataset_path}.zip", dataset_path)
 
         # Load dataset from disk
         dataset = load_from_disk(dataset_path, keep_in_memory=keep_in_memory)
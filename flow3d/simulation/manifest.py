@@ -0,0 +1,234 @@
+import hashlib
+import json
+import os
+import time
+
+from contextlib import contextmanager
+
+# Folder within simulation holding one `{stage}.json` manifest per stage.
+MANIFEST_DIR_PATH = "manifests"
+
+# Stages in order of the post processing pipeline.
+STAGES = [
+    "runhyd",
+    "guipost",
+    "chunk_flslnk",
+    "flslnk_chunk_to_npz",
+    "flslnk_to_npz",
+    "views",
+    "visualizations",
+    "measurements",
+    "dataset",
+]
+
+class SimulationManifest():
+    """
+    Methods for recording a manifest of each post processing stage so reruns
+    skip stages with unchanged inputs and parameters, and partially completed
+    stages resume at the last finished timestep.
+    ```
+    simulation/
+    ├─ manifests/
+    │  ├─ runhyd.json
+    │  ├─ flslnk_chunk_to_npz.json
+    ...
+    ```
+
+    Inputs are identified by file size and modification time rather than
+    file contents, which would require reading every output of the
+    simulation.
+    """
+
+    @staticmethod
+    def stat_signature(path):
+        """
+        Summarizes file (or all files within folder) by size and modification
+        time, `None` if path does not exist.
+        """
+        if os.path.isfile(path):
+            stat = os.stat(path)
+            return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+        if os.path.isdir(path):
+            size, mtime_ns, files = 0, 0, 0
+            for root, _, file_names in os.walk(path):
+                for file_name in file_names:
+                    stat = os.stat(os.path.join(root, file_name))
+                    size += stat.st_size
+                    mtime_ns = max(mtime_ns, stat.st_mtime_ns)
+                    files += 1
+            return {"size": size, "mtime_ns": mtime_ns, "files": files}
+
+    def stage_inputs_signature(self, inputs):
+        """
+        Signature of each input path along with a hash of all signatures.
+        """
+        signatures = {path: self.stat_signature(path) for path in inputs}
+        signature_hash = hashlib.sha256(
+            json.dumps(signatures, sort_keys=True).encode()
+        ).hexdigest()
+
+        return signatures, signature_hash
+
+    @staticmethod
+    def stage_manifest_path(stage, simulation_dir_path = "."):
+        return os.path.join(simulation_dir_path, MANIFEST_DIR_PATH, f"{stage}.json")
+
+    def read_stage_manifest(self, stage, simulation_dir_path = "."):
+        """
+        Reads manifest of stage, `None` if stage has not been started.
+        """
+        manifest_path = self.stage_manifest_path(stage, simulation_dir_path)
+
+        if not os.path.exists(manifest_path):
+            return None
+
+        with open(manifest_path, "r") as f:
+            return json.load(f)
+
+    def write_stage_manifest(self, stage, manifest):
+        """
+        Writes manifest through a temporary file so an interrupted write never
+        leaves a partial manifest.
+        """
+        manifest_path = self.stage_manifest_path(stage)
+        os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+
+        with open(f"{manifest_path}.tmp", "w") as f:
+            json.dump(manifest, f, indent=2)
+
+        os.replace(f"{manifest_path}.tmp", manifest_path)
+
+    def is_stage_manifest_current(self, manifest, inputs, parameters):
+        """
+        Checks that manifest was recorded with the same parameters and inputs.
+        Only inputs present both now and when recorded are compared, so inputs
+        removed (i.e. `delete_source`) or extracted (i.e. `flslnk.tmp` from
+        `flslnk.zip`) during the stage are not considered changed.
+        """
+        if manifest is None:
+            return False
+
+        # Compares parameters as they were serialized to the manifest.
+        if manifest["parameters"] != json.loads(json.dumps(parameters, default=str)):
+            return False
+
+        signatures, signature_hash = self.stage_inputs_signature(inputs)
+        if signature_hash == manifest["inputs_hash"]:
+            return True
+
+        for path, signature in signatures.items():
+            recorded = manifest["inputs"].get(path)
+            if signature is not None and recorded is not None and signature != recorded:
+                return False
+
+        return True
+
+    def is_stage_completed(self, stage, inputs, parameters, outputs):
+        """
+        Checks if stage completed with unchanged inputs and parameters and its
+        outputs still exist.
+        """
+        manifest = self.read_stage_manifest(stage)
+
+        if manifest is None or not manifest["completed"]:
+            return False
+
+        if not all(os.path.exists(output) for output in outputs):
+            return False
+
+        return self.is_stage_manifest_current(manifest, inputs, parameters)
+
+    def begin_stage(self, stage, inputs, parameters):
+        """
+        Records stage as started, keeping progress of a previous incomplete
+        attempt with the same inputs and parameters.
+        """
+        manifest = self.read_stage_manifest(stage)
+        progress = 0
+
+        if self.is_stage_manifest_current(manifest, inputs, parameters) and \
+            not manifest["completed"]:
+            progress = manifest["progress"]
+
+        signatures, signature_hash = self.stage_inputs_signature(inputs)
+        self.write_stage_manifest(stage, {
+            "stage": stage,
+            "completed": False,
+            "progress": progress,
+            "inputs": signatures,
+            "inputs_hash": signature_hash,
+            "parameters": json.loads(json.dumps(parameters, default=str)),
+            "outputs": {},
+            "started_at": time.time(),
+            "completed_at": None,
+        })
+
+    def read_stage_progress(self, stage):
+        """
+        Number of timesteps finished by current or previous attempt of stage.
+        """
+        manifest = self.read_stage_manifest(stage)
+
+        if manifest is None:
+            return 0
+
+        return manifest["progress"]
+
+    def update_stage_progress(self, stage, progress, manifest = None):
+        """
+        Records number of finished timesteps of stage.
+
+        @param manifest: Manifest of stage already read -> None (read)
+        """
+        if manifest is None:
+            manifest = self.read_stage_manifest(stage)
+        manifest["progress"] = progress
+        self.write_stage_manifest(stage, manifest)
+
+    def complete_stage(self, stage, outputs):
+        """
+        Records stage as completed with signatures of its outputs, stage is
+        left incomplete if an output is missing.
+        """
+        manifest = self.read_stage_manifest(stage)
+        manifest["outputs"] = {output: self.stat_signature(output) for output in outputs}
+        manifest["completed"] = all(
+            signature is not None for signature in manifest["outputs"].values()
+        )
+        manifest["completed_at"] = time.time() if manifest["completed"] else None
+        self.write_stage_manifest(stage, manifest)
+
+    @contextmanager
+    def track_stage_progress(self, stage, results, start = 0, interval = 10):
+        """
+        Passes through ordered results, counting each result as finished once
+        it has been consumed (i.e. written) and the next one is requested.
+        Manifest is kept in memory and progress is written at most every
+        `interval` seconds, and once more when the context exits (including
+        on error).
+        ```
+        with self.track_stage_progress(stage, results) as results:
+            for result in results:
+                ...
+        ```
+
+        @param interval: Minimum seconds between manifest writes -> 10
+        """
+        manifest = self.read_stage_manifest(stage)
+        progress = {"finished": start, "written_at": time.monotonic()}
+
+        def tracked():
+            for result in results:
+                yield result
+                progress["finished"] += 1
+
+                if time.monotonic() - progress["written_at"] >= interval:
+                    self.update_stage_progress(stage, progress["finished"], manifest)
+                    progress["written_at"] = time.monotonic()
+
+        try:
+            yield tracked()
+        finally:
+            if manifest["progress"] != progress["finished"]:
+                self.update_stage_progress(stage, progress["finished"], manifest)
@@ -2,32 +2,46 @@ import numpy as np
 import os
 import pandas as pd
 
+from scipy import ndimage
 from skimage import measure
 from tqdm import tqdm
 
 from flow3d.simulation.utils.decorators import SimulationUtilsDecorators
+from flow3d.simulation.utils.mesh import SimulationUtilsMesh
 
 # TODO: Handle with class (maybe parameters)
+# Values above `threshold` (or strictly within a (lower, upper) band) are
+# measured, defaults to the lower `clim`. Fields with a `None` threshold are
+# not measured.
 COLUMNS_CONFIG = {
     "pressure": {
         "cmap": "viridis",
         "clim": [0, 10000],
+        # Not measured until a recoil pressure threshold is checked against
+        # simulation output, any fluid cell with hydrostatic head is above
+        # ambient (`pvoid`, 1.013e6 dyn/cm^2).
+        "threshold": None,
         "title": "Pressure"
     },
     "temperature": {
         "cmap": "plasma",
         # "clim": [1873, 5000], # Ti-6Al-4V
         "clim":[1697, 3000], # SS316L
+        "threshold": 1697,
         "title": "Temperature"
     },
     "fraction_of_fluid": {
         "cmap": "viridis",
         "clim": [0, 1],
+        # Partially filled cells along the free surface.
+        "threshold": (0, 1),
         "title": "Fraction of Fluid"
     },
     "liquid_label": {
         "cmap": "viridis",
         "clim": [0, 100],
+        # Labels identify liquid regions rather than magnitudes.
+        "threshold": None,
         "title": "Liquid Label"
     },
 }
@@ -42,16 +56,17 @@ class SimulationMeasurements():
         self,
         npz_dir_path = "flslnk_npz",
         regenerate_mesh_x_y_z = False,
+        unzip_npz = False,
         **kwargs,
     ):
         """
-        Initialize view folders, unzip npz folder, and create `mesh_x_y_z` file.
+        Initialize view folders and create `mesh_x_y_z` file, `.npz` files are
+        read directly from `flslnk_npz.zip` unless `unzip_npz` is set.
         ```
         simulation/
         ├─ measurements/
         │  ├─ melt_pool/
         │  │  ├─ fraction_of_fluid/
-        │  │  ├─ liquid_label/
         │  │  ├─ pressure/
         │  │  ├─ temperature/
         │  │  │  ├─ 00000001.npz
@@ -68,160 +83,528 @@ class SimulationMeasurements():
             if not os.path.exists(f"measurements/{subfolder}"):
                 os.makedirs(f"measurements/{subfolder}")
 
-            for key in COLUMNS_CONFIG.keys():
+            for key in self.melt_pool_thresholds().keys():
                 if not os.path.exists(f"measurements/{subfolder}/{key}"):
                     os.makedirs(f"measurements/{subfolder}/{key}")
 
-        # Unzip npz files
-        self.unzip_folder(f"{npz_dir_path}.zip", npz_dir_path)
+        # `.npz` files are read directly from `flslnk_npz.zip` unless unzipped.
+        if unzip_npz:
+            self.unzip_folder(f"{npz_dir_path}.zip", npz_dir_path)
 
         # Check if `mesh_x_y_z.npz exists` and create if not existant
         if not os.path.exists(f"mesh_x_y_z.npz") or regenerate_mesh_x_y_z:
             self.generate_mesh_x_y_z(npz_dir_path = npz_dir_path)
 
     @SimulationUtilsDecorators.change_working_directory 
+    @SimulationUtilsDecorators.stage_manifest(
+        "measurements",
+        inputs = lambda self, arguments: [
+            f"{arguments['npz_dir_path']}.zip",
+            arguments["npz_dir_path"],
+            "mesh_x_y_z.npz",
+        ],
+        outputs = lambda self, arguments: [
+            f"measurements/melt_pool/{key}.csv"
+            for key in self.melt_pool_thresholds().keys()
+        ],
+        parameters = ["npz_dir_path", "label_output"],
+    )
     def generate_melt_pool_measurements(
         self,
         npz_dir_path = "flslnk_npz",
         num_proc = 1,
+        batch_size = 64,
+        maxtasksperchild = None,
+        label_output = "full",
         **kwargs,
     ):
         """
         Provides depth, width, and length measurements of melt pool based on
         output ("pressure", "temperature", "fraction_of_fluid") threshold.
+
+        @param num_proc: Number of processes measuring timesteps -> 1
+        @param batch_size: Timesteps measured at once by each process -> 64
+        @param maxtasksperchild: Batches measured before a worker is replaced.
+        @param label_output: Labels saved per timestep, "full" label images,
+        "rle" run length encoded largest blob masks, or "none" -> "full"
+        @param force: Runs even if `measurements` manifest is up to date ->
+        False
         """
         print(f"""\n
 ################################################################################
 Measurements: `{self.name}`
 ################################################################################
 """)
-        # #TODO: Add checks
-        # if num_proc > 1:
-        #     with multiprocessing.Pool(processes=num_proc) as pool:
+        self.generate_melt_pool_dimensions(
+            npz_dir_path = npz_dir_path,
+            num_proc = num_proc,
+            batch_size = batch_size,
+            maxtasksperchild = maxtasksperchild,
+            label_output = label_output,
+        )
+
+        return self
+
+    def generate_melt_pool_dimensions(
+        self,
+        npz_dir_path = "flslnk_npz",
+        num_proc = 1,
+        batch_size = 64,
+        maxtasksperchild = None,
+        label_output = "full",
+    ):
+        """
+        Provides depth, width, and length measurements of melt pool based on
+        output ("pressure", "temperature", "fraction_of_fluid") threshold.
 
+        Batches of timesteps are measured in parallel and rows are collected
+        in timestep order, so output is the same for any `num_proc`.
 
-        #         for index, npz_file in tqdm(enumerate(sorted(os.listdir(npz_dir_path)))):
-        #             npz_data = np.load(f"{npz_dir_path}/{npz_file}")
-        #             example = {key: npz_data[key] for key in npz_data.keys()}
-        #             pool.apply_async(
-        #                 self.generate_melt_pool_dimensions,
-        #                 args=(example, index),
-        #                 error_callback=self.error_callback,
-        #             )
-        #         pool.close()
-        #         pool.join()
+        @param num_proc: Number of processes measuring batches -> 1
+        @param batch_size: Timesteps thresholded and labeled at once, limits
+        memory used by each process -> 64
+        @param maxtasksperchild: Batches measured before a worker is replaced.
+        @param label_output: Labels saved per timestep, see
+        `save_melt_pool_labels` -> "full"
+        """
+        batches = self.list_flslnk_batches(npz_dir_path, batch_size)
+
+        # All fields of a timestep are measured from a single load.
+        thresholds = self.melt_pool_thresholds()
+
+        # Mesh ticks map voxels to physical coordinates for 3D metrics.
+        mesh_x_y_z = dict(np.load("mesh_x_y_z.npz"))
+
+        # Each worker loads its own batch of `.npz` files.
+        tasks = (
+            (npz_dir_path, batch_npz_files, thresholds, mesh_x_y_z, label_output)
+            for batch_npz_files in batches
+        )
+        results = self.imap_ordered(
+            self.measure_melt_pool_npz,
+            tasks,
+            num_proc = num_proc,
+            maxtasksperchild = maxtasksperchild,
+        )
+
+        data_rows = {key: [] for key in thresholds.keys()}
+        for batch_rows in tqdm(results, total=len(batches)):
+            for key, rows in batch_rows.items():
+                data_rows[key].extend(rows)
+
+        for key, rows in data_rows.items():
+            dimensions_df = pd.DataFrame(rows)
+
+            # Save dimensions as csv
+            dimensions_df.to_csv(f"measurements/melt_pool/{key}.csv")
 
-        # else:
+    def measure_melt_pool_npz(
+        self,
+        npz_dir_path,
+        npz_files,
+        thresholds,
+        mesh_x_y_z = None,
+        label_output = "full",
+    ):
+        """
+        Measures melt pool of each field for a batch of `.npz` files and saves
+        labels of each timestep to `measurements/melt_pool/{key}/{timestep}.npz`.
+
+        @param npz_dir_path: Folder of `.npz` files.
+        @param npz_files: List of `.npz` file names within batch.
+        @param thresholds: Dictionary of field to threshold, values above
+        threshold (or within band) are measured, i.e. {"temperature": 1697}
+        @param mesh_x_y_z: Dictionary of `x`, `y`, and `z` ticks (cm) for 3D
+        metrics -> None (not measured)
+        @param label_output: "full", "rle", or "none" -> "full"
+        @return: Dictionary of field to list of measurement rows.
+        """
+        batch = self.load_flslnk_npz_batch(
+            npz_dir_path,
+            npz_files,
+            keys = [*thresholds.keys(), "power", "velocity"],
+        )
+
+        data_rows = {}
+
+        for key, threshold in thresholds.items():
+            measured, planes, metrics = self.measure_melt_pool_batch(
+                batch[key],
+                threshold,
+                mesh_x_y_z,
+            )
+
+            data_rows[key] = []
+
+            for index in np.flatnonzero(measured):
+                timestep = npz_files[index].split(".")[0]
+
+                min_row, min_col, max_row, max_col = planes["xy"]["bbox"][index]
+                width_px = int(max_row - min_row)
+                length_px = int(max_col - min_col)
+
+                min_row, min_col, max_row, max_col = planes["xz"]["bbox"][index]
+                depth_px = int(max_row - min_row)
+
+                data_dict = {
+                    "timestep": timestep,
+                    "beam_diameter": self.beam_diameter,
+                    "mesh_size": self.mesh_size,
+
+                    # Change to `self.material` when implemented
+                    "material": self.template_id,
+                    "power": batch["power"][index],
+                    "velocity": batch["velocity"][index],
+                    "depth_m": depth_px * self.mesh_size,
+                    "depth_px": depth_px,
+                    "length_m": length_px * self.mesh_size,
+                    "length_px": length_px,
+                    "width_m": width_px * self.mesh_size,
+                    "width_px": width_px,
+                    **{
+                        column: values[index]
+                        for column, values in metrics.items()
+                    },
+                }
+
+                data_rows[key].append(data_dict)
+                self.save_melt_pool_labels(
+                    f"measurements/melt_pool/{key}/{timestep}.npz",
+                    {
+                        plane: {
+                            name: value[index] for name, value in labels.items()
+                        }
+                        for plane, labels in planes.items()
+                    },
+                    label_output,
+                )
 
-        self.generate_melt_pool_dimensions(npz_dir_path = npz_dir_path)
+        return data_rows
 
-    def generate_melt_pool_dimensions(self, npz_dir_path = "flslnk_npz"):
+    @staticmethod
+    def save_melt_pool_labels(path, planes, label_output = "full"):
         """
-        Provides depth, width, and length measurements of melt pool based on
-        output ("pressure", "temperature", "fraction_of_fluid") threshold.
+        Saves labels of a single timestep.
+
+        @param path: Output `.npz` path.
+        @param planes: Dictionary of plane ("xy", "xz") to `labels_all`,
+        `labels_max_blob`, and `bbox` of timestep.
+        @param label_output: "full" saves label images, "rle" saves bounding
+        box and run length encoded largest blob mask, "none" saves nothing,
+        labels are regenerated with `load_melt_pool_labels` -> "full"
+        """
+        if label_output == "none":
+            return
+
+        skimage_dict = {}
+        for plane, labels in planes.items():
+            skimage_dict[f"bbox_{plane}"] = tuple(labels["bbox"])
+
+            if label_output == "full":
+                skimage_dict[f"labels_all_{plane}"] = labels["labels_all"]
+                skimage_dict[f"labels_max_blob_{plane}"] = labels["labels_max_blob"]
+
+            elif label_output == "rle":
+                mask = labels["labels_max_blob"]
+                skimage_dict[f"shape_{plane}"] = mask.shape
+                skimage_dict[f"rle_max_blob_{plane}"] = SimulationMeasurements.encode_rle(mask)
+
+            else:
+                raise ValueError(f"Label output `{label_output}` not supported")
+
+        np.savez_compressed(path, **skimage_dict)
+
+    @SimulationUtilsDecorators.change_working_directory
+    def load_melt_pool_labels(
+        self,
+        key,
+        timestep,
+        labels_all = True,
+        npz_dir_path = "flslnk_npz",
+        **kwargs,
+    ):
+        """
+        Loads labels of a single timestep saved by `generate_melt_pool_dimensions`,
+        decoding run length encoded masks and regenerating labels from the
+        `flslnk_npz` timestep when they were not saved.
+
+        @param key: Measured field, i.e. "temperature"
+        @param timestep: Timestep string, i.e. "00000001"
+        @param labels_all: Also provides `labels_all` images -> True
+        @return: Dictionary with the same keys as "full" label output.
+        """
+        path = f"measurements/melt_pool/{key}/{timestep}.npz"
+
+        labels = {}
+        if os.path.exists(path):
+            with np.load(path) as npz_data:
+                labels = {name: npz_data[name] for name in npz_data.keys()}
+
+        for plane in ["xy", "xz"]:
+            if f"rle_max_blob_{plane}" in labels:
+                labels[f"labels_max_blob_{plane}"] = SimulationMeasurements.decode_rle(
+                    labels.pop(f"rle_max_blob_{plane}"),
+                    labels.pop(f"shape_{plane}"),
+                )
+
+        required = ["labels_max_blob_xy", "labels_max_blob_xz"]
+        if labels_all:
+            required += ["labels_all_xy", "labels_all_xz"]
+
+        if all(name in labels for name in required):
+            return labels
+
+        # Regenerates labels from source timestep.
+        example = self.load_flslnk_npz(npz_dir_path, f"{timestep}.npz", keys = [key])
+        measured, planes, _ = self.measure_melt_pool_batch(
+            example[key],
+            self.melt_pool_thresholds()[key],
+        )
+
+        labels = {}
+        for plane, plane_labels in planes.items():
+            labels[f"bbox_{plane}"] = tuple(plane_labels["bbox"][0])
+            labels[f"labels_all_{plane}"] = plane_labels["labels_all"][0]
+            labels[f"labels_max_blob_{plane}"] = plane_labels["labels_max_blob"][0]
+
+        return labels
+
+    @staticmethod
+    def encode_rle(mask):
+        """
+        Run length encodes a binary mask in row major order, runs alternate
+        between 0 and 1 starting with 0.
+        """
+        flat = np.asarray(mask).ravel().astype(np.int8)
+        changes = np.flatnonzero(np.diff(flat)) + 1
+        runs = np.diff(np.concatenate([[0], changes, [flat.size]]))
+
+        # First run is always of zeros, even if empty.
+        if flat.size and flat[0]:
+            runs = np.concatenate([[0], runs])
+
+        return runs.astype(np.int64)
+
+    @staticmethod
+    def decode_rle(runs, shape):
+        """
+        Decodes `encode_rle` runs into a mask of 0 and 1 of `shape`.
+        """
+        values = np.arange(len(runs)) % 2
+        return np.repeat(values, runs).reshape(tuple(shape))
+
+    @staticmethod
+    def melt_pool_thresholds():
         """
+        Thresholds of measured `COLUMNS_CONFIG` fields.
+
+        @return: Dictionary of field to threshold or (lower, upper) band.
+        """
+        thresholds = {}
 
         for key, configs in COLUMNS_CONFIG.items():
+            threshold = configs.get("threshold", configs["clim"][0])
+            if threshold is not None:
+                thresholds[key] = threshold
 
-            data_rows = []
+        return thresholds
 
-            if key == "temperature":
+    @staticmethod
+    def threshold_values(values, threshold):
+        """
+        Values above threshold, or strictly within a (lower, upper) band.
+        """
+        if isinstance(threshold, (tuple, list)):
+            lower, upper = threshold
+            return (values > lower) & (values < upper)
 
-                for npz_file in tqdm(sorted(os.listdir(npz_dir_path))):
-                    timestep = npz_file.split(".")[0]
+        return values > threshold
 
-                    npz_data = np.load(f"{npz_dir_path}/{npz_file}")
-                    example = {key: npz_data[key] for key in npz_data.keys()}
+    @staticmethod
+    def measure_melt_pool_batch(values, threshold, mesh_x_y_z = None):
+        """
+        Thresholds `(t, z, y, x)` values and labels the largest blob within
+        the `xy` (top) and `xz` (side) projections of every timestep at once.
+
+        @param values: Array of `(t, z, y, x)` values.
+        @param threshold: Values above threshold (or strictly within a
+        (lower, upper) band) are within the melt pool.
+        @param mesh_x_y_z: Dictionary of `x`, `y`, and `z` ticks (cm) for 3D
+        metrics -> None (not measured)
+        @return: Mask of measured timesteps, dictionary of plane ("xy", "xz")
+        to `labels_all`, `labels_max_blob`, and `bbox` arrays, and dictionary
+        of 3D metric columns.
+        """
+        thresholded = SimulationMeasurements.threshold_values(values, threshold)
 
-                    power, velocity = example["power"][0], example["velocity"][0]
+        # Timesteps entirely below (or above) threshold are not measured.
+        measured = thresholded.any(axis=(1, 2, 3)) & ~thresholded.all(axis=(1, 2, 3))
 
-                    thresholded_data = np.copy(npz_data[key]).squeeze()
-                    thresholded_data[thresholded_data <= configs["clim"][0]] = 0
-                    thresholded_data[thresholded_data > configs["clim"][0]] = 1
-                    thresholded_data_unique = np.unique(thresholded_data)
+        planes = {}
 
-                    if len(thresholded_data_unique) > 1:
-                        
-                        data_dict = {
-                            "timestep": timestep,
-                            "beam_diameter": self.beam_diameter,
-                            "mesh_size": self.mesh_size,
+        # Projects along `z` for the xy plane and along `y` for the xz plane.
+        for plane, axis in [("xy", 1), ("xz", 2)]:
+            projections = np.flip(thresholded.any(axis=axis), axis=(1, 2))
+            planes[plane] = SimulationMeasurements.label_max_blobs(projections)
 
-                            # Change to `self.material` when implemented
-                            "material": self.template_id,
-                            "power": power,
-                            "velocity": velocity,
-                            "depth_m": None,
-                            "depth_px": None,
-                            "length_m": None,
-                            "length_px": None,
-                            "width_m": None,
-                            "width_px": None,
-                        }
+        metrics = {}
+        if mesh_x_y_z is not None:
+            metrics = SimulationMeasurements.measure_melt_pool_3d(
+                thresholded,
+                mesh_x_y_z,
+                measured,
+            )
 
-                        skimage_dict = {
-                            "bbox_xy": (None, None, None, None),
-                            "bbox_xz": (None, None, None, None),
-                            "labels_all_xy": None,
-                            "labels_all_xz": None,
-                            "labels_max_blob_xy": None,
-                            "labels_max_blob_xz": None,
-                        }
+        return measured, planes, metrics
 
-                        # `0` is xy plane `1` is xz plane
-                        for axis in [0, 1]:
-                        
-                            # Sum data along axis and apply threshold and transformations
-                            thresholded_data_sum = np.sum(thresholded_data, axis = axis)
-                            thresholded_data_sum = np.where(thresholded_data_sum > 0, 1, 0)
-                            thresholded_data_sum = np.flip(thresholded_data_sum, axis=(0, 1))
-
-                            # Measure and label blob regions
-                            labels_all = measure.label(thresholded_data_sum)
-                            regionprops = measure.regionprops(labels_all)
-
-                            # Find the blob with the maximum area
-                            blob_max_area = 0
-                            for index, blob in enumerate(regionprops):
-                                if blob.area > blob_max_area:
-                                    blob_max_area_index = index
-                                    blob_max_area = blob.area
-
-                            blob_max = regionprops[blob_max_area_index]
-
-                            # Remove other smaller blobs
-                            labels_max_blob = np.where(labels_all == blob_max.label, 1, 0)
-
-                            # Get the bounding box of the largest blob
-                            min_row, min_col, max_row, max_col = blob_max.bbox
-                            bbox_width = max_col - min_col
-                            bbox_height = max_row - min_row
-
-                            if axis == 0:
-                                data_dict["width_m"] = bbox_height * self.mesh_size
-                                data_dict["width_px"] = bbox_height
-                                data_dict["length_m"] = bbox_width * self.mesh_size
-                                data_dict["length_px"] = bbox_width
-
-                                skimage_dict["bbox_xy"] = (min_row, min_col, max_row, max_col)
-                                skimage_dict["labels_all_xy"] = labels_all
-                                skimage_dict["labels_max_blob_xy"] = labels_max_blob
-
-                            if axis == 1:
-                                data_dict["depth_m"] = bbox_height * self.mesh_size
-                                data_dict["depth_px"] = bbox_height
-
-                                skimage_dict["bbox_xz"] = (min_row, min_col, max_row, max_col)
-                                skimage_dict["labels_all_xz"] = labels_all
-                                skimage_dict["labels_max_blob_xz"] = labels_max_blob
-
-                        data_rows.append(data_dict)
-                        np.savez_compressed(
-                            f"measurements/melt_pool/{key}/{timestep}.npz",
-                            **skimage_dict
-                        )
-
-            dimensions_df = pd.DataFrame(data_rows)
+    @staticmethod
+    def measure_melt_pool_3d(thresholded, mesh_x_y_z, measured = None):
+        """
+        Measures volume, surface area, centroid, and extents of thresholded
+        voxels using the cell sizes of the (possibly non-uniform) mesh.
+
+        @param thresholded: Binary array of `(t, z, y, x)`.
+        @param mesh_x_y_z: Dictionary of `x`, `y`, and `z` ticks (cm).
+        @param measured: Mask of timesteps to compute surface area for -> None
+        (timesteps with a surface)
+        @return: Dictionary of metric to `(t,)` array in meters.
+        """
+        if measured is None:
+            measured = thresholded.any(axis=(1, 2, 3)) & ~thresholded.all(axis=(1, 2, 3))
+
+        # Converts from cm to m.
+        ticks = {axis: np.asarray(mesh_x_y_z[axis]) * 1E-2 for axis in "xyz"}
+        edges = {
+            axis: SimulationUtilsMesh.mesh_cell_edges(ticks[axis])
+            for axis in "xyz"
+        }
+        dx, dy, dz = [np.diff(edges[axis]) for axis in "xyz"]
+
+        thresholded_float = thresholded.astype(np.float64)
+
+        volume = np.einsum("tzyx,z,y,x->t", thresholded_float, dz, dy, dx)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            centroid_x = np.einsum(
+                "tzyx,z,y,x->t", thresholded_float, dz, dy, dx * ticks["x"]
+            ) / volume
+            centroid_y = np.einsum(
+                "tzyx,z,y,x->t", thresholded_float, dz, dy * ticks["y"], dx
+            ) / volume
+            centroid_z = np.einsum(
+                "tzyx,z,y,x->t", thresholded_float, dz * ticks["z"], dy, dx
+            ) / volume
+
+        # Extent between outer cell edges of thresholded voxels along axis.
+        def extent(axis, sum_axes):
+            occupied = thresholded.any(axis=sum_axes)
+            size = occupied.shape[1]
+            start = occupied.argmax(axis=1)
+            end = size - occupied[:, ::-1].argmax(axis=1)
+            return np.where(
+                occupied.any(axis=1),
+                edges[axis][end] - edges[axis][start],
+                0,
+            )
+
+        length = extent("x", (1, 2))
+        width = extent("y", (1, 3))
+        depth = extent("z", (2, 3))
+
+        # Surface of thresholded voxels from marching cubes, padded with
+        # background so regions touching the domain are closed. Vertices are
+        # mapped from voxel index to mesh coordinates, with padded ticks
+        # mirrored about the outer cell edges.
+        padded_ticks = {
+            axis: np.concatenate([
+                [2 * edges[axis][0] - ticks[axis][0]],
+                ticks[axis],
+                [2 * edges[axis][-1] - ticks[axis][-1]],
+            ])
+            for axis in "xyz"
+        }
+        surface_area = np.zeros(len(thresholded))
+        for index in np.flatnonzero(measured):
+            verts, faces, _, _ = measure.marching_cubes(
+                np.pad(thresholded_float[index], 1),
+                level=0.5,
+            )
+            for column, axis in enumerate("zyx"):
+                verts[:, column] = np.interp(
+                    verts[:, column],
+                    np.arange(len(padded_ticks[axis])),
+                    padded_ticks[axis],
+                )
+            surface_area[index] = measure.mesh_surface_area(verts, faces)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return {
+                "volume_m3": volume,
+                "surface_area_m2": surface_area,
+                "centroid_x_m": centroid_x,
+                "centroid_y_m": centroid_y,
+                "centroid_z_m": centroid_z,
+                "length_3d_m": length,
+                "width_3d_m": width,
+                "depth_3d_m": depth,
+                "aspect_ratio_length_width": length / width,
+                "aspect_ratio_depth_width": depth / width,
+            }
+
+    @staticmethod
+    def label_max_blobs(projections):
+        """
+        Labels blobs of each `(t, h, w)` binary frame and selects the blob
+        with the largest area (lowest label on ties), matching
+        `skimage.measure.label` and `regionprops` for each frame.
 
-            # Save dimensions as csv
-            dimensions_df.to_csv(f"measurements/melt_pool/{key}.csv")
+        @param projections: Binary array of `(t, h, w)`.
+        @return: Dictionary of `labels_all`, `labels_max_blob`, and `bbox`
+        (min_row, min_col, max_row, max_col) arrays.
+        """
+        length, height, width = projections.shape
+
+        # Connects neighboring pixels within a frame but not across frames.
+        structure = np.zeros((3, 3, 3), dtype=bool)
+        structure[1] = True
+        labels, count = ndimage.label(projections, structure=structure)
+
+        # Frame of each label, labels increase with frame.
+        label_frames = np.zeros(count + 1, dtype=np.int64)
+        mask = labels > 0
+        label_frames[labels[mask]] = np.nonzero(mask)[0]
+
+        # Renumbers labels to start from 1 within each frame.
+        first_labels = np.full(length, count + 1, dtype=np.int64)
+        np.minimum.at(first_labels, label_frames[1:], np.arange(1, count + 1))
+        offsets = (first_labels - 1)[:, None, None]
+        labels_all = np.where(mask, labels - offsets, 0).astype(np.int64)
+
+        # Sorts labels by frame, then largest area, then label.
+        label_ids = np.arange(1, count + 1)
+        areas = np.bincount(labels.ravel(), minlength=count + 1)[1:]
+        order = np.lexsort((label_ids, -areas, label_frames[1:]))
+        frames, first = np.unique(label_frames[1:][order], return_index=True)
+
+        max_labels = np.zeros(length, dtype=np.int64)
+        max_labels[frames] = label_ids[order][first]
+
+        labels_max_blob = np.where(
+            mask & (labels == max_labels[:, None, None]), 1, 0
+        )
+
+        # Bounding box of largest blob, end indexes are exclusive.
+        rows = labels_max_blob.any(axis=2)
+        cols = labels_max_blob.any(axis=1)
+        bbox = np.stack([
+            rows.argmax(axis=1),
+            cols.argmax(axis=1),
+            height - rows[:, ::-1].argmax(axis=1),
+            width - cols[:, ::-1].argmax(axis=1),
+        ], axis=1)
+
+        return {
+            "labels_all": labels_all,
+            "labels_max_blob": labels_max_blob,
+            "bbox": bbox,
+        }
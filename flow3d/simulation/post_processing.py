@@ -1,10 +1,10 @@
-import copy
+import functools
 import numpy as np
 import os
-import pandas as pd
 import shutil
 import subprocess
 import textwrap
+import zipfile
 
 from flow3d import data
 from importlib.resources import files
@@ -12,17 +12,81 @@ from tqdm import tqdm
 
 from flow3d.simulation.utils.decorators import SimulationUtilsDecorators
 
+# Renames `flslnk.tmp` column headers to descriptive field names.
+FLSLNK_COLUMNS = {
+    'p': 'pressure',
+    'tn':"temperature",
+    'f' : "fraction_of_fluid",
+    'rho':"density",
+    'scl4':"melt_region",
+    'scl5':"temperature_gradient",
+    'scl6':'dtdx',
+    'scl7':'dtdy',
+    'scl8':'dtdz',
+    'u':'vx',
+    'v':'vy',
+    'w':'vz',
+    'nfs': 'liquid_label'
+}
+
+# Fields stored as `(z, y, x)` arrays within each `.npz` file.
+SCALAR_KEYS = [
+    "pressure",
+    "temperature",
+    "melt_region",
+    "temperature_gradient",
+    "liquid_label",
+    "fraction_of_fluid",
+]
+
+# Fields stored as `(z, y, x, 3)` arrays within each `.npz` file.
+VECTOR_KEYS = {
+    "dtdx_dtdy_dtdz": ["dtdx", "dtdy", "dtdz"],
+    "x_y_z": ["x", "y", "z"],
+    "vx_vy_vz": ["vx", "vy", "vz"],
+}
+
+# Per timestep values always kept regardless of selected fields and dtypes.
+METADATA_KEYS = ["power", "velocity", "timestep"]
+
+# Fields read by views, measurements, and visualizations (`COLUMNS_CONFIG`),
+# these must be kept when selecting fields.
+REQUIRED_KEYS = ["pressure", "temperature", "fraction_of_fluid", "liquid_label"]
+
+# Preset for `dtypes = "compact"`, labels are rounded to integers.
+COMPACT_DTYPES = {
+    "default": "float32",
+    "liquid_label": "int32",
+    "melt_region": "int32",
+}
+
 class SimulationPostProcessing():
     """
     Run methods file for simulation class.
     """
 
     @SimulationUtilsDecorators.change_working_directory
+    @SimulationUtilsDecorators.stage_manifest(
+        "guipost",
+        inputs = lambda self, arguments: [
+            "flsgrf.zip",
+            "flsgrf.zst",
+            "flsgrf.simulation",
+        ],
+        outputs = lambda self, arguments: [
+            *([self.compressed_file_path("flslnk.zip", arguments["compression"])]
+              if arguments["zip_output"] else []),
+            *([] if arguments["delete_output"] else ["flslnk.tmp"]),
+        ],
+        parameters = ["zip_output", "compression", "compresslevel"],
+    )
     def guipost(
         self,
         delete_output = True,
         delete_source = True,
         zip_output = True,
+        compression = "deflate",
+        compresslevel = None,
         **kwargs
     ):
         """
@@ -31,6 +95,9 @@ class SimulationPostProcessing():
         @param simulation: Simulation
         @param delete_output: Deletes raw output `flsgrf.simulation` file -> True
         @param zip_output: Zips `flsgrf.simulation` file -> True
+        @param compression: Codec used to zip output (see `zip_file`)
+        @param compresslevel: Codec specific compression level -> None
+        @param force: Runs even if `guipost` manifest is up to date -> False
 
         @param working_dir: Sets working directory to `simulation.name`.
         """
@@ -71,7 +138,12 @@ class SimulationPostProcessing():
 
         # Zip output files
         if zip_output:
-            self.zip_file("flslnk.tmp", "flslnk.zip")
+            self.zip_file(
+                "flslnk.tmp",
+                "flslnk.zip",
+                compression = compression,
+                compresslevel = compresslevel,
+            )
 
         # Remove output file
         if delete_output:
@@ -87,55 +159,65 @@ class SimulationPostProcessing():
 
     # TODO: Does not necessary need to change working directory.
     @SimulationUtilsDecorators.change_working_directory
+    @SimulationUtilsDecorators.stage_manifest(
+        "chunk_flslnk",
+        inputs = lambda self, arguments: ["flslnk.zip", "flslnk.zst", "flslnk.tmp"],
+        outputs = lambda self, arguments: [
+            *([f"{arguments['chunk_dir_path']}.zip"] if arguments["zip_output"] else []),
+            *([] if arguments["delete_output"] else [arguments["chunk_dir_path"]]),
+        ],
+        parameters = ["chunk_dir_path", "zip_output", "compression", "compresslevel"],
+    )
     def chunk_flslnk(
         self,
         chunk_dir_path = "flslnk_chunks",
         delete_output = True,
         delete_source = True,
         zip_output = True,
+        compression = "deflate",
+        compresslevel = None,
         **kwargs,
     ):
+        """
+        Splits `flslnk.tmp` into one `.txt` file per chunk.
+
+        @param compression: Codec used to zip output (see `zip_folder`)
+        @param compresslevel: Codec specific compression level -> None
+        @param force: Runs even if `chunk_flslnk` manifest is up to date ->
+        False
+
+        @param working_dir: Sets working directory to `simulation.name`.
+        """
         # Create directory for chunks
         if not os.path.exists(chunk_dir_path):
             os.makedirs(chunk_dir_path)
         
-        chunk = []
-        chunk_index = 0
-
         # Maximum number of zeros padded in front of chunk number
         # i.e. 000000000001.txt
         chunk_zfill = 12
 
-        # Unzip flslnk.zip file to flslnk.tmp if not already done.
-        if not os.path.exists("flslnk.tmp") and os.path.exists("flslnk.zip"):
+        # Unzip flslnk.zip (or flslnk.zst) file to flslnk.tmp if not already done.
+        if not os.path.exists("flslnk.tmp") and \
+            os.path.exists(self.compressed_file_source("flslnk.zip")):
             self.unzip_file("flslnk.zip", "flslnk.tmp")
 
         with open("flslnk.tmp", "r") as f:
-            for line in tqdm(f):
-                # Splits chunks based on empty line
-                if line.strip():
-                    chunk.append(line)
-                else:
-                    if len(chunk):
-                        # Fills in the remaining values with 0 to sort properly.
-                        # Accounts for up to 8 digit values.
-                        output_file = f"{chunk_index}.txt".zfill(chunk_zfill)
-                        output_path = os.path.join(chunk_dir_path, output_file)
-                        with open(output_path, "w") as out_f:
-                            out_f.writelines(chunk)
-                        chunk_index += 1
-                        chunk = []
-
-            # Write the last chunk
-            if chunk:
+            for chunk_index, chunk in tqdm(self.iter_flslnk_chunks(f)):
+                # Fills in the remaining values with 0 to sort properly.
+                # Accounts for up to 8 digit values.
                 output_file = f"{chunk_index}.txt".zfill(chunk_zfill)
                 output_path = os.path.join(chunk_dir_path, output_file)
-                with open(output_path, 'w') as out_f:
+                with open(output_path, "w") as out_f:
                     out_f.writelines(chunk)
 
         if zip_output:
             print(f"Zipping `{chunk_dir_path}` folder...")
-            shutil.make_archive(chunk_dir_path, "zip", chunk_dir_path)
+            self.zip_folder(
+                chunk_dir_path,
+                f"{chunk_dir_path}.zip",
+                compression = compression,
+                compresslevel = compresslevel,
+            )
 
         if delete_output:
             print(f"Deleting `{chunk_dir_path}` folder output...")
@@ -148,9 +230,23 @@ class SimulationPostProcessing():
         return self
     
     # TODO: Does not necessary need to change working directory.
-    # TODO: Make method that does this multiprocessing per chunk rather than by
-    # simulation
     @SimulationUtilsDecorators.change_working_directory
+    @SimulationUtilsDecorators.stage_manifest(
+        "flslnk_chunk_to_npz",
+        inputs = lambda self, arguments: [
+            f"{arguments['chunk_dir_path']}.zip",
+            arguments["chunk_dir_path"],
+        ],
+        outputs = lambda self, arguments: self.flslnk_npz_outputs(arguments),
+        parameters = [
+            "npz_dir_path",
+            "zip_output",
+            "keys",
+            "dtypes",
+            "compression",
+            "compresslevel",
+        ],
+    )
     def flslnk_chunk_to_npz(
         self,
         chunk_dir_path = "flslnk_chunks",
@@ -158,81 +254,103 @@ class SimulationPostProcessing():
         delete_output = True,
         delete_source = True,
         zip_output = True,
+        num_proc = 1,
+        maxtasksperchild = None,
+        keys = None,
+        dtypes = None,
+        compression = "deflate",
+        compresslevel = None,
         **kwargs,
     ):
-        # Unzip chunks
-        self.unzip_folder(f"{chunk_dir_path}.zip", chunk_dir_path)
+        """
+        Converts `flslnk_chunks` into `.npz` files, one per timestep.
+
+        @param num_proc: Number of processes converting chunks -> 1
+        @param maxtasksperchild: Chunks converted before a worker is replaced.
+        @param keys: Fields to keep, must include `REQUIRED_KEYS`, `x_y_z` is
+        saved once to `mesh_x_y_z.npz` when excluded -> None (all fields)
+        @param dtypes: Dictionary of field (or "default") to dtype, or
+        "compact" for float32 values and integer labels -> None (float64)
+        @param compression: Codec used to zip output, "store" avoids
+        recompressing `.npz` files (see `zip_folder`) -> "deflate"
+        @param compresslevel: Codec specific compression level -> None
+        @param force: Runs even if `flslnk_chunk_to_npz` manifest is up to
+        date -> False
+
+        @param working_dir: Sets working directory to `simulation.name`.
+        """
+        self.validate_flslnk_keys(keys)
 
         # Create folder for npz files
-        # npz_dir_path = os.path.join(self.job_dir_path, simulation.name, "npz") 
         if not os.path.exists(npz_dir_path):
             os.makedirs(npz_dir_path)
 
         # Skips 0th chunk with metadata
-        chunk_data_listdir = sorted(os.listdir(chunk_dir_path))[1:-1]
-
-        # Write chunks to txt file
-        for chunk_file in tqdm(chunk_data_listdir):
-            # Pulls column headers from the 9th line in each file
-            chunk_file_path = os.path.join(chunk_dir_path, chunk_file)
-
-            # Parses header text in values.
-            #  printing tn, scl4 and nfs       t=5.52563142E-06  ix=2 to  127   jy=2 to  32  kz=2 to  33 
-            # 2        2      5.526E-06      5.526E-06        2      127        2       32        2       33
-            metadata_df = pd.read_csv(chunk_file_path, skiprows = 2, nrows=1, sep="\s+", header=None)
-
-            t_series = metadata_df.iloc[:, 3]
-            t = float(t_series.iloc[0])
-            # ix = metadata_df.iloc[:, 4:5]
-            # jy = metadata_df.iloc[:, 6:7]
-            # kz = metadata_df.iloc[:, 8:9]
-            # print(t, ix, jy, kz)
-
-            data_df = pd.read_csv(chunk_file_path, skiprows = 3, sep="\s+", dtype=float)
-            data_df["t"] = t
-            # data_df["ix"] = ix
-            # data_df["jy"] = jy
-            # data_df["kz"] = kz
-            # print(data_df.columns)
-
-            keys = {
-                'p': 'pressure',
-                'tn':"temperature",
-                'f' : "fraction_of_fluid",
-                'rho':"density",
-                'scl4':"melt_region",
-                'scl5':"temperature_gradient",
-                'scl6':'dtdx',
-                'scl7':'dtdy',
-                'scl8':'dtdz',
-                'u':'vx',
-                'v':'vy',
-                'w':'vz',
-                'nfs': 'liquid_label'
-            }
-            data_renamed_df = data_df.rename(columns=keys)
-
-            numpy_arrays_dict = self.df_to_numpy(data_renamed_df)
-            # print(numpy_arrays_dict)
-
-            row_dict = {
-                **numpy_arrays_dict,
-                "power": [self.power],
-                "velocity": [float(self.velocity)],
-                "timestep": [t],
-            }
+        chunk_data_listdir = self.list_flslnk_files(chunk_dir_path)[1:-1]
 
-            # Removes the `.txt` from chunk file name before saving as `.npz`.
-            chunk_file_name = chunk_file.split(".")[0]
+        # Resumes after the last `.npz` file saved by an interrupted attempt.
+        start = self.read_stage_progress("flslnk_chunk_to_npz")
+        if start > 0:
+            print(f"Resuming `{npz_dir_path}` at timestep {start}...")
 
-            npz_file_path = os.path.join(npz_dir_path, chunk_file_name)
-            np.savez_compressed(npz_file_path, **row_dict)
+        def npz_file_path(chunk_file):
+            # Removes the `.txt` from chunk file name before saving as `.npz`.
+            return os.path.join(npz_dir_path, chunk_file.split(".")[0])
+
+        def convert(convert_chunk, tasks):
+            # Write chunks to npz file
+            results = self.imap_ordered(
+                functools.partial(convert_chunk, keys = keys, dtypes = dtypes),
+                tasks,
+                num_proc = num_proc,
+                maxtasksperchild = maxtasksperchild,
+            )
+            with self.track_stage_progress("flslnk_chunk_to_npz", results, start) as results:
+                for _ in tqdm(results, total=len(chunk_data_listdir) - start):
+                    pass
+
+        if os.path.isdir(chunk_dir_path):
+            convert(
+                self.convert_flslnk_chunk_file,
+                (
+                    (
+                        os.path.join(chunk_dir_path, chunk_file),
+                        npz_file_path(chunk_file),
+                        0,
+                        -1,
+                        self.flslnk_mesh_file_path(index, keys),
+                    )
+                    for index, chunk_file in enumerate(chunk_data_listdir)
+                    if index >= start
+                ),
+            )
+
+        else:
+            # Reads chunks directly out of `flslnk_chunks.zip`.
+            with zipfile.ZipFile(f"{chunk_dir_path}.zip") as zip_ref:
+                convert(
+                    self.convert_flslnk_chunk,
+                    (
+                        (
+                            zip_ref.read(chunk_file).decode().splitlines(keepends=True),
+                            npz_file_path(chunk_file),
+                            self.flslnk_mesh_file_path(index, keys),
+                        )
+                        for index, chunk_file in enumerate(chunk_data_listdir)
+                        if index >= start
+                    ),
+                )
 
         if zip_output:
             print(f"Zipping `{npz_dir_path}` folder...")
-            shutil.make_archive(npz_dir_path, "zip", npz_dir_path)
-
-        if delete_source:
+            self.zip_folder(
+                npz_dir_path,
+                f"{npz_dir_path}.zip",
+                compression = compression,
+                compresslevel = compresslevel,
+            )
+
+        if delete_source and os.path.isdir(chunk_dir_path):
             print(f"Deleting `{chunk_dir_path}` source folder")
             shutil.rmtree(chunk_dir_path)
 
@@ -242,105 +360,347 @@ class SimulationPostProcessing():
         
         return self
 
-    # TODO: Clean this up
-    # @staticmethod
-    def df_to_numpy(self, df):
-        dtdx_dtdy_dtdz_timestep = []
-        dtdx_dtdy_dtdz_z = []
-        dtdx_dtdy_dtdz_y = []
+    # TODO: Does not necessary need to change working directory.
+    @SimulationUtilsDecorators.change_working_directory
+    @SimulationUtilsDecorators.stage_manifest(
+        "flslnk_to_npz",
+        inputs = lambda self, arguments: [
+            arguments["flslnk_path"],
+            f"{os.path.splitext(arguments['flslnk_path'])[0]}.zip",
+            f"{os.path.splitext(arguments['flslnk_path'])[0]}.zst",
+        ],
+        outputs = lambda self, arguments: self.flslnk_npz_outputs(arguments),
+        parameters = [
+            "npz_dir_path",
+            "zip_output",
+            "keys",
+            "dtypes",
+            "compression",
+            "compresslevel",
+        ],
+    )
+    def flslnk_to_npz(
+        self,
+        flslnk_path = "flslnk.tmp",
+        npz_dir_path = "flslnk_npz",
+        delete_output = True,
+        delete_source = True,
+        zip_output = True,
+        num_proc = 1,
+        maxtasksperchild = None,
+        keys = None,
+        dtypes = None,
+        compression = "deflate",
+        compresslevel = None,
+        **kwargs,
+    ):
+        """
+        Converts `flslnk.tmp` into `.npz` files in a single streaming pass,
+        skipping the intermediate `flslnk_chunks` folder. Reads directly out
+        of `flslnk.zip` if `flslnk.tmp` does not exist.
+
+        @param flslnk_path: Path to `flslnk.tmp` file.
+        @param npz_dir_path: Output folder for `.npz` files.
+        @param delete_output: Deletes `npz_dir_path` folder output -> True
+        @param delete_source: Deletes `flslnk.tmp` source if it exists -> True
+        @param zip_output: Zips `npz_dir_path` folder -> True
+        @param num_proc: Number of processes converting timesteps -> 1
+        @param maxtasksperchild: Chunks converted before a worker is replaced.
+        @param keys: Fields to keep, must include `REQUIRED_KEYS`, `x_y_z` is
+        saved once to `mesh_x_y_z.npz` when excluded -> None (all fields)
+        @param dtypes: Dictionary of field (or "default") to dtype, or
+        "compact" for float32 values and integer labels -> None (float64)
+        @param compression: Codec used to zip output, "store" avoids
+        recompressing `.npz` files (see `zip_folder`) -> "deflate"
+        @param compresslevel: Codec specific compression level -> None
+        @param force: Runs even if `flslnk_to_npz` manifest is up to date ->
+        False
 
-        x_y_z_timestep = []
-        x_y_z_z = []
-        x_y_z_y = []
+        @param working_dir: Sets working directory to `simulation.name`.
+        """
+        self.validate_flslnk_keys(keys)
 
-        vx_vy_vz_timestep = []
-        vx_vy_vz_z = []
-        vx_vy_vz_y = []
+        if not os.path.exists(npz_dir_path):
+            os.makedirs(npz_dir_path)
 
-        keys = ["pressure", "temperature", "melt_region", "temperature_gradient", "liquid_label", "fraction_of_fluid"]
+        # Resumes after the last `.npz` file saved by an interrupted attempt.
+        start = self.read_stage_progress("flslnk_to_npz")
+        if start > 0:
+            print(f"Resuming `{npz_dir_path}` at timestep {start}...")
+
+        # Maximum number of zeros padded in front of chunk number, matches the
+        # file names of `chunk_flslnk` i.e. 00000001.npz
+        chunk_zfill = 8
+
+        zip_path = f"{os.path.splitext(flslnk_path)[0]}.zip"
+
+        def npz_file_path(chunk_index):
+            return os.path.join(npz_dir_path, f"{chunk_index}".zfill(chunk_zfill))
+
+        def convert(convert_chunk, tasks):
+            results = self.imap_ordered(
+                functools.partial(convert_chunk, keys = keys, dtypes = dtypes),
+                tasks,
+                num_proc = num_proc,
+                maxtasksperchild = maxtasksperchild,
+            )
+            with self.track_stage_progress("flslnk_to_npz", results, start) as results:
+                for _ in tqdm(results, initial=start):
+                    pass
+
+        if os.path.exists(flslnk_path) and (num_proc > 1 or start > 0):
+            # Workers read their own byte range of `flslnk.tmp` so only
+            # offsets are sent between processes, and resumed attempts seek
+            # to the first unconverted chunk without parsing earlier ones.
+            chunks = self.iter_flslnk_timestep_chunks(
+                self.iter_flslnk_chunk_offsets(flslnk_path)
+            )
+            tasks = (
+                (
+                    flslnk_path,
+                    npz_file_path(chunk_index),
+                    offset,
+                    length,
+                    self.flslnk_mesh_file_path(index, keys),
+                )
+                for index, (chunk_index, offset, length) in enumerate(chunks)
+                if index >= start
+            )
+            convert(self.convert_flslnk_chunk_file, tasks)
+
+        else:
+            with self.open_flslnk(flslnk_path, zip_path) as lines:
+                chunks = self.iter_flslnk_timestep_chunks(
+                    self.iter_flslnk_chunks(lines)
+                )
+                tasks = (
+                    (
+                        chunk_lines,
+                        npz_file_path(chunk_index),
+                        self.flslnk_mesh_file_path(index, keys),
+                    )
+                    for index, (chunk_index, chunk_lines) in enumerate(chunks)
+                    if index >= start
+                )
+                convert(self.convert_flslnk_chunk, tasks)
 
-        values = {
-            "timestep": [],
-            "z": [],
-            "y": [],
-        }
+        if zip_output:
+            print(f"Zipping `{npz_dir_path}` folder...")
+            self.zip_folder(
+                npz_dir_path,
+                f"{npz_dir_path}.zip",
+                compression = compression,
+                compresslevel = compresslevel,
+            )
 
-        key_values = {}
-        for key in keys:
-            key_values[key] = copy.deepcopy(values)
+        if delete_source and os.path.exists(flslnk_path):
+            print(f"Deleting `{flslnk_path}` source...")
+            os.remove(flslnk_path)
 
-        prev_z = None
-        prev_y = None
+        if delete_output:
+            print(f"Deleting `{npz_dir_path}` output folder")
+            shutil.rmtree(npz_dir_path)
 
-        for i in range(len(df)):
-            row = df.iloc[i]
+        return self
 
-            z, y = row["z"], row["y"]
+    @staticmethod
+    def flslnk_npz_outputs(arguments):
+        """
+        Outputs of `flslnk_to_npz` and `flslnk_chunk_to_npz` recorded in
+        manifest.
+        """
+        npz_dir_path = arguments["npz_dir_path"]
+        return [
+            *([f"{npz_dir_path}.zip"] if arguments["zip_output"] else []),
+            *([] if arguments["delete_output"] else [npz_dir_path]),
+        ]
+
+    @staticmethod
+    def flslnk_mesh_file_path(index, keys = None):
+        """
+        Only the first timestep saves `mesh_x_y_z.npz`, and only when `x_y_z`
+        is excluded from the per timestep files.
+        """
+        if index == 0 and keys is not None and "x_y_z" not in keys:
+            return "mesh_x_y_z.npz"
 
-            if y != prev_y and prev_y is not None:
+    def convert_flslnk_chunk_file(
+        self,
+        file_path,
+        npz_file_path,
+        offset = 0,
+        length = -1,
+        mesh_file_path = None,
+        keys = None,
+        dtypes = None,
+    ):
+        """
+        Reads a chunk from a byte range of a file and saves it as `.npz`.
 
-                dtdx_dtdy_dtdz_z.append(dtdx_dtdy_dtdz_y)
-                dtdx_dtdy_dtdz_y = []
+        @param file_path: Path to `flslnk.tmp` or chunk `.txt` file.
+        @param npz_file_path: Output `.npz` path (extension is optional).
+        @param offset: Byte offset of chunk -> 0
+        @param length: Byte length of chunk -> -1 (until end of file)
+        """
+        chunk_lines = self.read_flslnk_chunk(file_path, offset, length)
+        return self.convert_flslnk_chunk(
+            chunk_lines,
+            npz_file_path,
+            mesh_file_path,
+            keys = keys,
+            dtypes = dtypes,
+        )
 
-                x_y_z_z.append(x_y_z_y)
-                x_y_z_y = []
+    def convert_flslnk_chunk(
+        self,
+        chunk_lines,
+        npz_file_path,
+        mesh_file_path = None,
+        keys = None,
+        dtypes = None,
+    ):
+        """
+        Parses a single `flslnk.tmp` timestep chunk and saves it as `.npz`.
 
-                vx_vy_vz_z.append(vx_vy_vz_y)
-                vx_vy_vz_y = []
+        @param chunk_lines: List of lines within the chunk.
+        @param npz_file_path: Output `.npz` path (extension is optional).
+        @param mesh_file_path: Saves `x`, `y`, and `z` mesh ticks -> None
+        @param keys: Fields to keep -> None (all fields)
+        @param dtypes: Dictionary of field to dtype or "compact" -> None
+        """
+        row_dict = self.flslnk_chunk_to_numpy(chunk_lines)
 
-                for key in keys:
-                    # print(key, key_values[key]["y"])
-                    key_values[key]["z"].append(key_values[key]["y"])
-                    key_values[key]["y"] = []
+        if mesh_file_path is not None:
+            np.savez(mesh_file_path, **self.mesh_x_y_z_from_grid(row_dict["x_y_z"][0]))
 
-            if z != prev_z and prev_z is not None:
+        row_dict = self.select_flslnk_fields(row_dict, keys, dtypes)
+        np.savez_compressed(npz_file_path, **row_dict)
+
+    @staticmethod
+    def validate_flslnk_keys(keys = None):
+        """
+        Checks that selected fields exist and include the fields read by
+        later stages, which would otherwise fail with a `KeyError`.
 
-                dtdx_dtdy_dtdz_timestep.append(dtdx_dtdy_dtdz_z)
-                dtdx_dtdy_dtdz_z = []
+        @param keys: Fields to keep -> None (all fields)
+        """
+        if keys is None:
+            return
+
+        unknown = [
+            key for key in keys
+            if key not in SCALAR_KEYS and key not in VECTOR_KEYS
+            and key not in METADATA_KEYS
+        ]
+        if len(unknown):
+            raise ValueError(f"Unknown `flslnk` fields {unknown}")
+
+        missing = [key for key in REQUIRED_KEYS if key not in keys]
+        if len(missing):
+            raise ValueError(
+                f"Fields {missing} are required by views, measurements, and "
+                "visualizations"
+            )
+
+    @staticmethod
+    def select_flslnk_fields(row_dict, keys = None, dtypes = None):
+        """
+        Drops fields not within `keys` and casts fields to `dtypes`.
+
+        @param row_dict: Dictionary of field name to list of one array.
+        @param keys: Fields to keep -> None (all fields)
+        @param dtypes: Dictionary of field (or "default") to dtype, or
+        "compact" -> None (unchanged)
+        """
+        if dtypes == "compact":
+            dtypes = COMPACT_DTYPES
 
-                x_y_z_timestep.append(x_y_z_z)
-                x_y_z_z = []
+        selected = {}
 
-                vx_vy_vz_timestep.append(vx_vy_vz_z)
-                vx_vy_vz_z = []
+        for key, value in row_dict.items():
+            if key in METADATA_KEYS:
+                selected[key] = value
+                continue
 
-                for key in keys:
-                    # print(key, len(key_values[key]["z"]))
-                    key_values[key]["timestep"].append(key_values[key]["z"])
-                    key_values[key]["z"] = []
+            if keys is not None and key not in keys:
+                continue
 
-            dtdx_dtdy_dtdz_y.append([row["dtdx"], row["dtdy"], row["dtdz"]])
-            x_y_z_y.append([row["x"], row["y"], row["z"]])
-            vx_vy_vz_y.append([row["vx"], row["vy"], row["vz"]])
+            if dtypes is not None:
+                dtype = np.dtype(dtypes.get(key, dtypes.get("default", value[0].dtype)))
 
-            for key in keys:
-                key_values[key]["y"].append(row[key])
+                # Labels are rounded rather than truncated.
+                if np.issubdtype(dtype, np.integer):
+                    value = [np.rint(value[0]).astype(dtype)]
+                else:
+                    value = [value[0].astype(dtype)]
+
+            selected[key] = value
+
+        return selected
+
+    def flslnk_chunk_to_numpy(self, chunk_lines):
+        """
+        Parses a single `flslnk.tmp` timestep chunk into the dictionary of
+        arrays saved within each `.npz` file.
+
+        @param chunk_lines: List of lines within the chunk.
+        """
+        metadata, data_df = self.parse_flslnk_chunk(chunk_lines)
+
+        data_renamed_df = data_df.rename(columns=FLSLNK_COLUMNS)
+
+        numpy_arrays_dict = self.df_to_numpy(data_renamed_df)
+
+        return {
+            **numpy_arrays_dict,
+            "power": [self.power],
+            "velocity": [float(self.velocity)],
+            "timestep": [metadata["t"]],
+        }
+
+    def df_to_numpy(self, df):
+        """
+        Assembles flat `flslnk` rows into `(z, y, x)` grids for each field.
+
+        Grid shape is inferred from the unique `x`, `y`, and `z` coordinates
+        and every field is reshaped in a single pass, rows are expected in
+        the `flslnk` order (`z` outer, `y` middle, `x` inner).
+
+        @param df: Dataframe (or dict of columns) with renamed `flslnk` columns.
+        @return: Dictionary of field name to list containing one numpy array.
+        """
+        x = np.asarray(df["x"], dtype=float)
+        y = np.asarray(df["y"], dtype=float)
+        z = np.asarray(df["z"], dtype=float)
 
-            prev_z = z
-            prev_y = y
+        shape = (len(np.unique(z)), len(np.unique(y)), len(np.unique(x)))
 
-        # Adds last value
-        dtdx_dtdy_dtdz_y.append([row["dtdx"], row["dtdy"], row["dtdz"]])
-        x_y_z_y.append([row["x"], row["y"], row["z"]])
-        vx_vy_vz_y.append([row["vx"], row["vy"], row["vz"]])
-        dtdx_dtdy_dtdz_z.append(dtdx_dtdy_dtdz_y)
+        if len(x) != shape[0] * shape[1] * shape[2]:
+            raise ValueError(
+                f"Rows ({len(x)}) do not fill a regular grid of shape {shape}"
+            )
 
-        x_y_z_z.append(x_y_z_y)
-        vx_vy_vz_z.append(vx_vy_vz_y)
+        # Sorts rows into `z`, `y`, `x` order (no-op for `flslnk` output).
+        order = np.lexsort((x, y, z))
 
-        for key in keys:
-            key_values[key]["y"].append(row[key])
-            key_values[key]["z"].append(key_values[key]["y"])
+        # Previous row by row implementation never appended the last `z`
+        # plane, dropped here as well to keep existing `.npz` files consistent.
+        nz = shape[0] - 1
 
+        def to_grid(columns):
+            values = np.stack(
+                [np.asarray(df[column], dtype=float)[order] for column in columns],
+                axis = -1,
+            )
+            values = values.reshape(*shape, len(columns))[:nz]
+            if len(columns) == 1:
+                values = values[..., 0]
+            return [values]
 
-        timestep = {} 
-        for key in keys:
-            timestep[key] = [np.array(key_values[key]["timestep"])]
+        timestep = {key: to_grid([key]) for key in SCALAR_KEYS}
 
         other = {
-            "dtdx_dtdy_dtdz": [np.array(dtdx_dtdy_dtdz_timestep)],
-            "x_y_z": [np.array(x_y_z_timestep)],
-            "vx_vy_vz": [np.array(vx_vy_vz_timestep)],
+            key: to_grid(columns) for key, columns in VECTOR_KEYS.items()
         }
 
         return {
@@ -9,12 +9,32 @@ class SimulationRun():
     """
 
     @SimulationUtilsDecorators.change_working_directory
-    def runhyd(self, delete_output = True, zip_output = True, **kwargs):
+    @SimulationUtilsDecorators.stage_manifest(
+        "runhyd",
+        inputs = lambda self, arguments: [f"prepin.{self.filename}"],
+        outputs = lambda self, arguments: [
+            "runhyd.txt",
+            *([self.compressed_file_path("flsgrf.zip", arguments["compression"])]
+              if arguments["zip_output"] else []),
+        ],
+        parameters = ["zip_output", "compression", "compresslevel"],
+    )
+    def runhyd(
+        self,
+        delete_output = True,
+        zip_output = True,
+        compression = "deflate",
+        compresslevel = None,
+        **kwargs
+    ):
         """
         Open `runhyd` subprocess and zip output
 
         @param delete_output: Deletes raw output `flsgrf.simulation` file
         @param zip_output: Zips `flsgrf.simulation` file
+        @param compression: Codec used to zip output (see `zip_file`)
+        @param compresslevel: Codec specific compression level -> None
+        @param force: Runs even if `runhyd` manifest is up to date -> False
 
         @param working_dir: Sets working directory to `simulation.name`.
         """
@@ -44,9 +64,18 @@ class SimulationRun():
             print(f"Error running `runhyd` for simulation: {self.name}")
             return None
 
+        if process.returncode != 0:
+            print(f"`runhyd` for simulation {self.name} exited with {process.returncode}")
+            return None
+
         # Zip `flsgrf.simulation` File
         if zip_output:
-            self.zip_file(f"flsgrf.{self.filename}", "flsgrf.zip")
+            self.zip_file(
+                f"flsgrf.{self.filename}",
+                "flsgrf.zip",
+                compression = compression,
+                compresslevel = compresslevel,
+            )
 
         # Remove Large File
         if delete_output:
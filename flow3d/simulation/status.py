@@ -1,13 +1,26 @@
 import os
 
+from flow3d.simulation.manifest import STAGES
+
 class SimulationStatus():
     """
     Static methods for determining simulation status
     """
 
-    def check_status(self, simulation_dir_path):
+    def check_status(
+        self,
+        simulation_dir_path,
+        chunk_dir_path = "flslnk_chunks",
+        npz_dir_path = "flslnk_npz",
+    ):
         """
-        Provides status object of simulation. 
+        Provides status object of simulation from stage manifests (progress
+        and size and modification time of inputs and outputs), falls back to
+        output files for stages run before manifests were recorded.
+
+        @param simulation_dir_path: Path to simulation folder.
+        @return: Dictionary of completed steps, and `completed` and `progress`
+        of each stage with a manifest under `stages`.
         """
         # Check if simulation is done by reading `report.simulation`
         # Last lines of `report.simulation` should look something like this.
@@ -27,61 +40,64 @@ class SimulationStatus():
         # >     cpu time =    1.79030E+05 seconds
 
         status = {
-            "exists": False,
+            "exists": os.path.exists(simulation_dir_path),
             "completed": False,
             "run_simulation_completed": False,
             "post_process_create_flslnk_completed": False,
             "post_process_create_chunks_completed": False,
             "post_process_create_npz_completed": False,
+            "stages": {},
         }
 
-        # Check generated report file.
-        report_file_path = os.path.join(simulation_dir_path, "report.simulation")
-
-        # if os.path.exists(report_file_path):
-
-        #     with open(report_file_path, "r") as f:
-        #         last_line = f.readlines()[-1].strip()
-
-        #     if "cpu time" in last_line.lower():
-        #         # Last line should be cpu time if simulation is completed
-        #         status["completed"] = True
+        if not status["exists"]:
+            return status
 
-        # Check execution times files to see if finished zipping flsgrf file.
-        # execution_times_file_path = os.path.join(simulation_dir_path, "execution_times.txt")
-        chunks_dir_path = os.path.join(simulation_dir_path, "chunks")
-        chunks_zip_path = os.path.join(simulation_dir_path, "chunks.zip")
+        # Reads a fixed number of small manifests rather than listing outputs.
+        for stage in STAGES:
+            manifest = self.read_stage_manifest(stage, simulation_dir_path)
+            if manifest is not None:
+                status["stages"][stage] = {
+                    "completed": manifest["completed"],
+                    "progress": manifest["progress"],
+                    "completed_at": manifest["completed_at"],
+                }
 
-        npz_dir_path = os.path.join(simulation_dir_path, "npz")
-        npz_zip_path = os.path.join(simulation_dir_path, "npz.zip")
+        def stage_completed(stages, *paths):
+            recorded = [stage for stage in stages if stage in status["stages"]]
+            if len(recorded):
+                return any(status["stages"][stage]["completed"] for stage in recorded)
 
-        if os.path.exists(simulation_dir_path):
+            # Output files of stages run before manifests were recorded.
+            return any(os.path.exists(os.path.join(simulation_dir_path, path)) for path in paths)
 
-            # with open(execution_times_file_path, "r") as f:
-            #     execution_times = f.read()
+        # Indicates that job method for running simulation is done.
+        status["run_simulation_completed"] = stage_completed(
+            ["runhyd"],
+            "flsgrf.zip",
+            "flsgrf.zst",
+        )
 
-            # flsgrf_file_path can exist during simulation 
-            # flsgrf_file_path = os.path.join(simulation_dir_path, "flsgrf.simulation")
-            flsgrf_zip_file_path = os.path.join(simulation_dir_path, "flsgrf.zip")
-            if os.path.exists(flsgrf_zip_file_path):
-                # Indicates that job method for running simulation is done.
-                status["run_simulation_completed"] = True
+        # Indicates that flslnk file has been created.
+        status["post_process_create_flslnk_completed"] = stage_completed(
+            ["guipost"],
+            "flslnk.tmp",
+            "flslnk.zip",
+            "flslnk.zst",
+        )
 
-            # Can't trust execution times.
-            # if "post_process_create_flslnk" in execution_times:
-            flslnk_tmp_file_path = os.path.join(simulation_dir_path, "flslnk.tmp")
-            flslnk_zip_file_path = os.path.join(simulation_dir_path, "flslnk.zip")
-            if os.path.exists(flslnk_tmp_file_path) or \
-                os.path.exists(flslnk_zip_file_path):
-                # Indicates that flslnk file has been created.
-                status["post_process_create_flslnk_completed"] = True
+        # Indicates that chunks from flslnk file has been created.
+        status["post_process_create_chunks_completed"] = stage_completed(
+            ["chunk_flslnk"],
+            chunk_dir_path,
+            f"{chunk_dir_path}.zip",
+        )
 
-            if (os.path.isdir(chunks_dir_path) and len(os.listdir(chunks_dir_path))) or os.path.exists(chunks_zip_path):
-                # Indicates that chunks from flslnk file has been created.
-                status["post_process_create_chunks_completed"] = True
+        # Indicates that npz from chunks (or directly from flslnk file) has
+        # been created.
+        status["post_process_create_npz_completed"] = stage_completed(
+            ["flslnk_to_npz", "flslnk_chunk_to_npz"],
+            npz_dir_path,
+            f"{npz_dir_path}.zip",
+        )
 
-            if (os.path.isdir(npz_dir_path) and len(os.listdir(npz_dir_path))) or os.path.exists(npz_zip_path):
-                # Indicates that npz from chuncks has been created.
-                status["post_process_create_npz_completed"] = True
-        
         return status
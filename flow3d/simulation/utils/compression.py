@@ -1,40 +1,205 @@
 import os
+import shutil
+import threading
+import time
 import zipfile
+import zlib
 
+from concurrent.futures import ThreadPoolExecutor
 from tqdm import tqdm
 
+# Compression codecs supported within `.zip` archives.
+ZIP_COMPRESSION = {
+    "store": zipfile.ZIP_STORED,
+    "deflate": zipfile.ZIP_DEFLATED,
+    "bzip2": zipfile.ZIP_BZIP2,
+    "lzma": zipfile.ZIP_LZMA,
+}
+
+# Suffix of single files compressed with "zstd", which are Zstandard frames
+# rather than `.zip` archives.
+ZSTD_SUFFIX = ".zst"
+
 class SimulationUtilsCompression():
     """
     Compression methods used within simulation class.
+
+    Files and folders are compressed with one of "store", "deflate" (default),
+    "bzip2", or "lzma" within a `.zip` archive. Single files may also use
+    multi-threaded "zstd" (requires `zstandard`), which writes a Zstandard
+    frame with a `.zst` suffix in place of `.zip`. Readers pick the codec by
+    file extension.
     """
 
     @staticmethod
-    def unzip_folder(source, destination):
+    def compressed_file_path(destination, compression = "deflate"):
+        """
+        Path written by `zip_file`, "zstd" replaces the `.zip` suffix.
+
+        @param destination: Path to the output file, e.g., "flsgrf.zip"
+        @param compression: "store", "deflate", "bzip2", "lzma", or "zstd"
+        """
+        if compression == "zstd":
+            return f"{os.path.splitext(destination)[0]}{ZSTD_SUFFIX}"
+
+        return destination
+
+    @staticmethod
+    def compressed_file_source(source):
+        """
+        Resolves `.zip` path to its `.zst` counterpart when only the "zstd"
+        compressed file exists.
+
+        @param source: Path to the zip file, e.g., "flslnk.zip"
+        """
+        zstd_source = f"{os.path.splitext(source)[0]}{ZSTD_SUFFIX}"
+
+        if not os.path.exists(source) and os.path.exists(zstd_source):
+            return zstd_source
+
+        return source
+
+    @staticmethod
+    def unzip_folder(
+        source,
+        destination,
+        num_threads = None,
+        chunk_size = 10 * 1024**2,
+        check_crc = False,
+    ):
         """
-        Method of unzipping folder if it does not already exist.
+        Method of unzipping folder, members are streamed to disk in parallel
+        and skipped if an extracted file of the same size and modification
+        time already exists.
 
         @param source: Path to the zip file, e.g., "flslnk_npz.zip"
         @param destination: Path to the output folder, e.g., "flslnk_npz"
+        @param num_threads: Threads extracting members -> None (up to 8)
+        @param chunk_size: Buffer size per thread (defaults to 10 MB)
+        @param check_crc: Also compares CRC of existing files -> False
         """
+        if not os.path.exists(source):
+            if os.path.exists(destination):
+                return
+            raise FileNotFoundError(f"`{source}` source file not found")
+
+        if num_threads is None:
+            num_threads = min(8, os.cpu_count() or 1)
+
         if not os.path.exists(destination):
-            if os.path.exists(source):
-                os.makedirs(destination)
-                with zipfile.ZipFile(source, "r") as zip_ref:
-                    zip_ref.extractall(destination)
-            else:
-                raise FileNotFoundError(f"`{source}` source file not found")
+            os.makedirs(destination)
+
+        # Each thread reads from its own handle of the zip file.
+        local = threading.local()
+        zip_refs = []
+
+        def extract(info):
+            if not hasattr(local, "zip_ref"):
+                local.zip_ref = zipfile.ZipFile(source, "r")
+                zip_refs.append(local.zip_ref)
+
+            return SimulationUtilsCompression.extract_member(
+                local.zip_ref,
+                info,
+                destination,
+                chunk_size = chunk_size,
+                check_crc = check_crc,
+            )
+
+        with zipfile.ZipFile(source, "r") as zip_ref:
+            infolist = zip_ref.infolist()
+
+        try:
+            with ThreadPoolExecutor(max_workers=num_threads) as executor:
+                extracted = sum(executor.map(extract, infolist))
+        finally:
+            for zip_ref in zip_refs:
+                zip_ref.close()
+
+        if extracted < len(infolist):
+            print(f"Skipped {len(infolist) - extracted} unchanged files in `{destination}`")
+
+    @staticmethod
+    def extract_member(
+        zip_ref,
+        info,
+        destination,
+        chunk_size = 10 * 1024**2,
+        check_crc = False,
+    ):
+        """
+        Streams a single zip member to `destination` unless unchanged.
+        Extracted files take the modification time of the member so that a
+        stale file of the same size is not mistaken for the member.
+
+        @param zip_ref: Open `zipfile.ZipFile`.
+        @param info: `zipfile.ZipInfo` of member.
+        @param destination: Path to the output folder.
+        @return: True if the member was extracted.
+        """
+        destination = os.path.realpath(destination)
+        target = os.path.realpath(os.path.join(destination, info.filename))
+
+        # Prevents members from being written outside of destination.
+        if os.path.commonpath([destination, target]) != destination:
+            raise ValueError(f"`{info.filename}` is outside of `{destination}`")
+
+        if info.is_dir():
+            os.makedirs(target, exist_ok=True)
+            return True
+
+        mtime = time.mktime((*info.date_time, 0, 0, -1))
+
+        if os.path.isfile(target) and os.path.getsize(target) == info.file_size \
+            and int(os.path.getmtime(target)) == int(mtime):
+            if not check_crc:
+                return False
+
+            crc = 0
+            with open(target, "rb") as f:
+                while chunk := f.read(chunk_size):
+                    crc = zlib.crc32(chunk, crc)
+
+            if crc == info.CRC:
+                return False
+
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+
+        with zip_ref.open(info) as source_file, open(target, "wb") as dest_file:
+            shutil.copyfileobj(source_file, dest_file, chunk_size)
+
+        os.utime(target, (mtime, mtime))
+
+        return True
 
     @staticmethod
-    def unzip_file(source, destination, chunk_size=1024**3):
+    def unzip_file(source, destination, chunk_size=10 * 1024**2):
         """
         Method for unzipping multiple files with the same name into one combined file.
 
-        @param source: Path to the zip file, e.g., "flslnk.zip"
+        @param source: Path to the zip file, e.g., "flslnk.zip", or "zstd"
+        compressed file, e.g., "flslnk.zst"
         @param destination: Path to the output file, e.g., "flsgrf.simulation"
         @param chunk_size: Size of each chunk to read (defaults to 10 MB)
         """
+        source = SimulationUtilsCompression.compressed_file_source(source)
         print(f"Unzipping `{source}` to `{destination}`...")
 
+        if source.endswith(ZSTD_SUFFIX):
+            import zstandard
+
+            with open(source, "rb") as source_file, \
+                open(destination, "wb") as dest_file:
+                zstandard.ZstdDecompressor().copy_stream(
+                    source_file,
+                    dest_file,
+                    read_size=chunk_size,
+                    write_size=chunk_size,
+                )
+
+            print(f"Decompressed `{source}` into `{destination}`.")
+            return
+
         with zipfile.ZipFile(source) as zip_ref:
             file_names = zip_ref.namelist()
 
@@ -67,8 +232,86 @@ class SimulationUtilsCompression():
         print(f"All matching files have been combined into `{destination}`.")
 
     @staticmethod
-    def zip_file(source, destination):
-        print(f"Zipping `{source}` file to `{destination}`...")
-        zip = zipfile.ZipFile(destination, "w", zipfile.ZIP_DEFLATED)
+    def zip_file(
+        source,
+        destination,
+        compression = "deflate",
+        compresslevel = None,
+        threads = -1,
+    ):
+        """
+        Compresses a single file.
+
+        @param source: Path to the file, e.g., "flsgrf.simulation"
+        @param destination: Path to the output file, e.g., "flsgrf.zip",
+        "zstd" writes to `.zst` suffix instead, e.g., "flsgrf.zst"
+        @param compression: "store", "deflate", "bzip2", "lzma", or "zstd"
+        @param compresslevel: Codec specific compression level -> None
+        @param threads: Threads used by "zstd", -1 uses all cores -> -1
+        @return: Path of the compressed file.
+        """
+        if compression not in ZIP_COMPRESSION and compression != "zstd":
+            raise ValueError(f"Compression `{compression}` not supported")
+
+        destination = SimulationUtilsCompression.compressed_file_path(
+            destination,
+            compression,
+        )
+        print(f"Zipping `{source}` file to `{destination}` ({compression})...")
+
+        if compression == "zstd":
+            import zstandard
+
+            compressor = zstandard.ZstdCompressor(
+                level=3 if compresslevel is None else compresslevel,
+                threads=threads,
+            )
+
+            with open(source, "rb") as source_file, \
+                open(destination, "wb") as dest_file:
+                compressor.copy_stream(source_file, dest_file)
+
+            return destination
+
+        zip = zipfile.ZipFile(
+            destination,
+            "w",
+            ZIP_COMPRESSION[compression],
+            compresslevel=compresslevel,
+        )
         zip.write(source)
         zip.close()
+
+        return destination
+
+    @staticmethod
+    def zip_folder(
+        source,
+        destination,
+        compression = "deflate",
+        compresslevel = None,
+    ):
+        """
+        Compresses folder contents into a `.zip` archive, replaces
+        `shutil.make_archive` with a selectable compression codec. Use "store"
+        for folders of already compressed files (i.e. `.npz`).
+
+        @param source: Path to the folder, e.g., "flslnk_npz"
+        @param destination: Path to the zip file, e.g., "flslnk_npz.zip"
+        @param compression: "store", "deflate", "bzip2", or "lzma"
+        @param compresslevel: Codec specific compression level -> None
+        """
+        if compression not in ZIP_COMPRESSION:
+            raise ValueError(f"Compression `{compression}` not supported for folders")
+
+        with zipfile.ZipFile(
+            destination,
+            "w",
+            ZIP_COMPRESSION[compression],
+            compresslevel=compresslevel,
+        ) as zip_ref:
+            for root, dir_names, file_names in os.walk(source):
+                dir_names.sort()
+                for file_name in sorted(file_names):
+                    file_path = os.path.join(root, file_name)
+                    zip_ref.write(file_path, os.path.relpath(file_path, source))
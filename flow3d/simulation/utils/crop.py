@@ -1,4 +1,5 @@
 import bisect
+import numpy as np
 
 class SimulationUtilsCrop():
 
@@ -26,6 +27,14 @@ class SimulationUtilsCrop():
         else:
             return idx - 1  # The value lies between idx-1 and idx
 
+    @staticmethod
+    def find_indices(x_distance_cm, mesh):
+        """
+        Vectorized `find_index` for an array of distances.
+        """
+        idx = np.searchsorted(mesh, x_distance_cm, side="left")
+        return np.clip(idx - 1, 0, len(mesh) - 1)
+
     @staticmethod
     def crop_3d_array(array, crop_x=None, crop_y=None, crop_z=None):
         # Define slices for x, y, and z based on the crop distances
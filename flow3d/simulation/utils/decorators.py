@@ -1,4 +1,5 @@
 import functools
+import inspect
 import os
 
 #TODO: Rename to singular `SimulationUtilsDecorator` instead of plural
@@ -36,4 +37,61 @@ class SimulationUtilsDecorators():
 
             return output
 
-        return wrapper
\ No newline at end of file
+        return wrapper
+
+    @staticmethod
+    def stage_manifest(stage, inputs, outputs, parameters = None):
+        """
+        Decorator for skipping a post processing stage when its manifest is
+        up to date and recording the manifest otherwise, applied within
+        `change_working_directory`. Stage is always run with `force = True`,
+        and is only recorded as completed when the method returns a value
+        other than `None` (returned on failure) without raising.
+
+        @param stage: Name of stage, i.e. "flslnk_chunk_to_npz"
+        @param inputs: Function of simulation and method arguments to list of
+        input paths.
+        @param outputs: Function of simulation and method arguments to list of
+        output paths.
+        @param parameters: Names of method arguments recorded in manifest ->
+        None (no parameters)
+        """
+        if parameters is None:
+            parameters = []
+
+        def decorator(func):
+            signature = inspect.signature(func)
+
+            @functools.wraps(func)
+            def wrapper(self, *args, **kwargs):
+
+                # Resolves defaults so paths and parameters match the method.
+                bound = signature.bind(self, *args, **kwargs)
+                bound.apply_defaults()
+                arguments = {**bound.arguments.pop("kwargs", {}), **bound.arguments}
+
+                stage_inputs = inputs(self, arguments)
+                stage_outputs = outputs(self, arguments)
+                stage_parameters = {name: arguments[name] for name in parameters}
+
+                if not arguments.get("force", False) and self.is_stage_completed(
+                    stage,
+                    stage_inputs,
+                    stage_parameters,
+                    stage_outputs,
+                ):
+                    print(f"`{stage}` for {self.name} is up to date, skipping...")
+                    return self
+
+                self.begin_stage(stage, stage_inputs, stage_parameters)
+                output = func(self, *args, **kwargs)
+
+                # Failed stages are left incomplete so they are rerun.
+                if output is not None:
+                    self.complete_stage(stage, stage_outputs)
+
+                return output
+
+            return wrapper
+
+        return decorator
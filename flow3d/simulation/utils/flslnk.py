@@ -0,0 +1,339 @@
+import atexit
+import io
+import numpy as np
+import os
+import pandas as pd
+import zipfile
+
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from flow3d.simulation.utils.compression import SimulationUtilsCompression, ZSTD_SUFFIX
+
+# Zip files opened by `open_flslnk_zip` within this process, least recently
+# used first, mapped from path to modification time and open `ZipFile`.
+FLSLNK_ZIP_REFS = OrderedDict()
+FLSLNK_ZIP_REFS_MAXSIZE = 4
+
+class SimulationUtilsFlslnk():
+    """
+    Methods for reading the `flslnk.tmp` output of `guipost` and the
+    `flslnk_npz` files converted from it.
+    """
+
+    @staticmethod
+    def list_flslnk_files(dir_path = "flslnk_npz"):
+        """
+        Lists sorted files within folder (i.e. `flslnk_npz` or
+        `flslnk_chunks`), or within `{dir_path}.zip` when the folder has not
+        been extracted.
+
+        @param dir_path: Folder of `.npz` or chunk `.txt` files.
+        """
+        if os.path.isdir(dir_path):
+            return sorted(os.listdir(dir_path))
+
+        zip_path = f"{dir_path}.zip"
+        if os.path.exists(zip_path):
+            with zipfile.ZipFile(zip_path) as zip_ref:
+                return sorted(
+                    name for name in zip_ref.namelist() if not name.endswith("/")
+                )
+
+        raise FileNotFoundError(f"`{dir_path}` and `{zip_path}` not found")
+
+    @staticmethod
+    def load_flslnk_npz(npz_dir_path, npz_file, keys = None, zip_ref = None):
+        """
+        Loads a single `.npz` file from folder, or directly out of
+        `{npz_dir_path}.zip` without extracting to disk.
+
+        @param npz_dir_path: Folder of `.npz` files.
+        @param npz_file: Name of `.npz` file, e.g., "00000001.npz"
+        @param keys: Keys to load (others are not decompressed) -> None (all)
+        @param zip_ref: Already open `zipfile.ZipFile` of folder -> None
+        @return: Dictionary of key to array.
+        """
+        if os.path.isdir(npz_dir_path):
+            npz_data = np.load(os.path.join(npz_dir_path, npz_file))
+
+        else:
+            if zip_ref is None:
+                zip_path = os.path.abspath(f"{npz_dir_path}.zip")
+                zip_ref = SimulationUtilsFlslnk.open_flslnk_zip(
+                    zip_path,
+                    os.stat(zip_path).st_mtime_ns,
+                )
+            npz_data = np.load(io.BytesIO(zip_ref.read(npz_file)))
+
+        if keys is None:
+            keys = npz_data.keys()
+
+        return {key: npz_data[key] for key in keys}
+
+    @staticmethod
+    def open_flslnk_zip(zip_path, mtime_ns):
+        """
+        Opens zip file once per process so workers loading single members do
+        not re-read the archive directory. `mtime_ns` reopens changed files,
+        replaced and least recently used files are closed.
+        """
+        if zip_path in FLSLNK_ZIP_REFS:
+            cached_mtime_ns, zip_ref = FLSLNK_ZIP_REFS[zip_path]
+            if cached_mtime_ns == mtime_ns:
+                FLSLNK_ZIP_REFS.move_to_end(zip_path)
+                return zip_ref
+
+            del FLSLNK_ZIP_REFS[zip_path]
+            zip_ref.close()
+
+        zip_ref = zipfile.ZipFile(zip_path)
+        FLSLNK_ZIP_REFS[zip_path] = (mtime_ns, zip_ref)
+
+        while len(FLSLNK_ZIP_REFS) > FLSLNK_ZIP_REFS_MAXSIZE:
+            _, (_, evicted_zip_ref) = FLSLNK_ZIP_REFS.popitem(last=False)
+            evicted_zip_ref.close()
+
+        return zip_ref
+
+    @staticmethod
+    def close_flslnk_zips():
+        """
+        Closes all zip files opened by `open_flslnk_zip`.
+        """
+        while len(FLSLNK_ZIP_REFS):
+            _, (_, zip_ref) = FLSLNK_ZIP_REFS.popitem()
+            zip_ref.close()
+
+    @staticmethod
+    def iter_flslnk_npz(npz_dir_path = "flslnk_npz", keys = None):
+        """
+        Iterates `.npz` files in sorted order from folder, or directly out of
+        `{npz_dir_path}.zip` when the folder has not been extracted.
+
+        @param npz_dir_path: Folder of `.npz` files.
+        @param keys: Keys to load (others are not decompressed) -> None (all)
+        @return: Generator of index, `.npz` file name, and dictionary.
+        """
+        npz_files = SimulationUtilsFlslnk.list_flslnk_files(npz_dir_path)
+
+        if os.path.isdir(npz_dir_path):
+            for index, npz_file in enumerate(npz_files):
+                yield index, npz_file, SimulationUtilsFlslnk.load_flslnk_npz(
+                    npz_dir_path, npz_file, keys
+                )
+        else:
+            with zipfile.ZipFile(f"{npz_dir_path}.zip") as zip_ref:
+                for index, npz_file in enumerate(npz_files):
+                    yield index, npz_file, SimulationUtilsFlslnk.load_flslnk_npz(
+                        npz_dir_path, npz_file, keys, zip_ref
+                    )
+
+    @staticmethod
+    @contextmanager
+    def open_flslnk(source = "flslnk.tmp", zip_source = "flslnk.zip"):
+        """
+        Opens `flslnk.tmp` for reading lines, streaming directly out of
+        `flslnk.zip` when the unzipped file does not exist.
+
+        @param source: Path to unzipped `flslnk.tmp` file.
+        @param zip_source: Path to zipped `flslnk.zip` file, or "zstd"
+        compressed `flslnk.zst` file.
+        """
+        zip_source = SimulationUtilsCompression.compressed_file_source(zip_source)
+
+        if os.path.exists(source):
+            with open(source, "r") as f:
+                yield f
+
+        elif os.path.exists(zip_source) and zip_source.endswith(ZSTD_SUFFIX):
+            import zstandard
+
+            with open(zip_source, "rb") as f:
+                reader = zstandard.ZstdDecompressor().stream_reader(f)
+                yield io.TextIOWrapper(reader)
+
+        elif os.path.exists(zip_source):
+            with zipfile.ZipFile(zip_source) as zip_ref:
+
+                # Members are read in order as one combined file, matching
+                # the behavior of `unzip_file`.
+                def lines():
+                    for file_name in zip_ref.namelist():
+                        with zip_ref.open(file_name) as source_file:
+                            yield from io.TextIOWrapper(source_file)
+
+                yield lines()
+        else:
+            raise FileNotFoundError(f"`{source}` and `{zip_source}` not found")
+
+    @staticmethod
+    def list_flslnk_batches(npz_dir_path = "flslnk_npz", batch_size = 64):
+        """
+        Splits sorted `.npz` file names into batches of consecutive timesteps.
+
+        @param npz_dir_path: Folder of `.npz` files.
+        @param batch_size: Maximum timesteps per batch -> 64
+        @return: List of lists of `.npz` file names.
+        """
+        npz_files = SimulationUtilsFlslnk.list_flslnk_files(npz_dir_path)
+
+        return [
+            npz_files[start:start + batch_size]
+            for start in range(0, len(npz_files), batch_size)
+        ]
+
+    @staticmethod
+    def load_flslnk_npz_batch(npz_dir_path, npz_files, keys = None):
+        """
+        Loads a batch of `.npz` files with values of each key concatenated
+        along the leading (time) axis.
+
+        @param npz_dir_path: Folder of `.npz` files.
+        @param npz_files: List of `.npz` file names within batch.
+        @param keys: Keys to load -> None (all)
+        @return: Dictionary of `(b, ...)` arrays.
+        """
+        return SimulationUtilsFlslnk.concatenate_examples([
+            SimulationUtilsFlslnk.load_flslnk_npz(npz_dir_path, npz_file, keys)
+            for npz_file in npz_files
+        ])
+
+    @staticmethod
+    def concatenate_examples(examples):
+        """
+        Concatenates timestep dictionaries along the leading (time) axis.
+        """
+        return {
+            key: np.concatenate([np.asarray(example[key]) for example in examples])
+            for key in examples[0].keys()
+        }
+
+    @staticmethod
+    def iter_flslnk_chunks(lines):
+        """
+        Splits `flslnk.tmp` lines into chunks separated by empty lines.
+
+        The 0th chunk contains metadata and the rest contain one timestep each.
+
+        @param lines: Iterable of lines from `flslnk.tmp`.
+        @return: Generator of chunk index and list of chunk lines.
+        """
+        chunk = []
+        chunk_index = 0
+
+        for line in lines:
+            # Splits chunks based on empty line
+            if line.strip():
+                chunk.append(line)
+            elif len(chunk):
+                yield chunk_index, chunk
+                chunk_index += 1
+                chunk = []
+
+        # Yield the last chunk
+        if chunk:
+            yield chunk_index, chunk
+
+    @staticmethod
+    def iter_flslnk_chunk_offsets(source = "flslnk.tmp"):
+        """
+        Scans `flslnk.tmp` for chunks without decoding them.
+
+        @param source: Path to unzipped `flslnk.tmp` file.
+        @return: Generator of chunk index, byte offset, and byte length.
+        """
+        chunk_index = 0
+        chunk_offset = None
+        offset = 0
+
+        with open(source, "rb") as f:
+            for line in f:
+                if line.strip():
+                    if chunk_offset is None:
+                        chunk_offset = offset
+                elif chunk_offset is not None:
+                    yield chunk_index, chunk_offset, offset - chunk_offset
+                    chunk_index += 1
+                    chunk_offset = None
+
+                offset += len(line)
+
+        # Yield the last chunk
+        if chunk_offset is not None:
+            yield chunk_index, chunk_offset, offset - chunk_offset
+
+    @staticmethod
+    def iter_flslnk_timestep_chunks(chunks):
+        """
+        Skips the 0th chunk with metadata and the last chunk, matching the
+        chunks converted by `flslnk_chunk_to_npz`.
+
+        @param chunks: Iterable of tuples starting with chunk index.
+        """
+        previous = None
+
+        for chunk in chunks:
+            if previous is not None and previous[0] > 0:
+                yield previous
+            previous = chunk
+
+    @staticmethod
+    def read_flslnk_chunk(source, offset = 0, length = -1):
+        """
+        Reads lines of a single chunk from a byte range.
+
+        @param source: Path to `flslnk.tmp` or chunk `.txt` file.
+        @param offset: Byte offset of chunk -> 0
+        @param length: Byte length of chunk -> -1 (until end of file)
+        """
+        with open(source, "rb") as f:
+            f.seek(offset)
+            return f.read(length).decode().splitlines(keepends=True)
+
+    @staticmethod
+    def parse_flslnk_chunk_header(chunk_lines):
+        """
+        Parses time and extents from the header of a `flslnk.tmp` chunk.
+
+        ```
+         printing tn, scl4 and nfs       t=5.52563142E-06  ix=2 to  127   jy=2 to  32  kz=2 to  33
+        2        2      5.526E-06      5.526E-06        2      127        2       32        2       33
+        ```
+
+        @param chunk_lines: List of (at least the first 3) lines in the chunk.
+        @return: Dictionary of `t`, `ix`, `jy`, and `kz` values.
+        """
+        # Header values are on the 3rd line followed by column names.
+        values = chunk_lines[2].split()
+
+        return {
+            "t": float(values[3]),
+            "ix": (int(float(values[4])), int(float(values[5]))),
+            "jy": (int(float(values[6])), int(float(values[7]))),
+            "kz": (int(float(values[8])), int(float(values[9]))),
+        }
+
+    @staticmethod
+    def parse_flslnk_chunk(chunk_lines):
+        """
+        Parses header and data of a single `flslnk.tmp` timestep chunk.
+
+        @param chunk_lines: List of lines within the chunk.
+        @return: Metadata dictionary and dataframe of raw `flslnk` columns.
+        """
+        metadata = SimulationUtilsFlslnk.parse_flslnk_chunk_header(chunk_lines)
+
+        data_df = pd.read_csv(
+            io.StringIO("".join(chunk_lines[3:])),
+            sep=r"\s+",
+            dtype=float,
+        )
+
+        return metadata, data_df
+
+# Forked workers close inherited handles rather than sharing file positions
+# with the parent, and handles are closed when the process exits.
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=SimulationUtilsFlslnk.close_flslnk_zips)
+atexit.register(SimulationUtilsFlslnk.close_flslnk_zips)
@@ -1,5 +1,4 @@
 import numpy as np
-import os
 
 class SimulationUtilsMesh():
     """
@@ -14,35 +13,55 @@ class SimulationUtilsMesh():
         indicating the equivalent distance of each voxel (tick) in cm.
         """
 
-        # Unzip npz files if not already unzipped
-        self.unzip_folder(f"{npz_dir_path}.zip", npz_dir_path)
-
-        npz_files = os.listdir(npz_dir_path)
+        # Reads from `flslnk_npz.zip` if not already unzipped.
+        npz_files = self.list_flslnk_files(npz_dir_path)
 
         if len(npz_files):
             first_npz_filename = npz_files[0]
 
-            row_dict = np.load(f"{npz_dir_path}/{first_npz_filename}")
-            mesh_x_y_z = row_dict["x_y_z"][0]
-            mesh_x_y_z_shape = np.array(mesh_x_y_z).shape
+            row_dict = self.load_flslnk_npz(npz_dir_path, first_npz_filename)
 
-            mesh_z_length = mesh_x_y_z_shape[0]
-            mesh_y_length = mesh_x_y_z_shape[1]
-            mesh_x_length = mesh_x_y_z_shape[2]
+            # `x_y_z` is excluded when mesh is saved once during conversion.
+            if "x_y_z" not in row_dict:
+                print("`x_y_z` not found, using existing mesh_x_y_z.npz")
+                return
 
-            mesh_z = []
-            mesh_y = []
-            mesh_x = []
+            mesh_x_y_z = self.mesh_x_y_z_from_grid(row_dict["x_y_z"][0])
+            np.savez("mesh_x_y_z.npz", **mesh_x_y_z)
+        else:
+            print("Could not generate mesh_x_y_z.npz")
+
+    @staticmethod
+    def mesh_x_y_z_from_grid(x_y_z):
+        """
+        Extracts the `x`, `y`, and `z` ticks (cm) of a `(z, y, x, 3)` grid.
+        """
+        return {
+            "x": x_y_z[0, 0, :, 0],
+            "y": x_y_z[0, :, 0, 1],
+            "z": x_y_z[:, 0, 0, 2],
+        }
 
-            for mesh_z_index in range(mesh_z_length):
-                mesh_z.append(mesh_x_y_z[mesh_z_index][0][0][2])
+    @staticmethod
+    def mesh_cell_edges(ticks):
+        """
+        Computes cell edges from cell center ticks, edges are midway between
+        ticks and first and last cells are symmetric about their tick.
 
-            for mesh_y_index in range(mesh_y_length):
-                mesh_y.append(mesh_x_y_z[0][mesh_y_index][0][1])
+        @param ticks: Sorted 1D array of `n` (at least 2) cell centers.
+        @return: 1D array of `n + 1` cell edges.
+        """
+        ticks = np.asarray(ticks)
 
-            for mesh_x_index in range(mesh_x_length):
-                mesh_x.append(mesh_x_y_z[0][0][mesh_x_index][0])
+        # Width of a single cell cannot be inferred from its center alone.
+        if len(ticks) < 2:
+            raise ValueError(
+                f"Cell edges require at least 2 ticks, got {len(ticks)}"
+            )
 
-            np.savez("mesh_x_y_z.npz", x=mesh_x, y=mesh_y, z=mesh_z)
-        else:
-            print("Could not generate mesh_x_y_z.npz")
+        midpoints = (ticks[1:] + ticks[:-1]) / 2
+        return np.concatenate([
+            [2 * ticks[0] - midpoints[0]],
+            midpoints,
+            [2 * ticks[-1] - midpoints[-1]],
+        ])
@@ -1,6 +1,9 @@
 import logging
+import multiprocessing
 import traceback
 
+from collections import deque
+
 class SimulationUtilsMultiprocessing():
     """
     Multiprocessing methods used within simulation class.
@@ -13,3 +16,49 @@ class SimulationUtilsMultiprocessing():
         """
         logging.error(e)
         logging.error(traceback.format_exc())
+
+    @staticmethod
+    def imap_ordered(
+        func,
+        tasks,
+        num_proc = 1,
+        max_pending = None,
+        maxtasksperchild = None,
+    ):
+        """
+        Runs `func` over tasks and yields results in the same order as tasks,
+        falls back to a serial loop when `num_proc` is 1.
+
+        Tasks are submitted lazily so that at most `max_pending` are held in
+        memory at once, errors raised in workers are re-raised in the parent.
+
+        @param func: Function called with each task's arguments.
+        @param tasks: Iterable of argument tuples.
+        @param num_proc: Number of processes to use.
+        @param max_pending: Maximum tasks in flight -> 2 * `num_proc`
+        @param maxtasksperchild: Tasks before a worker is replaced, limits
+        memory growth of long lived workers -> None
+        """
+        if num_proc <= 1:
+            for args in tasks:
+                yield func(*args)
+            return
+
+        if max_pending is None:
+            max_pending = 2 * num_proc
+
+        with multiprocessing.Pool(
+            processes=num_proc,
+            maxtasksperchild=maxtasksperchild,
+        ) as pool:
+            pending = deque()
+
+            for args in tasks:
+                pending.append(pool.apply_async(func, args))
+
+                # Waits on oldest task before submitting more.
+                if len(pending) >= max_pending:
+                    yield pending.popleft().get()
+
+            while pending:
+                yield pending.popleft().get()
@@ -0,0 +1,146 @@
+import io
+import numpy as np
+import struct
+
+from PIL import Image
+
+# Encoders of compiled frames, "gif" frames are quantized by Pillow and
+# written as they are appended, "mp4" and "webp" frames are piped to ffmpeg
+# (requires `imageio-ffmpeg`).
+VIDEO_FORMATS = {
+    "gif": {},
+    "mp4": {
+        "codec": "libx264",
+        "macro_block_size": 2,
+    },
+    "webp": {
+        "codec": "libwebp_anim",
+        "macro_block_size": 1,
+        "output_params": ["-loop", "0"],
+    },
+}
+
+class GifWriter():
+    """
+    Streams frames to an animated GIF, each frame is encoded by Pillow as a
+    single image and appended with its own (local) color table.
+    """
+
+    def __init__(self, path, fps = 10, loop = 0):
+        self.path = path
+        self.fp = None
+        self.loop = loop
+
+        # Frame delay in hundredths of a second.
+        self.delay = max(1, round(100 / fps))
+
+    def append_data(self, frame):
+        height, width = frame.shape[:2]
+
+        if self.fp is None:
+            self.fp = open(self.path, "wb")
+
+            # Logical screen descriptor without a global color table,
+            # followed by the looping (NETSCAPE2.0) application extension.
+            self.fp.write(b"GIF89a" + struct.pack("<HHBBB", width, height, 0, 0, 0))
+            self.fp.write(
+                b"\x21\xff\x0bNETSCAPE2.0\x03\x01"
+                + struct.pack("<H", self.loop)
+                + b"\x00"
+            )
+
+        buffer = io.BytesIO()
+        Image.fromarray(frame).save(buffer, format="GIF")
+        data = buffer.getvalue()
+
+        # Global color table of the single image becomes a local one.
+        flags = data[10]
+        position = 13
+        color_table = b""
+        if flags & 0x80:
+            color_table = data[position:position + 3 * 2 ** ((flags & 0x07) + 1)]
+            position += len(color_table)
+
+        # Skips extensions preceding the image descriptor.
+        while data[position] == 0x21:
+            position += 2
+            while data[position]:
+                position += data[position] + 1
+            position += 1
+
+        descriptor = bytearray(data[position:position + 10])
+        if color_table:
+            descriptor[9] = (descriptor[9] & 0x78) | 0x80 | (flags & 0x07)
+
+        # Graphics control extension with frame delay.
+        self.fp.write(b"\x21\xf9\x04\x00" + struct.pack("<H", self.delay) + b"\x00\x00")
+        self.fp.write(bytes(descriptor) + color_table)
+
+        # Image data up to (and excluding) the trailer.
+        self.fp.write(data[position + 10:-1])
+
+    def close(self):
+        if self.fp is not None:
+            self.fp.write(b"\x3b")
+            self.fp.close()
+
+class FFmpegWriter():
+    """
+    Streams frames to an ffmpeg process, started with size of first frame.
+    """
+
+    def __init__(self, path, fps = 10, **kwargs):
+        self.path = path
+        self.fps = fps
+        self.kwargs = kwargs
+        self.generator = None
+
+    def append_data(self, frame):
+        if self.generator is None:
+            import imageio_ffmpeg
+
+            height, width = frame.shape[:2]
+            self.generator = imageio_ffmpeg.write_frames(
+                self.path,
+                (width, height),
+                fps=self.fps,
+                **self.kwargs,
+            )
+            self.generator.send(None)
+
+        self.generator.send(frame)
+
+    def close(self):
+        if self.generator is not None:
+            self.generator.close()
+
+class SimulationUtilsVideo():
+    """
+    Video methods used within simulation class.
+    """
+
+    @staticmethod
+    def get_video_writer(path, video_format = "gif", fps = 10):
+        """
+        Opens a streaming writer so frames are encoded as they are rendered
+        rather than held in memory.
+
+        @param path: Path to the output file, e.g., "temperature.gif"
+        @param video_format: "gif", "mp4", or "webp" -> "gif"
+        @param fps: Frames per second -> 10
+        @return: Writer, frames are added with `append_frame`.
+        """
+        if video_format not in VIDEO_FORMATS:
+            raise ValueError(f"Video format `{video_format}` not supported")
+
+        if video_format == "gif":
+            return GifWriter(path, fps)
+
+        return FFmpegWriter(path, fps, **VIDEO_FORMATS[video_format])
+
+    @staticmethod
+    def append_frame(writer, frame):
+        """
+        Appends RGB(A) frame to writer, alpha channel is dropped.
+        """
+        writer.append_data(np.ascontiguousarray(np.asarray(frame)[..., :3]))
@@ -1,4 +1,3 @@
-import multiprocessing
 import numpy as np
 import os
 
@@ -32,6 +31,20 @@ COLUMNS_CONFIG = {
     },
 }
 
+# Cross section view for planes normal to each axis.
+SLICE_VIEWS = {
+    "x": "cross_section_yz",
+    "y": "cross_section_xz",
+    "z": "cross_section_xy",
+}
+
+# Position of each axis within `(t, z, y, x)` field stacks.
+SLICE_AXES = {"z": 1, "y": 2, "x": 3}
+
+# Stacks opened by `load_view_stack` within this process, mapped from path to
+# modification time and read only memory map.
+VIEW_STACKS = {}
+
 class SimulationView():
     """
     Methods to slice and rotate meshes of flsnk `.npz` files for visualization,
@@ -43,10 +56,12 @@ class SimulationView():
         views = ["isometric", "cross_section_xy", "cross_section_xz", "cross_section_yz"],
         npz_dir_path = "flslnk_npz",
         regenerate_mesh_x_y_z = False,
+        unzip_npz = False,
         **kwargs
     ):
         """
-        Initialize view folders, unzip npz folder, and create `mesh_x_y_z` file.
+        Initialize view folders and create `mesh_x_y_z` file, `.npz` files are
+        read directly from `flslnk_npz.zip` unless `unzip_npz` is set.
         """
 
         # Initialize visualize folders.
@@ -66,62 +81,334 @@ class SimulationView():
                 if not os.path.exists(f"{view_folder}/{key}"):
                     os.makedirs(f"{view_folder}/{key}")
 
-        # Unzip npz files
-        self.unzip_folder(f"{npz_dir_path}.zip", npz_dir_path)
+        # `.npz` files are read directly from `flslnk_npz.zip` unless unzipped.
+        if unzip_npz:
+            self.unzip_folder(f"{npz_dir_path}.zip", npz_dir_path)
 
         # Check if `mesh_x_y_z.npz exists` and create if not existant
         if not os.path.exists(f"mesh_x_y_z.npz") or regenerate_mesh_x_y_z:
             self.generate_mesh_x_y_z(npz_dir_path = npz_dir_path)
 
     @SimulationUtilsDecorators.change_working_directory 
+    @SimulationUtilsDecorators.stage_manifest(
+        "views",
+        inputs = lambda self, arguments: [
+            f"{arguments['npz_dir_path']}.zip",
+            arguments["npz_dir_path"],
+            "mesh_x_y_z.npz",
+        ],
+        outputs = lambda self, arguments: [f"views/{view}" for view in arguments["views"]],
+        parameters = ["views", "npz_dir_path", "output_format"],
+    )
     def generate_views(
             self,
             views = ["isometric", "cross_section_xy", "cross_section_xz", "cross_section_yz"],
             npz_dir_path = "flslnk_npz",
             num_proc = 1,
+            output_format = "npz",
             **kwargs
         ):
         """
-        Generates the `.npz` files for a specific view (i.e. `cross_section_x`)
-        for all simulation timesteps.
+        Generates the `.npz` files for views (i.e. `cross_section_xz`) for all
+        simulation timesteps, each timestep is loaded once for all views.
+        ```
+        simulation/
+        ├─ views/
+        │  ├─ cross_section_xz/
+        │  │  ├─ temperature/
+        │  │  │  ├─ 0000.npz        ("npz")
+        │  │  ├─ temperature.npy    ("stack", (t, h, w))
+        ...
+        ```
+
+        @param num_proc: Number of processes generating views, created once
+        for all views -> 1
+        @param output_format: One "npz" file per timestep, or "stack" of all
+        timesteps in a single `.npy` file per view and field -> "npz"
+        @param force: Runs even if `views` manifest is up to date -> False
         """
+        # Mesh ticks are loaded once and shared across views and timesteps,
+        # only `xz` and `yz` cross sections use them.
+        mesh_x_y_z = None
+        if any(view in ["cross_section_xz", "cross_section_yz"] for view in views):
+            mesh_x_y_z = dict(np.load("mesh_x_y_z.npz"))
+
+        # Workers are sent file names rather than arrays.
+        npz_files = self.list_flslnk_files(npz_dir_path)
+        length = len(npz_files)
+
+        # Frames are only returned from workers when stacked.
+        save = output_format == "npz"
+
+        # Resumes after the last timestep saved by an interrupted attempt,
+        # stacks are always written from the start.
+        start = self.read_stage_progress("views") if save else 0
+        if start > 0:
+            print(f"Resuming views at timestep {start}...")
+
+        tasks = (
+            (npz_dir_path, npz_file, index, views, mesh_x_y_z, save)
+            for index, npz_file in enumerate(npz_files)
+            if index >= start
+        )
+        results = self.imap_ordered(self.view_flslnk_npz, tasks, num_proc = num_proc)
+
+        with self.track_stage_progress("views", results, start) as results:
+            results = tqdm(results, total = length - start)
+
+            if save:
+                for view in views:
+                    for key in COLUMNS_CONFIG.keys():
+                        # Removes stale stack so frames are read from `.npz` files.
+                        stack_file = f"views/{view}/{key}.npy"
+                        if os.path.exists(stack_file):
+                            os.remove(stack_file)
+
+                for _ in results:
+                    pass
 
-        for view in views:
+            else:
+                self.write_view_stacks(results, length)
 
-            # View method for visualization.
-            view_method = getattr(self, f"view_{view}")
+        return self
+
+    @SimulationUtilsDecorators.change_working_directory 
+    def generate_view_slices(
+        self,
+        planes = {},
+        laser_offsets = [],
+        laser_start_x = None,
+        keys = None,
+        npz_dir_path = "flslnk_npz",
+        cache_dir_path = "flslnk_cache",
+        **kwargs,
+    ):
+        """
+        Generates stacked cross sections at any axis aligned planes, selected
+        by physical coordinate, and at `yz` planes following the laser. All
+        timesteps are sliced at once from the memory mapped field cache.
+        ```
+        simulation/
+        ├─ views/
+        │  ├─ cross_section_yz_0040/        (x = mesh_x[40])
+        │  │  ├─ temperature.npy            (t, h, w)
+        │  ├─ cross_section_yz_laser_0.0/   (x = laser position)
+        ...
+        ```
+
+        @param planes: Dictionary of normal axis to coordinates (cm), i.e.
+        {"x": [0.05, 0.1], "z": [0.02]} -> {}
+        @param laser_offsets: Distances (cm) ahead (+) or behind (-) the laser
+        of `yz` planes following the laser -> []
+        @param laser_start_x: Starting `x` position of laser (cm) -> None
+        (`beam_x`)
+        @param keys: Fields to slice -> None (`COLUMNS_CONFIG` fields)
+        @return: List of generated view names.
+        """
+        if keys is None:
+            keys = list(COLUMNS_CONFIG.keys())
+
+        if laser_start_x is None:
+            laser_start_x = self.cgs("beam_x")
 
-            #TODO: Add checks
-            if num_proc > 1:
-                with multiprocessing.Pool(processes=num_proc) as pool:
-
-                    for index, npz_file in tqdm(enumerate(sorted(os.listdir(npz_dir_path)))):
-                        npz_data = np.load(f"{npz_dir_path}/{npz_file}")
-                        example = {key: npz_data[key] for key in npz_data.keys()}
-                        pool.apply_async(
-                            view_method,
-                            args=(example, index),
-                            error_callback=self.error_callback,
+        mesh_x_y_z = np.load("mesh_x_y_z.npz")
+
+        fields = self.load_flslnk_cache(
+            keys = [*keys, "timestep", "velocity"],
+            npz_dir_path = npz_dir_path,
+            cache_dir_path = cache_dir_path,
+            working_dir = ".",
+        )
+
+        # View name to normal axis and mesh index (or index per timestep).
+        slices = {}
+
+        for axis, coordinates in planes.items():
+            for coordinate in coordinates:
+                index = self.find_index(coordinate, mesh_x_y_z[axis])
+                index_string = f"{index}".zfill(4)
+                slices[f"{SLICE_VIEWS[axis]}_{index_string}"] = (axis, index)
+
+        if len(laser_offsets):
+            laser_x = self.x_distance(
+                fields["timestep"],
+                fields["velocity"],
+                laser_start_x,
+            )
+
+            for laser_offset in laser_offsets:
+                indices = self.find_indices(laser_x + laser_offset, mesh_x_y_z["x"])
+                slices[f"cross_section_yz_laser_{laser_offset}"] = ("x", indices)
+
+        for view, (axis, index) in tqdm(slices.items()):
+            if not os.path.exists(f"views/{view}"):
+                os.makedirs(f"views/{view}")
+
+            for key in keys:
+                np.save(
+                    f"views/{view}/{key}.npy",
+                    self.slice_stack(fields[key], axis, index),
+                )
+
+        return list(slices.keys())
+
+    @staticmethod
+    def slice_stack(stack, axis, index):
+        """
+        Slices `(t, z, y, x)` stack at the plane normal to `axis`, oriented
+        the same as cross section views.
+
+        @param stack: Array with time as the first axis.
+        @param axis: Normal axis of plane, "x", "y", or "z".
+        @param index: Mesh index of plane, or array of index per timestep.
+        @return: Array of `(t, h, w)`.
+        """
+        if np.ndim(index) == 0:
+            planes = np.take(stack, index, axis=SLICE_AXES[axis])
+        else:
+            # Selects a different plane for each timestep.
+            planes = np.moveaxis(stack, SLICE_AXES[axis], 1)[
+                np.arange(len(stack)),
+                index,
+            ]
+
+        return planes[:, ::-1, ::-1]
+
+    def write_view_stacks(self, results, length):
+        """
+        Appends frames of each view and field into `views/{view}/{key}.npy`
+        with time as the first axis, created on the first frame.
+
+        @param results: Iterable of `{view: {key: frame}}` ordered by index.
+        @param length: Number of timesteps.
+        """
+        stacks = {}
+
+        for index, view_frames in enumerate(results):
+            for view, frames in view_frames.items():
+                for key, frame in frames.items():
+                    if (view, key) not in stacks:
+                        stacks[(view, key)] = np.lib.format.open_memmap(
+                            f"views/{view}/{key}.npy",
+                            mode="w+",
+                            dtype=frame.dtype,
+                            shape=(length, *frame.shape),
                         )
-                    pool.close()
-                    pool.join()
-        
-            else:
-                for index, npz_file in tqdm(enumerate(sorted(os.listdir(npz_dir_path)))):
-                    npz_data = np.load(f"{npz_dir_path}/{npz_file}")
-                    example = {key: npz_data[key] for key in npz_data.keys()}
-                    view_method(example, index)
 
-    def view_cross_section_xz(self, example, index):
+                    stacks[(view, key)][index] = frame
+
+        for stack in stacks.values():
+            stack.flush()
+
+    @staticmethod
+    def load_view_stack(view, key):
+        """
+        Loads all frames of `views/{view}/{key}.npy` as a read only memory map,
+        `None` if views were not generated as a "stack". Memory maps are kept
+        so frames of the same stack are indexed from a single handle.
+        """
+        stack_file = f"views/{view}/{key}.npy"
+        if not os.path.exists(stack_file):
+            VIEW_STACKS.pop(os.path.abspath(stack_file), None)
+            return None
+
+        # Opened once per view and field, reopened if stack is rewritten.
+        stack_path = os.path.abspath(stack_file)
+        mtime_ns = os.stat(stack_path).st_mtime_ns
+        if stack_path in VIEW_STACKS and VIEW_STACKS[stack_path][0] == mtime_ns:
+            return VIEW_STACKS[stack_path][1]
+
+        stack = np.load(stack_path, mmap_mode="r")
+        VIEW_STACKS[stack_path] = (mtime_ns, stack)
+        return stack
+
+    @staticmethod
+    def load_view(view, key, index, stack = None):
+        """
+        Loads a single frame of a view from either the stacked `.npy` file or
+        the timestep `.npz` file, `None` if not generated.
+
+        @param stack: Stack already opened with `load_view_stack` -> None
+        """
+        if stack is None:
+            stack = SimulationView.load_view_stack(view, key)
+        if stack is not None:
+            return stack[index]
+
+        index_string = f"{index}".zfill(4)
+        view_file = f"views/{view}/{key}/{index_string}.npz"
+        if os.path.exists(view_file):
+            return np.load(view_file)["data"]
+
+    def view_flslnk_npz(
+        self,
+        npz_dir_path,
+        npz_file,
+        index,
+        views,
+        mesh_x_y_z = None,
+        save = True,
+    ):
+        """
+        Loads a single `.npz` file and generates all views for it.
+        """
+        example = self.load_flslnk_npz(
+            npz_dir_path,
+            npz_file,
+            keys = list(COLUMNS_CONFIG.keys()),
+        )
+        return self.view_timestep(example, index, views, mesh_x_y_z, save)
+
+    def view_timestep(self, example, index, views, mesh_x_y_z = None, save = True):
+        """
+        Generates all views for a single timestep.
+
+        @param example: Dictionary of `flslnk_npz` values for timestep.
+        @param index: Index of timestep.
+        @param views: List of views, i.e. ["isometric", "cross_section_xz"]
+        @param mesh_x_y_z: Dictionary of `x`, `y`, and `z` ticks -> None
+        (loads `mesh_x_y_z.npz`)
+        @param save: Saves each frame as `.npz` -> True
+        @return: Dictionary of view to frames when not saved.
+        """
+        view_frames = {}
+
+        for view in views:
+            view_method = getattr(self, f"view_{view}")
+            view_frames[view] = view_method(
+                example,
+                index,
+                mesh_x_y_z = mesh_x_y_z,
+                save = save,
+            )
+
+        if not save:
+            return view_frames
+
+    def save_view(self, view, key, index, frame, save = True):
+        """
+        Saves frame of view to `views/{view}/{key}/{index}.npz` if `save`.
+        """
+        if save:
+            index_string = f"{index}".zfill(4)
+
+            np.savez_compressed(
+                f"views/{view}/{key}/{index_string}.npz",
+                data=frame
+            )
+
+    def view_cross_section_xz(self, example, index, mesh_x_y_z = None, save = True, **kwargs):
         """
         Generates the cross_section along the x axis, cut with xz plane, using y
         axis midpoint. Assumes that the working directory is the changed to the
         simulation
         """
-        mesh_x_y_z = np.load("mesh_x_y_z.npz")
+        if mesh_x_y_z is None:
+            mesh_x_y_z = np.load("mesh_x_y_z.npz")
         mesh_y = mesh_x_y_z["y"]
         midpoint = len(mesh_y) // 2
 
+        frames = {}
         for key, configs in COLUMNS_CONFIG.items():
             values = np.array(example[key][0])
 
@@ -129,40 +416,40 @@ class SimulationView():
                 crop_y=(midpoint, midpoint + 1)
             )
 
-            index_string = f"{index}".zfill(4)
             rotated_array = cropped_array.squeeze()[::-1, ::-1]
 
-            np.savez_compressed(
-                f"views/cross_section_xz/{key}/{index_string}.npz",
-                data=rotated_array
-            )
+            frames[key] = rotated_array
+            self.save_view("cross_section_xz", key, index, rotated_array, save)
+
+        return frames
         
-    def view_cross_section_yz(self, example, index):
+    def view_cross_section_yz(self, example, index, mesh_x_y_z = None, save = True, **kwargs):
         """
         Generates the cross_section along the y axis, cut with the yz plane,
         using x axis midpoint. Assumes that the working directory is the
         changed to the simulation
         """
-        mesh_x_y_z = np.load("mesh_x_y_z.npz")
+        if mesh_x_y_z is None:
+            mesh_x_y_z = np.load("mesh_x_y_z.npz")
         mesh_x = mesh_x_y_z["x"]
 
         midpoint = len(mesh_x) // 2
 
+        frames = {}
         for key, configs in COLUMNS_CONFIG.items():
             cropped_array = self.crop_3d_array(
                 np.array(example[key][0]),
                 crop_x=(midpoint, midpoint + 1)
             )
 
-            index_string = f"{index}".zfill(4)
             rotated_array = cropped_array.squeeze()[::-1, ::-1]
 
-            np.savez_compressed(
-                f"views/cross_section_yz/{key}/{index_string}.npz",
-                data=rotated_array
-            )
+            frames[key] = rotated_array
+            self.save_view("cross_section_yz", key, index, rotated_array, save)
 
-    def view_cross_section_xy(self, example, index):
+        return frames
+
+    def view_cross_section_xy(self, example, index, save = True, **kwargs):
         """
         Generates the cross_section along the x axis, cut with the xy plane,
         from `fluid_region_z_end`.
@@ -170,6 +457,7 @@ class SimulationView():
         """
         top_of_fluid = int(self.fluid_region_z_end // self.mesh_size) - 1
 
+        frames = {}
         for key, configs in COLUMNS_CONFIG.items():
             values = np.array(example[key][0])
             # print(f"values.shape: {values.shape}")
@@ -179,25 +467,23 @@ class SimulationView():
             )
             # print(f"cropped_array.shape: {cropped_array.shape}")
 
-            index_string = f"{index}".zfill(4)
             rotated_array = cropped_array.squeeze()[::-1, ::-1]
 
-            np.savez_compressed(
-                f"views/cross_section_xy/{key}/{index_string}.npz",
-                data=rotated_array
-            )
+            frames[key] = rotated_array
+            self.save_view("cross_section_xy", key, index, rotated_array, save)
 
-    def view_isometric(self, example, index, **kwargs):
+        return frames
 
+    def view_isometric(self, example, index, save = True, **kwargs):
+
+        frames = {}
         for key, configs in COLUMNS_CONFIG.items():
             if key == "temperature":
 
                 values = np.array(example[key][0])
                 mesh = np.transpose(values, (2, 1, 0))  # Transpose to match voxel orientation
 
-                index_string = f"{index}".zfill(4)
+                frames[key] = mesh
+                self.save_view("isometric", key, index, mesh, save)
 
-                np.savez_compressed(
-                    f"views/isometric/{key}/{index_string}.npz",
-                    data=mesh
-                )
\ No newline at end of file
+        return frames
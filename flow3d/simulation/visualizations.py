@@ -1,14 +1,19 @@
 import imageio
+import matplotlib
 import matplotlib.pyplot as plt
-import multiprocessing
 import numpy as np
 import os
 
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.colors import Normalize
-from matplotlib.cm import get_cmap, ScalarMappable
+from matplotlib.figure import Figure
+from matplotlib.cm import ScalarMappable
+from mpl_toolkits.mplot3d.art3d import Poly3DCollection
+from skimage import measure
 from tqdm import tqdm
 
 from flow3d.simulation.utils.decorators import SimulationUtilsDecorators
+from flow3d.simulation.utils.video import VIDEO_FORMATS
 
 # TODO: Handle with class (maybe parameters)
 COLUMNS_CONFIG = {
@@ -36,6 +41,61 @@ COLUMNS_CONFIG = {
     },
 }
 
+# Modes of rendering cross section frames, "figure" draws each frame with
+# title and colorbar, "raw" maps values directly to pixels with a colormap
+# lookup table.
+FRAME_MODES = ["figure", "raw"]
+
+# Renderers of isometric view, "voxels" draws every voxel with `ax.voxels`
+# which is slow for large grids.
+ISOMETRIC_RENDERERS = ["voxels", "surface", "projection"]
+
+class CrossSectionFigure():
+    """
+    Figure of a 2D cross section that is built once and only updates image
+    data and title for each frame, rendered through the Agg canvas.
+    """
+
+    def __init__(self, shape, configs):
+        """
+        @param shape: Shape of frames.
+        @param configs: Field configuration from `COLUMNS_CONFIG`.
+        """
+        self.figure = Figure()
+        self.canvas = FigureCanvasAgg(self.figure)
+
+        ax = self.figure.add_subplot()
+        self.image = ax.imshow(
+            np.zeros(shape),
+            cmap=configs["cmap"],
+            vmin=configs["clim"][0],
+            vmax=configs["clim"][1],
+        )
+        self.title = ax.set_title("")
+        self.figure.colorbar(self.image)
+
+        # Axes and colorbar are drawn once as background, `clim` is fixed so
+        # only the image and title change between frames.
+        self.ax = ax
+        self.image.set_visible(False)
+        self.canvas.draw()
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self.image.set_visible(True)
+
+    def render(self, data, title):
+        """
+        Updates figure with frame and returns a copy of its RGBA pixels, the
+        canvas buffer is overwritten by the next render.
+        """
+        self.image.set_data(data)
+        self.title.set_text(title)
+
+        self.canvas.restore_region(self.background)
+        self.ax.draw_artist(self.image)
+        self.ax.draw_artist(self.title)
+
+        return np.array(self.canvas.buffer_rgba())
+
 class SimulationVisualizations():
 
     # TODO: Make into decorator
@@ -45,10 +105,12 @@ class SimulationVisualizations():
         views = ["isometric", "cross_section_xy", "cross_section_xz", "cross_section_yz"],
         npz_dir_path = "flslnk_npz",
         regenerate_mesh_x_y_z = False,
+        unzip_npz = False,
         **kwargs
     ):
         """
-        Initialize view folders, unzip npz folder, and create `mesh_x_y_z` file.
+        Initialize view folders and create `mesh_x_y_z` file, `.npz` files are
+        read directly from `flslnk_npz.zip` unless `unzip_npz` is set.
         """
 
         # Initialize visualize folders.
@@ -68,8 +130,9 @@ class SimulationVisualizations():
                 if not os.path.exists(f"{view_folder}/{key}"):
                     os.makedirs(f"{view_folder}/{key}")
 
-        # Unzip npz files
-        self.unzip_folder(f"{npz_dir_path}.zip", npz_dir_path)
+        # `.npz` files are read directly from `flslnk_npz.zip` unless unzipped.
+        if unzip_npz:
+            self.unzip_folder(f"{npz_dir_path}.zip", npz_dir_path)
 
         # Check if `mesh_x_y_z.npz exists` and create if not existant
         if not os.path.exists(f"mesh_x_y_z.npz") or regenerate_mesh_x_y_z:
@@ -77,157 +140,515 @@ class SimulationVisualizations():
 
     # TODO: Consider renaming this to `generate_view_visualizations`.
     @SimulationUtilsDecorators.change_working_directory 
+    @SimulationUtilsDecorators.stage_manifest(
+        "visualizations",
+        inputs = lambda self, arguments: [
+            f"{arguments['npz_dir_path']}.zip",
+            arguments["npz_dir_path"],
+            *[f"views/{view}" for view in arguments["views"]],
+        ],
+        outputs = lambda self, arguments: [
+            f"visualizations/{view}" for view in arguments["views"]
+        ],
+        parameters = [
+            "views",
+            "npz_dir_path",
+            "isometric_renderer",
+            "video_format",
+            "fps",
+            "save_frames",
+            "frame_mode",
+            "scale",
+        ],
+    )
     def generate_views_visualizations(
         self,
         views = ["isometric", "cross_section_xy", "cross_section_xz", "cross_section_yz"],
         npz_dir_path = "flslnk_npz",
         num_proc = 1,
+        isometric_renderer = "voxels",
+        video_format = "gif",
+        fps = 10,
+        save_frames = True,
+        frame_mode = "figure",
+        scale = 1,
         **kwargs
     ):
+        """
+        Visualizes each view frame and streams frames of each field into
+        `visualizations/{view}/{key}.{video_format}` as they are rendered.
+
+        @param num_proc: Number of processes visualizing timesteps (isometric)
+        or fields (cross sections) -> 1
+        @param isometric_renderer: "voxels", "surface", or "projection" ->
+        "voxels"
+        @param video_format: "gif", "mp4", or "webp" (requires
+        `imageio-ffmpeg`) -> "gif"
+        @param fps: Frames per second of video -> 10
+        @param save_frames: Also saves each frame as `.png` -> True
+        @param frame_mode: Cross sections rendered as "figure" or "raw" ->
+        "figure"
+        @param scale: Pixels per cell of "raw" frames -> 1
+        @param force: Runs even if `visualizations` manifest is up to date ->
+        False
+
+        @param working_dir: Sets working directory to `simulation.name`.
+        """
+        if isometric_renderer not in ISOMETRIC_RENDERERS:
+            raise ValueError(f"Isometric renderer `{isometric_renderer}` not supported")
+
+        if frame_mode not in FRAME_MODES:
+            raise ValueError(f"Frame mode `{frame_mode}` not supported")
+
+        if video_format not in VIDEO_FORMATS:
+            raise ValueError(f"Video format `{video_format}` not supported")
+
         print(f"""\n
 ################################################################################
 Visualize Views: `{self.name}`
 ################################################################################
 """)
+        npz_files = self.list_flslnk_files(npz_dir_path)
+
+        cross_section_views = [view for view in views if view.startswith("cross_section")]
+        isometric_views = [view for view in views if view not in cross_section_views]
+
+        # Isometric frames are appended to writers in timestep order.
+        if len(isometric_views) > 0:
+            tasks = (
+                (
+                    npz_dir_path,
+                    npz_file,
+                    index,
+                    isometric_views,
+                    isometric_renderer,
+                    save_frames,
+                )
+                for index, npz_file in enumerate(npz_files)
+            )
+            results = self.imap_ordered(
+                self.view_visualization_flslnk_npz,
+                tasks,
+                num_proc = num_proc,
+            )
+
+            writers = {}
+            try:
+                for frames in tqdm(results, total=len(npz_files)):
+                    for (view, key), frame in frames.items():
+                        if (view, key) not in writers:
+                            writers[(view, key)] = self.get_video_writer(
+                                f"visualizations/{view}/{key}.{video_format}",
+                                video_format,
+                                fps,
+                            )
+                        self.append_frame(writers[(view, key)], frame)
+            finally:
+                for writer in writers.values():
+                    writer.close()
+
+        # Raw frames need no process parameters for titles, each worker maps
+        # and encodes all frames of one view and field.
+        if len(cross_section_views) > 0 and frame_mode == "raw":
+            tasks = [
+                (view, key, len(npz_files), video_format, fps, save_frames, scale)
+                for view in cross_section_views
+                for key in COLUMNS_CONFIG.keys()
+            ]
+            results = self.imap_ordered(
+                self.view_visualization_cross_section_raw,
+                tasks,
+                num_proc = num_proc,
+            )
+            for _ in tqdm(results, total=len(tasks)):
+                pass
+
+        # Cross sections reuse a single figure for all frames of a field so
+        # each worker renders and encodes one view and field.
+        elif len(cross_section_views) > 0:
+            parameters = [
+                (example["power"][0], example["velocity"][0])
+                for _, _, example in self.iter_flslnk_npz(
+                    npz_dir_path,
+                    keys = ["power", "velocity"],
+                )
+            ]
+            tasks = [
+                (view, key, parameters, video_format, fps, save_frames)
+                for view in cross_section_views
+                for key in COLUMNS_CONFIG.keys()
+            ]
+            results = self.imap_ordered(
+                self.view_visualization_cross_section,
+                tasks,
+                num_proc = num_proc,
+            )
+            for _ in tqdm(results, total=len(tasks)):
+                pass
+
+        return self
+
+    def view_visualization_flslnk_npz(
+        self,
+        npz_dir_path,
+        npz_file,
+        index,
+        views,
+        isometric_renderer = "voxels",
+        save_frames = True,
+    ):
+        """
+        Loads a single `.npz` file and generates visualizations of isometric
+        views.
+
+        @return: Dictionary of (view, field) to RGBA frame.
+        """
+        # Field frames are read from views, only process parameters are read
+        # from `.npz` file.
+        example = self.load_flslnk_npz(
+            npz_dir_path,
+            npz_file,
+            keys = ["power", "velocity"],
+        )
+
+        frames = {}
         for view in views:
+            view_frames = self.view_visualization_isometric(
+                view,
+                example,
+                index,
+                renderer = isometric_renderer,
+                save_frames = save_frames,
+            )
+            for key, frame in view_frames.items():
+                frames[(view, key)] = frame
+
+        return frames
 
-            # View method for visualization.
-            if view in ["cross_section_xy", "cross_section_xz", "cross_section_yz"]:
-                view_method = getattr(self, f"view_visualization_cross_section")
-            else:
-                view_method = getattr(self, f"view_visualization_isometric")
+    # TODO: Include more information in visualization
+    def view_visualization_cross_section(
+        self,
+        view,
+        key,
+        parameters,
+        video_format = "gif",
+        fps = 10,
+        save_frames = True,
+    ):
+        """
+        Generates visualizations of 2D cross section view for all frames of a
+        field, colorbar is fixed to `clim` of field. Frames are streamed to
+        `visualizations/{view}/{key}.{video_format}`.
+
+        @param view: Cross section view, i.e. "cross_section_xz"
+        @param key: Field, i.e. "temperature"
+        @param parameters: List of (power, velocity) for each timestep.
+        @param video_format: "gif", "mp4", or "webp" -> "gif"
+        @param fps: Frames per second of video -> 10
+        @param save_frames: Also saves each frame as `.png` -> True
+        """
+        configs = COLUMNS_CONFIG[key]
+        stack = self.load_view_stack(view, key)
+        figure = None
+        writer = None
 
-            #TODO: Add checks
-            if num_proc > 1:
-                with multiprocessing.Pool(processes=num_proc) as pool:
+        try:
+            for index, (power, velocity) in enumerate(parameters):
+                index_string = f"{index}".zfill(4)
 
+                # Reads frame from stacked `.npy` or timestep `.npz` file.
+                view_data = self.load_view(view, key, index, stack)
+                if view_data is not None:
 
-                    for index, npz_file in tqdm(enumerate(sorted(os.listdir(npz_dir_path)))):
-                        npz_data = np.load(f"{npz_dir_path}/{npz_file}")
-                        example = {key: npz_data[key] for key in npz_data.keys()}
-                        pool.apply_async(
-                            view_method,
-                            args=(view, example, index),
-                            error_callback=self.error_callback,
+                    if figure is None:
+                        figure = CrossSectionFigure(view_data.shape, configs)
+                        writer = self.get_video_writer(
+                            f"visualizations/{view}/{key}.{video_format}",
+                            video_format,
+                            fps,
                         )
-                    pool.close()
-                    pool.join()
 
-            else:
-                for index, npz_file in tqdm(enumerate(sorted(os.listdir(npz_dir_path)))):
-                    npz_data = np.load(f"{npz_dir_path}/{npz_file}")
-                    example = {key: npz_data[key] for key in npz_data.keys()}
-                    view_method(view, example, index)
+                    frame = figure.render(
+                        view_data,
+                        f"{configs['title']} ({power} W, {velocity} m/s)",
+                    )
+                    self.append_frame(writer, frame)
 
-            print("Compiling images to `.gif`...")
+                    if save_frames:
+                        imageio.imwrite(f"visualizations/{view}/{key}/{index_string}.png", frame)
+        finally:
+            if writer is not None:
+                writer.close()
 
-            view_folder = f"visualizations/{view}"
-            column_folders = sorted(os.listdir(f"{view_folder}"))
+    def view_visualization_cross_section_raw(
+        self,
+        view,
+        key,
+        num_frames,
+        video_format = "gif",
+        fps = 10,
+        save_frames = True,
+        scale = 1,
+        chunk_size = 256,
+    ):
+        """
+        Generates raw visualizations of 2D cross section view for all frames
+        of a field, each cell is mapped to a color of the field's `clim` with
+        a lookup table in chunks of frames.
+
+        @param view: Cross section view, i.e. "cross_section_xz"
+        @param key: Field, i.e. "temperature"
+        @param num_frames: Number of timesteps.
+        @param video_format: "gif", "mp4", or "webp" -> "gif"
+        @param fps: Frames per second of video -> 10
+        @param save_frames: Also saves each frame as `.png` -> True
+        @param scale: Pixels per cell -> 1
+        @param chunk_size: Frames mapped at once -> 256
+        """
+        configs = COLUMNS_CONFIG[key]
+        lut = self.colormap_lut(configs["cmap"])
+        stack = self.load_view_stack(view, key)
+        writer = None
+
+        try:
+            for start in range(0, num_frames, chunk_size):
+                indexes = range(start, min(start + chunk_size, num_frames))
+
+                # Reads frames from stacked `.npy` or timestep `.npz` files.
+                if stack is not None:
+                    chunk = stack[indexes.start:indexes.stop]
+                else:
+                    view_frames = [(index, self.load_view(view, key, index)) for index in indexes]
+                    view_frames = [(index, frame) for index, frame in view_frames if frame is not None]
+                    if len(view_frames) == 0:
+                        continue
+                    indexes = [index for index, _ in view_frames]
+                    chunk = np.stack([frame for _, frame in view_frames])
+
+                frames = self.apply_colormap_lut(chunk, lut, configs["clim"], scale)
+
+                if writer is None:
+                    writer = self.get_video_writer(
+                        f"visualizations/{view}/{key}.{video_format}",
+                        video_format,
+                        fps,
+                    )
 
-            # Iterates through column folders within images
-            # i.e. "pressure", "temperature", "fraction_of_fluid", etc.
-            for column_folder in tqdm(column_folders):
-                column_folder_path = f"{view_folder}/{column_folder}"
+                for index, frame in zip(indexes, frames):
+                    self.append_frame(writer, frame)
 
-                if os.path.isdir(column_folder_path):
-                    frames = []
-                    for image_file in sorted(os.listdir(column_folder_path)):
-                        image = imageio.imread(f"{column_folder_path}/{image_file}")
-                        frames.append(image)
+                    if save_frames:
+                        index_string = f"{index}".zfill(4)
+                        imageio.imwrite(f"visualizations/{view}/{key}/{index_string}.png", frame)
+        finally:
+            if writer is not None:
+                writer.close()
 
-                    # Only compile .gif for folders with images. 
-                    if len(frames) > 0:
-                        imageio.mimsave(f"{view_folder}/{column_folder}.gif", frames, fps = 10, loop = 0)
+    @staticmethod
+    def colormap_lut(cmap):
+        """
+        Precomputes 256 entry RGB lookup table of colormap, followed by the
+        colormap's "bad" color used for NaN values.
 
-    # TODO: Include more information in visualization
-    # TODO: Make colorbar consistent throughout frames.
-    def view_visualization_cross_section(self, view, example, index):
+        @param cmap: Name of colormap, i.e. "plasma"
+        @return: `(257, 3)` array of `uint8` colors.
+        """
+        colormap = matplotlib.colormaps[cmap].resampled(256)
+
+        # Masked last entry takes the "bad" color.
+        indexes = np.ma.masked_equal(np.arange(257), 256)
+        return colormap(indexes, bytes=True)[:, :3]
+
+    @staticmethod
+    def apply_colormap_lut(frames, lut, clim, scale = 1):
         """
-        Generates visualization of 2D cross section view.
+        Maps values to colors of lookup table, values outside `clim` are
+        clipped to the first or last color and NaN values take the "bad"
+        color (same as Matplotlib).
+
+        @param frames: `(t, h, w)` array of values.
+        @param lut: `(257, 3)` lookup table from `colormap_lut`.
+        @param clim: (min, max) values of colormap.
+        @param scale: Pixels per cell -> 1
+        @return: `(t, h * scale, w * scale, 3)` array of `uint8` frames.
         """
-        power, velocity = example["power"][0], example["velocity"][0]
+        colors = len(lut) - 1
 
-        for key, configs in COLUMNS_CONFIG.items():
-            index_string = f"{index}".zfill(4)
+        scaled = (np.asarray(frames, dtype=float) - clim[0]) / (clim[1] - clim[0])
+        scaled *= colors
+        bad = np.isnan(scaled)
+        np.nan_to_num(scaled, copy=False, nan=0)
+        indexes = np.clip(scaled, 0, colors - 1).astype(np.uint16)
+        indexes[bad] = colors
+
+        if scale > 1:
+            indexes = indexes.repeat(scale, axis=-2).repeat(scale, axis=-1)
 
-            view_file = f"views/{view}/{key}/{index_string}.npz"
-            if os.path.exists(view_file):
-                view_data = np.load(view_file)
+        return lut[indexes]
 
-                plt.figure()
-                plt.imshow(view_data["data"], cmap=configs["cmap"])
-                plt.title(f"{configs['title']} ({power} W, {velocity} m/s)")
-                plt.colorbar()
-                plt.savefig(f"visualizations/{view}/{key}/{index_string}.png")
-                plt.close()
+    def view_visualization_isometric(
+        self,
+        view,
+        example,
+        index,
+        renderer = "voxels",
+        save_frames = True,
+        **kwargs,
+    ):
+        """
+        Generates visualization of 3D isometric view with one of the
+        `ISOMETRIC_RENDERERS`.
+
+        @param renderer: "voxels" (`ax.voxels`), "surface" (triangle mesh of
+        thresholded region), or "projection" (orthographic max intensity
+        projections) -> "voxels"
+        @param save_frames: Also saves frame as `.png` -> True
+        @return: Dictionary of field to RGBA frame.
+        """
+        if renderer not in ISOMETRIC_RENDERERS:
+            raise ValueError(f"Isometric renderer `{renderer}` not supported")
 
-    def view_visualization_isometric(self, view, example, index, **kwargs):
+        frames = {}
         for key, configs in COLUMNS_CONFIG.items():
             if key == "temperature":
                 power, velocity = example["power"][0], example["velocity"][0]
                 title = f"{configs['title']} ({power} W, {velocity} m/s)"
 
-                # Prepare the grid data for plotting
-                values = np.array(example[key][0])
-                mesh = np.transpose(values, (2, 1, 0))  # Transpose to match voxel orientation
-
                 index_string = f"{index}".zfill(4)
 
-                view_file = f"views/{view}/{key}/{index_string}.npz"
-                if os.path.exists(view_file):
-                    view_data = np.load(view_file)
-                    data = view_data["data"]
+                # Reads frame from stacked `.npy` or timestep `.npz` file,
+                # already transposed to `(x, y, z)` voxel orientation.
+                data = self.load_view(view, key, index)
+                if data is not None:
 
-                    threshold = configs["clim"][0]
-                    voxels = data > threshold  # Apply threshold to create a binary voxel structure
+                    norm = Normalize(vmin=configs["clim"][0], vmax=configs["clim"][1])
+                    cmap = matplotlib.colormaps[configs["cmap"]]
 
+                    render_method = getattr(self, f"render_isometric_{renderer}")
+                    fig = render_method(data, configs["clim"][0], norm, cmap)
+                    fig.axes[0].set_title(title)
 
-                    norm = Normalize(vmin=configs["clim"][0], vmax=configs["clim"][1])
-                    cmap = get_cmap(configs["cmap"])
-
-                    normalized_colors = cmap(norm(mesh))
-        
-                    # Plot using Matplotlib's voxels
-                    fig = plt.figure(figsize=(10, 10))
-                    ax = fig.add_subplot(projection='3d')
-                    ax.voxels(
-                        voxels,
-                        facecolors=normalized_colors,
-                        edgecolors=np.clip(2 * normalized_colors - 0.5, 0, 1),
-                        linewidth=0.5
-                    )
+                    # Add color bar
+                    # Create a ScalarMappable to use with the color bar
+                    mappable = ScalarMappable(norm=norm, cmap=cmap)
+                    mappable.set_array([])  # This line is necessary to avoid errors
 
-                    x_dim, y_dim, z_dim = voxels.shape  # Dimensions of the voxel grid
+                    # Add the color bar to the figure
+                    cbar = fig.colorbar(mappable, ax=fig.axes, shrink=0.5, aspect=10)
+                    cbar.set_label(key)
 
-                    ax.set_xlim([0, x_dim])
-                    ax.set_ylim([0, y_dim])
-                    ax.set_zlim([0, z_dim])
+                    # Renders through canvas so frame can be streamed to video.
+                    fig.canvas.draw()
+                    frames[key] = np.array(fig.canvas.buffer_rgba())
+                    plt.close(fig)
 
-                    # Set tick markers every 10 units
-                    ax.set_xticks(np.arange(0, x_dim + 1, 10))
-                    ax.set_yticks(np.arange(0, y_dim + 1, 10))
-                    ax.set_zticks(np.arange(0, z_dim + 1, 10))
+                    if save_frames:
+                        imageio.imwrite(f"visualizations/{view}/{key}/{index_string}.png", frames[key])
 
-                    ax.set(xlabel='X', ylabel='Y', zlabel='Z')
-                    ax.set_title(title)
+        return frames
 
+    @staticmethod
+    def isometric_axes(shape):
+        """
+        Creates 3D axes spanning voxel grid `shape` with equal aspect ratio.
+        """
+        fig = plt.figure(figsize=(10, 10))
+        ax = fig.add_subplot(projection='3d')
 
-                    # Calculate the maximum extent for equal aspect ratio
-                    max_extent = max(x_dim, y_dim, z_dim)
+        x_dim, y_dim, z_dim = shape  # Dimensions of the voxel grid
 
-                    # Center and scale each axis to have equal aspect ratio
-                    ax.set_box_aspect((x_dim / max_extent, y_dim / max_extent, z_dim / max_extent))
-                    # ax.set_aspect('auto')
+        ax.set_xlim([0, x_dim])
+        ax.set_ylim([0, y_dim])
+        ax.set_zlim([0, z_dim])
 
-                    # Add color bar
-                    # Create a ScalarMappable to use with the color bar
-                    mappable = ScalarMappable(norm=norm, cmap=cmap)
-                    mappable.set_array([])  # This line is necessary to avoid errors
+        # Set tick markers every 10 units
+        ax.set_xticks(np.arange(0, x_dim + 1, 10))
+        ax.set_yticks(np.arange(0, y_dim + 1, 10))
+        ax.set_zticks(np.arange(0, z_dim + 1, 10))
 
-                    # Add the color bar to the figure
-                    cbar = fig.colorbar(mappable, ax=ax, shrink=0.5, aspect=10)
-                    cbar.set_label(key)
+        ax.set(xlabel='X', ylabel='Y', zlabel='Z')
+
+        # Calculate the maximum extent for equal aspect ratio
+        max_extent = max(x_dim, y_dim, z_dim)
+
+        # Center and scale each axis to have equal aspect ratio
+        ax.set_box_aspect((x_dim / max_extent, y_dim / max_extent, z_dim / max_extent))
+
+        return fig, ax
+
+    def render_isometric_voxels(self, data, threshold, norm, cmap):
+        """
+        Draws each voxel above `threshold` with `ax.voxels`.
+        """
+        voxels = data > threshold  # Apply threshold to create a binary voxel structure
+
+        # Colormap is only evaluated for the voxels that are drawn.
+        normalized_colors = np.zeros((*voxels.shape, 4))
+        normalized_colors[voxels] = cmap(norm(data[voxels]))
+
+        fig, ax = self.isometric_axes(voxels.shape)
+        ax.voxels(
+            voxels,
+            facecolors=normalized_colors,
+            edgecolors=np.clip(2 * normalized_colors - 0.5, 0, 1),
+            linewidth=0.5
+        )
+
+        return fig
 
-                    # Save or display each plot
-                    plt.savefig(f"visualizations/isometric/{key}/{index_string}.png")
-                    plt.close(fig)
\ No newline at end of file
+    def render_isometric_surface(self, data, threshold, norm, cmap):
+        """
+        Draws the boundary of the region above `threshold` as a single
+        triangle mesh from marching cubes, each face is colored by the
+        hottest voxel at its vertices.
+        """
+        fig, ax = self.isometric_axes(data.shape)
+
+        if not (data > threshold).any():
+            return fig
+
+        # Pads below threshold so regions touching the domain are closed.
+        padded = np.pad(data, 1, constant_values=min(data.min(), threshold) - 1)
+        vertices, faces, _, _ = measure.marching_cubes(padded, level=threshold)
+        vertices -= 1
+
+        # Vertices lie on the threshold, samples neighboring voxel centers.
+        lower = np.clip(np.floor(vertices).astype(int), 0, np.array(data.shape) - 1)
+        upper = np.clip(np.ceil(vertices).astype(int), 0, np.array(data.shape) - 1)
+        vertex_values = np.maximum(
+            data[lower[:, 0], lower[:, 1], lower[:, 2]],
+            data[upper[:, 0], upper[:, 1], upper[:, 2]],
+        )
+        face_colors = cmap(norm(vertex_values[faces].max(axis=1)))
+
+        # Voxel centers are offset by half a cell from `ax.voxels` corners.
+        mesh = Poly3DCollection(vertices[faces] + 0.5, linewidth=0)
+        mesh.set_facecolor(face_colors)
+        ax.add_collection3d(mesh)
+
+        return fig
+
+    @staticmethod
+    def render_isometric_projection(data, threshold, norm, cmap):
+        """
+        Draws orthographic maximum intensity projections of the region above
+        `threshold` along each axis.
+        """
+        fig, axes = plt.subplots(3, 1, figsize=(10, 10))
+
+        projections = [
+            (data.max(axis=2).T, "X", "Y"),
+            (data.max(axis=1).T, "X", "Z"),
+            (data.max(axis=0).T, "Y", "Z"),
+        ]
+
+        for ax, (projection, xlabel, ylabel) in zip(axes, projections):
+            ax.imshow(
+                np.ma.masked_less_equal(projection, threshold),
+                cmap=cmap,
+                norm=norm,
+                origin="lower",
+            )
+            ax.set(xlabel=xlabel, ylabel=ylabel)
+
+        return fig
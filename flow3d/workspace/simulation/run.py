@@ -56,7 +56,7 @@ class WorkspaceSimulationRun:
         """
 
         self.simulation_run(name, use_wandb, **kwargs)
-        self.simulation_postprocess(name)
+        self.simulation_postprocess(name, num_proc=num_proc)
         self.simulation_visualize(name, num_proc=num_proc)
         self.simulation_generate_dataset(name)
         if upload:
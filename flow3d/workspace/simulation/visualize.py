@@ -85,4 +85,43 @@ class WorkspaceSimulationVisualize:
                 num_proc = num_proc,
                 working_dir = s_dir_path,
                 **kwargs
-            )
\ No newline at end of file
+            )
+
+    @WorkspaceUtils.with_simulations
+    def visualize_all_generate_previews(
+            self,
+            num_proc = 1,
+            views = ["cross_section_xy", "cross_section_xz", "cross_section_yz"],
+            video_format = "gif",
+            scale = 4,
+            **kwargs
+        ):
+        """
+        Method to quickly generate preview videos of cross section views for
+        simulations within workspace, frames are mapped directly to colors
+        without figures or intermediate `.png` files.
+
+        @param num_proc: Number of processes to use per simulation.
+        @param views: Cross section views with generated views.
+        @param video_format: "gif", "mp4", or "webp" -> "gif"
+        @param scale: Pixels per cell -> 4
+        """
+
+        simulations = kwargs.pop("simulations")
+
+        for simulation in tqdm(simulations):
+            s_dir_path = os.path.join(self.workspace_path, simulation.name)
+            simulation.prepare_view_visualizations(
+                views = views,
+                working_dir = s_dir_path,
+            )
+            simulation.generate_views_visualizations(
+                views = views,
+                num_proc = num_proc,
+                video_format = video_format,
+                save_frames = False,
+                frame_mode = "raw",
+                scale = scale,
+                working_dir = s_dir_path,
+                **kwargs
+            )
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+# Raw `flslnk.tmp` columns in the order written by FLOW-3D.
+FLSLNK_TMP_COLUMNS = [
+    "x", "y", "z", "p", "tn", "scl4", "scl5", "scl6", "scl7", "scl8",
+    "nfs", "u", "v", "w", "f", "rho",
+]
+
+@pytest.fixture
+def write_flslnk_tmp():
+    """
+    Writes a synthetic `flslnk.tmp` with a metadata chunk, one chunk per
+    time, and an incomplete trailing chunk which is never converted.
+    """
+    def write(path, times, nx = 4, ny = 3, nz = 3, seed = 0):
+        rng = np.random.default_rng(seed)
+        z, y, x = np.meshgrid(
+            np.arange(nz) * 0.002,
+            np.arange(ny) * 0.002,
+            np.arange(nx) * 0.002,
+            indexing = "ij",
+        )
+        coordinates = np.stack([x.ravel(), y.ravel(), z.ravel()], axis=1)
+        extents = f"ix=2 to {nx + 1}   jy=2 to {ny + 1}  kz=2 to {nz + 1}"
+
+        lines = [" metadata header\n", " version 1\n", "\n"]
+        for t in [*times, times[-1] * 2]:
+            values = rng.uniform(0, 3000, (len(coordinates), len(FLSLNK_TMP_COLUMNS) - 3))
+            lines += [
+                " plot data\n",
+                f"  printing tn, scl4 and nfs  t={t:.8E}  {extents}\n",
+                f" 2  2  {t:.3E}  {t:.3E}  2  {nx + 1}  2  {ny + 1}  2  {nz + 1}\n",
+                "  " + "  ".join(FLSLNK_TMP_COLUMNS) + "\n",
+            ]
+            lines += [
+                "  " + "  ".join(f"{value:.6E}" for value in row) + "\n"
+                for row in np.concatenate([coordinates, values], axis=1)
+            ]
+            lines.append("\n")
+
+        with open(path, "w") as f:
+            f.writelines(lines)
+
+    return write
@@ -0,0 +1,80 @@
+import numpy as np
+import os
+
+from flow3d import Simulation
+
+def write_flslnk_npz(npz_dir_path, length = 3):
+    npz_dir_path.mkdir(exist_ok = True)
+    for index in range(length):
+        np.savez_compressed(
+            npz_dir_path / f"{index + 1}".zfill(8),
+            temperature = np.full((1, 2, 3), index, dtype=np.float32),
+            pressure = np.full((1, 2, 3), -index, dtype=np.float32),
+            timestep = [index * 1E-6],
+        )
+
+def test_flslnk_cache_validity(tmp_path, monkeypatch):
+    """
+    Tests cache is valid for cached fields and invalidated by source changes.
+    """
+    monkeypatch.chdir(tmp_path)
+    s = Simulation()
+    write_flslnk_npz(tmp_path / "flslnk_npz")
+    assert not s.is_flslnk_cache_valid()
+
+    fields = s.load_flslnk_cache(working_dir = str(tmp_path))
+    assert sorted(fields.keys()) == ["pressure", "temperature", "timestep"]
+    assert fields["temperature"].shape == (3, 2, 3)
+    assert np.array_equal(fields["temperature"][:, 0, 0], [0, 1, 2])
+    assert s.is_flslnk_cache_valid(["temperature"])
+    assert not s.is_flslnk_cache_valid(["temperature", "melt_region"])
+
+    # Touching a source file changes the signature even with the same size.
+    npz_path = tmp_path / "flslnk_npz" / "00000002.npz"
+    stat = os.stat(npz_path)
+    os.utime(npz_path, ns = (stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert not s.is_flslnk_cache_valid()
+
+    s.load_flslnk_cache(["temperature"], working_dir = str(tmp_path))
+    assert s.is_flslnk_cache_valid()
+
+def test_load_flslnk_cache_subset(tmp_path, monkeypatch):
+    """
+    Tests loading fields outside the cache keeps previously cached fields.
+    """
+    monkeypatch.chdir(tmp_path)
+    s = Simulation()
+    write_flslnk_npz(tmp_path / "flslnk_npz")
+
+    fields = s.load_flslnk_cache(["temperature"], working_dir = str(tmp_path))
+    assert list(fields.keys()) == ["temperature"]
+    assert s.read_flslnk_cache_manifest()["keys"] == ["temperature"]
+
+    fields = s.load_flslnk_cache(["pressure", "timestep"], working_dir = str(tmp_path))
+    assert list(fields.keys()) == ["pressure", "timestep"]
+    assert np.array_equal(fields["pressure"][:, 1, 2], [0, -1, -2])
+    assert sorted(s.read_flslnk_cache_manifest()["keys"]) == [
+        "pressure", "temperature", "timestep"
+    ]
+    assert s.is_flslnk_cache_valid(["temperature", "pressure"])
+
+def test_flslnk_cache_stale_zip(tmp_path, monkeypatch):
+    """
+    Tests cache read from the folder is invalidated by folder changes even
+    when an unchanged `flslnk_npz.zip` is present.
+    """
+    monkeypatch.chdir(tmp_path)
+    s = Simulation()
+    write_flslnk_npz(tmp_path / "flslnk_npz")
+    s.zip_folder("flslnk_npz", "flslnk_npz.zip")
+
+    s.load_flslnk_cache(working_dir = str(tmp_path))
+    assert s.read_flslnk_cache_manifest()["signature"]["source"] == "flslnk_npz"
+    assert s.is_flslnk_cache_valid()
+
+    # Reconverted folder with a stale zip left behind.
+    write_flslnk_npz(tmp_path / "flslnk_npz", length = 4)
+    assert not s.is_flslnk_cache_valid()
+
+    fields = s.load_flslnk_cache(working_dir = str(tmp_path))
+    assert fields["temperature"].shape == (4, 2, 3)
@@ -0,0 +1,74 @@
+import os
+import pytest
+
+from flow3d import Simulation
+
+@pytest.mark.parametrize("compression", ["store", "deflate", "bzip2", "lzma", "zstd"])
+def test_zip_file_round_trip(tmp_path, monkeypatch, compression):
+    """
+    Tests each codec of `zip_file` decompresses back to the original file.
+    """
+    if compression == "zstd":
+        pytest.importorskip("zstandard")
+
+    monkeypatch.chdir(tmp_path)
+    s = Simulation()
+    content = b"".join(f"{index} flslnk\n".encode() for index in range(10000))
+    with open("flslnk.tmp", "wb") as f:
+        f.write(content)
+
+    destination = s.zip_file("flslnk.tmp", "flslnk.zip", compression = compression)
+
+    # Zstandard frames are not `.zip` archives and use their own suffix.
+    expected = "flslnk.zst" if compression == "zstd" else "flslnk.zip"
+    assert destination == expected
+    assert sorted(os.listdir()) == sorted(["flslnk.tmp", expected])
+
+    os.remove("flslnk.tmp")
+    s.unzip_file("flslnk.zip", "flslnk.tmp")
+    with open("flslnk.tmp", "rb") as f:
+        assert f.read() == content
+
+    with s.open_flslnk("missing.tmp", "flslnk.zip") as lines:
+        assert "".join(lines).encode() == content
+
+def test_zip_file_unknown_compression(tmp_path):
+    s = Simulation()
+    source = tmp_path / "flslnk.tmp"
+    source.write_text("flslnk")
+
+    with pytest.raises(ValueError, match="not supported"):
+        s.zip_file(str(source), str(tmp_path / "flslnk.zip"), compression = "zip")
+
+def test_unzip_folder_replaces_stale_files(tmp_path):
+    """
+    Tests unchanged files are skipped while stale files of the same size are
+    extracted again.
+    """
+    import zipfile
+
+    s = Simulation()
+    source = tmp_path / "flslnk_npz"
+    source.mkdir()
+    (source / "00000001.npz").write_bytes(b"first")
+    (source / "00000002.npz").write_bytes(b"other")
+    s.zip_folder(str(source), f"{source}.zip")
+
+    destination = tmp_path / "unzipped"
+    s.unzip_folder(f"{source}.zip", str(destination))
+    assert (destination / "00000001.npz").read_bytes() == b"first"
+
+    # Same sized file left by an earlier extraction of another archive.
+    stale_path = destination / "00000002.npz"
+    mtime = os.path.getmtime(stale_path) - 3600
+    stale_path.write_bytes(b"stale")
+    os.utime(stale_path, (mtime, mtime))
+
+    with zipfile.ZipFile(f"{source}.zip") as zip_ref:
+        extracted = [
+            s.extract_member(zip_ref, info, str(destination))
+            for info in zip_ref.infolist()
+        ]
+
+    assert extracted == [False, True]
+    assert (destination / "00000002.npz").read_bytes() == b"other"
@@ -0,0 +1,56 @@
+import numpy as np
+
+from flow3d import Simulation
+
+def test_generate_laser_crops(tmp_path, monkeypatch):
+    """
+    Tests crop windows follow a moving hot spot and are shifted back within
+    the domain at both edges.
+    """
+    monkeypatch.chdir(tmp_path)
+    s = Simulation()
+    mesh_x = np.arange(20) * 0.001
+    np.savez(
+        "mesh_x_y_z.npz",
+        x = mesh_x,
+        y = np.arange(4) * 0.001,
+        z = np.arange(3) * 0.001,
+    )
+
+    # Laser moves 4 cells per timestep at 1 m/s, leaving the domain last.
+    npz_dir_path = tmp_path / "flslnk_npz"
+    npz_dir_path.mkdir()
+    laser_indexes = []
+    for index in range(6):
+        timestep = index * 4E-5
+        laser_index = min(4 * index, len(mesh_x) - 1)
+        temperature = np.full((1, 3, 4, len(mesh_x)), 300.0)
+        temperature[0, :, :, laser_index] = 3000.0
+        np.savez_compressed(
+            npz_dir_path / f"{index + 1}".zfill(8),
+            temperature = temperature,
+            timestep = [timestep],
+            velocity = [1.0],
+        )
+        laser_indexes.append(laser_index)
+
+    s.generate_laser_crops(
+        window_x = (3, 2),
+        crop_y = (1, 3),
+        laser_start_x = 0.0005,
+        working_dir = str(tmp_path),
+    )
+    crops, offsets_df = s.load_laser_crops(working_dir = str(tmp_path))
+
+    assert crops["temperature"].shape == (6, 3, 2, 5)
+    assert offsets_df["laser_index"].tolist() == laser_indexes
+
+    # Window starts at the domain edge, follows the laser, then stops at the
+    # far edge of the domain.
+    assert offsets_df["x_start"].tolist() == [0, 1, 5, 9, 13, 15]
+    assert (offsets_df["x_end"] - offsets_df["x_start"]).unique().tolist() == [5]
+
+    for index, row in offsets_df.iterrows():
+        crop = crops["temperature"][index]
+        hot = np.flatnonzero(crop[0, 0] == 3000.0)
+        assert hot.tolist() == [row["laser_index"] - row["x_start"]]
@@ -0,0 +1,58 @@
+import numpy as np
+import os
+
+from flow3d import Simulation
+
+def test_read_flslnk_timestep(tmp_path, monkeypatch, write_flslnk_tmp):
+    """
+    Tests indexed reads of `flslnk.tmp` match sequentially parsed chunks.
+    """
+    monkeypatch.chdir(tmp_path)
+    s = Simulation()
+    s.power, s.velocity = 100, 1.0
+    times = [1E-6, 2E-6, 3E-6]
+    write_flslnk_tmp("flslnk.tmp", times)
+
+    with open("flslnk.tmp", "r") as f:
+        expected = [
+            s.flslnk_chunk_to_numpy(chunk_lines)
+            for _, chunk_lines in s.iter_flslnk_timestep_chunks(s.iter_flslnk_chunks(f))
+        ]
+
+    index_df = s.load_flslnk_index(working_dir = str(tmp_path))
+    assert index_df["t"].tolist() == times
+
+    for index, row_dict in enumerate(expected):
+        indexed = s.read_flslnk_timestep(index, working_dir = str(tmp_path))
+        assert indexed.keys() == row_dict.keys()
+        for key, value in row_dict.items():
+            assert np.array_equal(indexed[key], np.array(value))
+
+    in_range = list(s.read_flslnk_time_range(2E-6, 3E-6, working_dir = str(tmp_path)))
+    assert [index for index, _ in in_range] == [1, 2]
+    assert [row_dict["timestep"][0] for _, row_dict in in_range] == [2E-6, 3E-6]
+    assert np.array_equal(in_range[0][1]["temperature"], np.array(expected[1]["temperature"]))
+
+def test_load_flslnk_index_invalidation(tmp_path, monkeypatch, write_flslnk_tmp):
+    """
+    Tests index is rebuilt once `flslnk.tmp` changes.
+    """
+    monkeypatch.chdir(tmp_path)
+    s = Simulation()
+    s.power, s.velocity = 100, 1.0
+    write_flslnk_tmp("flslnk.tmp", [1E-6, 2E-6])
+    assert len(s.load_flslnk_index(working_dir = str(tmp_path))) == 2
+
+    # Same sized rewrite is only detected by modification time.
+    write_flslnk_tmp("flslnk.tmp", [1E-6, 2E-6], seed = 1)
+    stat = os.stat("flslnk.tmp")
+    os.utime("flslnk.tmp", ns = (stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    index_df = s.load_flslnk_index(working_dir = str(tmp_path))
+    assert index_df["flslnk_mtime_ns"].iloc[0] == stat.st_mtime_ns + 10**9
+
+    write_flslnk_tmp("flslnk.tmp", [1E-6, 2E-6, 3E-6, 4E-6])
+    index_df = s.load_flslnk_index(working_dir = str(tmp_path))
+    assert index_df["t"].tolist() == [1E-6, 2E-6, 3E-6, 4E-6]
+
+    row_dict = s.read_flslnk_timestep(3, working_dir = str(tmp_path))
+    assert row_dict["timestep"] == [4E-6]
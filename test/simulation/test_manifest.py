@@ -0,0 +1,135 @@
+import os
+import pytest
+
+from flow3d import Simulation
+from flow3d.simulation.utils.decorators import SimulationUtilsDecorators
+
+def test_is_stage_completed(tmp_path, monkeypatch):
+    """
+    Tests skipping of a stage with unchanged inputs, parameters, and outputs.
+    """
+    s = Simulation()
+    monkeypatch.chdir(tmp_path)
+
+    (tmp_path / "input.txt").write_text("input")
+    inputs = ["input.txt", "removed.txt"]
+    parameters = {"keys": ["temperature"]}
+
+    s.begin_stage("stage", inputs, parameters)
+    assert not s.is_stage_completed("stage", inputs, parameters, [])
+
+    # Stage is left incomplete while an output is missing.
+    s.complete_stage("stage", ["output.txt"])
+    assert not s.is_stage_completed("stage", inputs, parameters, ["output.txt"])
+
+    (tmp_path / "output.txt").write_text("output")
+    s.complete_stage("stage", ["output.txt"])
+    assert s.is_stage_completed("stage", inputs, parameters, ["output.txt"])
+
+    # Removed inputs are not considered changed.
+    os.remove("input.txt")
+    assert s.is_stage_completed("stage", inputs, parameters, ["output.txt"])
+
+    assert not s.is_stage_completed("stage", inputs, {"keys": None}, ["output.txt"])
+
+    (tmp_path / "input.txt").write_text("changed input")
+    assert not s.is_stage_completed("stage", inputs, parameters, ["output.txt"])
+
+def test_track_stage_progress(tmp_path, monkeypatch):
+    """
+    Tests that progress is resumed from an interrupted attempt only.
+    """
+    s = Simulation()
+    monkeypatch.chdir(tmp_path)
+
+    s.begin_stage("stage", [], {})
+    with s.track_stage_progress("stage", iter(range(5))) as results:
+        for result in results:
+            if result == 2:
+                break
+
+    # Third result was not consumed before interruption.
+    assert s.read_stage_progress("stage") == 2
+
+    s.begin_stage("stage", [], {})
+    assert s.read_stage_progress("stage") == 2
+
+    s.begin_stage("stage", [], {"keys": None})
+    assert s.read_stage_progress("stage") == 0
+
+def test_track_stage_progress_batched(tmp_path, monkeypatch):
+    """
+    Tests progress is written every `interval` seconds rather than per
+    result, and once more on error.
+    """
+    s = Simulation()
+    monkeypatch.chdir(tmp_path)
+    s.begin_stage("stage", [], {})
+
+    writes = []
+    write_stage_manifest = s.write_stage_manifest
+    def write(stage, manifest):
+        writes.append(manifest["progress"])
+        write_stage_manifest(stage, manifest)
+    monkeypatch.setattr(s, "write_stage_manifest", write)
+
+    with pytest.raises(RuntimeError):
+        with s.track_stage_progress("stage", iter(range(100))) as results:
+            for result in results:
+                if result == 50:
+                    raise RuntimeError("interrupted")
+
+    assert writes == [50]
+    assert s.read_stage_progress("stage") == 50
+
+    writes.clear()
+    with s.track_stage_progress("stage", iter(range(3)), 50, interval = 0) as results:
+        for result in results:
+            pass
+    assert writes == [51, 52, 53]
+
+class StageSimulation(Simulation):
+
+    @SimulationUtilsDecorators.stage_manifest(
+        "stage",
+        inputs = lambda self, arguments: ["input.txt"],
+        outputs = lambda self, arguments: ["output.txt"],
+        parameters = ["value"],
+    )
+    def run_stage(self, value = 1, fail = False, **kwargs):
+        self.calls += 1
+
+        if fail:
+            return None
+
+        with open("output.txt", "w") as f:
+            f.write(f"{value}")
+
+        return self
+
+def test_stage_manifest(tmp_path, monkeypatch):
+    """
+    Tests stage is skipped when up to date, rerun with `force`, changed
+    parameters, and left incomplete on failure.
+    """
+    monkeypatch.chdir(tmp_path)
+    s = StageSimulation()
+    s.calls = 0
+    (tmp_path / "input.txt").write_text("input")
+
+    s.run_stage()
+    s.run_stage()
+    assert s.calls == 1
+
+    s.run_stage(force = True)
+    assert s.calls == 2
+
+    s.run_stage(value = 2)
+    assert s.calls == 3
+
+    # Failed attempt is not recorded as completed even with outputs present.
+    s.run_stage(value = 3, fail = True)
+    assert not s.read_stage_manifest("stage")["completed"]
+    s.run_stage(value = 3)
+    s.run_stage(value = 3)
+    assert s.calls == 5
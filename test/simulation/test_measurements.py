@@ -0,0 +1,153 @@
+import numpy as np
+import pytest
+
+from skimage import measure
+
+from flow3d import Simulation
+
+def test_label_max_blobs():
+    """
+    Tests batched labeling against `skimage` labeling of each frame.
+    """
+    s = Simulation()
+    rng = np.random.default_rng(0)
+    projections = rng.uniform(size=(6, 12, 15)) > 0.6
+
+    # Empty frame has no blobs.
+    projections[2] = False
+
+    labels = s.label_max_blobs(projections)
+
+    for index, projection in enumerate(projections):
+        labels_all = measure.label(projection)
+        assert np.array_equal(labels["labels_all"][index], labels_all)
+
+        regionprops = measure.regionprops(labels_all)
+        if len(regionprops) == 0:
+            assert not labels["labels_max_blob"][index].any()
+            continue
+
+        blob_max = max(regionprops, key=lambda blob: blob.area)
+        assert tuple(labels["bbox"][index]) == blob_max.bbox
+        assert np.array_equal(
+            labels["labels_max_blob"][index],
+            np.where(labels_all == blob_max.label, 1, 0),
+        )
+
+def test_measure_melt_pool_3d():
+    """
+    Tests 3D metrics of a box of voxels on a non-uniform mesh.
+    """
+    s = Simulation()
+    thresholded = np.zeros((2, 6, 6, 8), dtype=bool)
+    thresholded[0, 1:3, 2:4, 2:6] = True
+
+    # `x` cells widen from 1 cm to 2 cm, edges are midway between ticks.
+    mesh_x_y_z = {
+        "x": np.array([0.5, 1.5, 2.5, 3.5, 5, 7, 9, 11]),
+        "y": np.arange(6) + 0.5,
+        "z": np.arange(6) + 0.5,
+    }
+
+    metrics = s.measure_melt_pool_3d(thresholded, mesh_x_y_z)
+
+    # 2 (z) x 2 (y) x 6 (x) cm, converted to meters.
+    assert np.isclose(metrics["volume_m3"][0], 24E-6)
+    assert np.isclose(metrics["length_3d_m"][0], 0.06)
+    assert np.isclose(metrics["width_3d_m"][0], 0.02)
+    assert np.isclose(metrics["depth_3d_m"][0], 0.02)
+    widths_x = np.array([1, 1.25, 1.75, 2])
+    centroid_x = np.sum(widths_x * mesh_x_y_z["x"][2:6]) / 6
+    assert np.isclose(metrics["centroid_x_m"][0], centroid_x * 1E-2)
+    assert np.isclose(metrics["aspect_ratio_length_width"][0], 3)
+    assert metrics["surface_area_m2"][0] > 0
+
+    # Empty timestep has no volume or extent.
+    assert metrics["volume_m3"][1] == 0
+    assert metrics["length_3d_m"][1] == 0
+
+def test_measure_melt_pool_3d_boundary():
+    """
+    Tests surfaces of regions touching the domain boundary are closed.
+    """
+    s = Simulation()
+    thresholded = np.zeros((2, 6, 6, 8), dtype=bool)
+    thresholded[0, 2:4, 2:4, 3:6] = True
+    thresholded[1, 4:6, 0:2, 0:3] = True
+
+    mesh_x_y_z = {axis: np.arange(size) + 0.5 for axis, size in zip("zyx", (6, 6, 8))}
+    metrics = s.measure_melt_pool_3d(thresholded, mesh_x_y_z)
+
+    # Same box in a corner of the domain has the same surface as within it.
+    assert metrics["surface_area_m2"][0] > 0
+    assert np.isclose(metrics["surface_area_m2"][1], metrics["surface_area_m2"][0])
+    assert np.isclose(metrics["volume_m3"][1], metrics["volume_m3"][0])
+
+    with pytest.raises(ValueError, match="at least 2 ticks"):
+        s.mesh_cell_edges(np.array([0.5]))
+
+def test_encode_rle():
+    """
+    Tests run length encoding round trip of binary masks.
+    """
+    s = Simulation()
+    rng = np.random.default_rng(0)
+
+    for mask in [
+        rng.uniform(size=(7, 9)) > 0.5,
+        np.ones((3, 4), dtype=bool),
+        np.zeros((3, 4), dtype=bool),
+    ]:
+        runs = s.encode_rle(mask)
+        assert runs.sum() == mask.size
+        assert np.array_equal(s.decode_rle(runs, mask.shape), mask.astype(int))
+
+def test_melt_pool_thresholds():
+    """
+    Tests each measured field thresholds to its own bounded blob.
+    """
+    s = Simulation()
+    shape = (8, 10, 12)
+    boxes = {
+        "temperature": (slice(5, 8), slice(3, 6), slice(2, 6)),
+        "fraction_of_fluid": (slice(4, 5), slice(1, 4), slice(7, 12)),
+    }
+
+    fields = {
+        "temperature": np.full(shape, 300.0),
+        "fraction_of_fluid": np.zeros(shape),
+    }
+    fields["temperature"][boxes["temperature"]] = 2500.0
+
+    # Filled below the free surface with a partially filled depression.
+    fields["fraction_of_fluid"][:5] = 1.0
+    fields["fraction_of_fluid"][boxes["fraction_of_fluid"]] = 0.5
+
+    thresholds = s.melt_pool_thresholds()
+    assert sorted(thresholds.keys()) == ["fraction_of_fluid", "temperature"]
+
+    bboxes = []
+    for key, (box_z, box_y, box_x) in boxes.items():
+        measured, planes, _ = s.measure_melt_pool_batch(
+            fields[key][np.newaxis],
+            thresholds[key],
+        )
+        assert measured.tolist() == [True]
+
+        # Projections are flipped along both axes.
+        ny, nx = shape[1], shape[2]
+        expected = (ny - box_y.stop, nx - box_x.stop, ny - box_y.start, nx - box_x.start)
+        assert tuple(planes["xy"]["bbox"][0]) == expected
+        assert planes["xy"]["labels_max_blob"][0].sum() == \
+            (box_y.stop - box_y.start) * (box_x.stop - box_x.start)
+        bboxes.append(expected)
+
+    assert len(set(bboxes)) == len(boxes)
+
+    # Hydrostatic head (8 g/cm^3) puts every fluid cell just above ambient
+    # (`pvoid`), so thresholding at ambient measures the whole fluid region.
+    fluid = fields["fraction_of_fluid"] > 0
+    depth = (5 - np.arange(shape[0]))[:, np.newaxis, np.newaxis] * 0.002
+    pressure = np.where(fluid, 1.0130e+06 + 8 * 981 * depth, 1.0130e+06)
+    assert np.array_equal(s.threshold_values(pressure, 1.0130e+06), fluid)
+    assert "pressure" not in thresholds
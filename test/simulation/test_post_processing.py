@@ -0,0 +1,343 @@
+import functools
+import numpy as np
+import os
+import pandas as pd
+import pytest
+
+from flow3d import Simulation
+
+def flslnk_df(nx = 4, ny = 3, nz = 3):
+    """
+    Builds renamed `flslnk` rows ordered by `z`, `y`, then `x`.
+    """
+    z, y, x = np.meshgrid(
+        np.arange(nz) * 0.002,
+        np.arange(ny) * 0.002,
+        np.arange(nx) * 0.002,
+        indexing = "ij",
+    )
+    size = nx * ny * nz
+    df = pd.DataFrame({"x": x.ravel(), "y": y.ravel(), "z": z.ravel()})
+    for index, key in enumerate([
+        "pressure", "temperature", "melt_region", "temperature_gradient",
+        "liquid_label", "fraction_of_fluid", "dtdx", "dtdy", "dtdz",
+        "vx", "vy", "vz",
+    ]):
+        df[key] = np.arange(size, dtype=float) + index * size
+    return df
+
+def test_df_to_numpy():
+    """
+    Tests reshaping of flat `flslnk` rows into `(z, y, x)` grids.
+    """
+    s = Simulation()
+    df = flslnk_df()
+    arrays = s.df_to_numpy(df)
+
+    # Last `z` plane is dropped to match previously generated `.npz` files.
+    assert np.array(arrays["temperature"]).shape == (1, 2, 3, 4)
+    assert np.array(arrays["x_y_z"]).shape == (1, 2, 3, 4, 3)
+
+    temperature = arrays["temperature"][0]
+    expected = df["temperature"].to_numpy().reshape(3, 3, 4)[:2]
+    assert np.array_equal(temperature, expected)
+
+    x_y_z = arrays["x_y_z"][0]
+    assert np.array_equal(x_y_z[1, 2, 3], [0.006, 0.004, 0.002])
+
+    # Row order within the dataframe should not matter.
+    shuffled = s.df_to_numpy(df.sample(frac=1, random_state=0))
+    for key, value in arrays.items():
+        assert np.array_equal(shuffled[key][0], value[0])
+
+def test_iter_flslnk_chunks():
+    """
+    Tests splitting and parsing of `flslnk.tmp` timestep chunks.
+    """
+    s = Simulation()
+    lines = [
+        " metadata\n",
+        "\n",
+        " plot\n",
+        "  printing tn, scl4 and nfs  t=1.00000000E-06  ix=2 to  3   jy=2 to  2  kz=2 to  2\n",
+        " 2  2  1.000E-06  1.000E-06  2  3  2  2  2  2\n",
+        "  x  y  z  tn\n",
+        "  1.0E-03  0.0E+00  0.0E+00  3.0E+02\n",
+        "  2.0E-03  0.0E+00  0.0E+00  4.0E+02\n",
+        "\n",
+        "\n",
+        " footer\n",
+    ]
+
+    chunks = list(s.iter_flslnk_chunks(lines))
+    assert [chunk_index for chunk_index, _ in chunks] == [0, 1, 2]
+
+    metadata, data_df = s.parse_flslnk_chunk(chunks[1][1])
+    assert metadata["t"] == 1E-6
+    assert metadata["ix"] == (2, 3)
+    assert list(data_df.columns) == ["x", "y", "z", "tn"]
+    assert data_df["tn"].tolist() == [300, 400]
+
+def test_select_flslnk_fields():
+    """
+    Tests field selection and dtype casting of converted timesteps.
+    """
+    s = Simulation()
+    row_dict = {
+        **s.df_to_numpy(flslnk_df()),
+        "power": [100],
+        "velocity": [1.0],
+        "timestep": [1E-6],
+    }
+
+    selected = s.select_flslnk_fields(
+        row_dict,
+        keys = ["temperature", "liquid_label"],
+        dtypes = "compact",
+    )
+
+    assert list(selected.keys()) == [
+        "temperature", "liquid_label", "power", "velocity", "timestep"
+    ]
+    assert selected["temperature"][0].dtype == np.float32
+    assert selected["liquid_label"][0].dtype == np.int32
+    assert selected["timestep"] == [1E-6]
+
+    # Fields are unchanged without `keys` or `dtypes`.
+    assert s.select_flslnk_fields(row_dict).keys() == row_dict.keys()
+
+def test_validate_flslnk_keys():
+    """
+    Tests selected fields must exist and include fields read by later stages.
+    """
+    s = Simulation()
+    s.validate_flslnk_keys(None)
+    s.validate_flslnk_keys([
+        "pressure", "temperature", "fraction_of_fluid", "liquid_label", "x_y_z"
+    ])
+
+    with pytest.raises(ValueError, match="Unknown"):
+        s.validate_flslnk_keys(["temperature", "temp"])
+
+    with pytest.raises(ValueError, match="fraction_of_fluid"):
+        s.validate_flslnk_keys(["pressure", "temperature", "liquid_label"])
+
+def test_iter_flslnk_npz(tmp_path):
+    """
+    Tests reading `.npz` files directly from zip matches the unzipped folder.
+    """
+    s = Simulation()
+    npz_dir_path = tmp_path / "flslnk_npz"
+    npz_dir_path.mkdir()
+    for index in [2, 1, 3]:
+        np.savez_compressed(
+            npz_dir_path / f"{index}".zfill(8),
+            temperature = np.full((1, 2, 2), index),
+            timestep = [index],
+        )
+
+    s.zip_folder(npz_dir_path, f"{npz_dir_path}.zip")
+    from_folder = list(s.iter_flslnk_npz(str(npz_dir_path)))
+
+    # Folder is no longer needed once zipped.
+    for npz_file in npz_dir_path.iterdir():
+        npz_file.unlink()
+    npz_dir_path.rmdir()
+    from_zip = list(s.iter_flslnk_npz(str(npz_dir_path), keys = ["temperature"]))
+
+    assert [npz_file for _, npz_file, _ in from_zip] == [
+        "00000001.npz", "00000002.npz", "00000003.npz"
+    ]
+    for (index, _, expected), (_, _, example) in zip(from_folder, from_zip):
+        assert list(example.keys()) == ["temperature"]
+        assert np.array_equal(example["temperature"], expected["temperature"])
+        assert example["temperature"][0, 0, 0] == index + 1
+
+def test_load_flslnk_npz_batch(tmp_path):
+    """
+    Tests batches concatenate consecutive timesteps along the time axis.
+    """
+    s = Simulation()
+    npz_dir_path = tmp_path / "flslnk_npz"
+    npz_dir_path.mkdir()
+    for index in range(5):
+        np.savez_compressed(
+            npz_dir_path / f"{index + 1}".zfill(8),
+            temperature = np.full((1, 2, 2), index),
+            timestep = [index],
+        )
+
+    batches = s.list_flslnk_batches(str(npz_dir_path), 2)
+    assert batches == [
+        ["00000001.npz", "00000002.npz"],
+        ["00000003.npz", "00000004.npz"],
+        ["00000005.npz"],
+    ]
+
+    loaded = [s.load_flslnk_npz_batch(str(npz_dir_path), npz_files) for npz_files in batches]
+    assert loaded[0]["temperature"].shape == (2, 2, 2)
+    assert np.concatenate([batch["timestep"] for batch in loaded]).tolist() == [
+        0, 1, 2, 3, 4
+    ]
+
+def test_open_flslnk_zip(tmp_path):
+    """
+    Tests cached zip files are closed when replaced, evicted, or inherited
+    by a forked process.
+    """
+    import os
+    import zipfile
+
+    from flow3d.simulation.utils.flslnk import FLSLNK_ZIP_REFS
+
+    s = Simulation()
+    s.close_flslnk_zips()
+    zip_paths = []
+    for index in range(5):
+        zip_path = str(tmp_path / f"{index}.zip")
+        with zipfile.ZipFile(zip_path, "w") as zip_ref:
+            zip_ref.writestr("00000001.npz", b"")
+        zip_paths.append(zip_path)
+
+    first = s.open_flslnk_zip(zip_paths[0], 0)
+    assert s.open_flslnk_zip(zip_paths[0], 0) is first
+
+    # Changed modification time reopens the file.
+    reopened = s.open_flslnk_zip(zip_paths[0], 1)
+    assert reopened is not first and first.fp is None
+
+    # Least recently used file is closed once more than 4 are open.
+    for zip_path in zip_paths[1:]:
+        s.open_flslnk_zip(zip_path, 0)
+    assert reopened.fp is None
+    assert list(FLSLNK_ZIP_REFS.keys()) == zip_paths[1:]
+
+    if hasattr(os, "fork"):
+        pid = os.fork()
+        if pid == 0:
+            os._exit(len(FLSLNK_ZIP_REFS))
+        _, status = os.waitpid(pid, 0)
+        assert os.waitstatus_to_exitcode(status) == 0
+        assert len(FLSLNK_ZIP_REFS) == 4
+
+    s.close_flslnk_zips()
+    assert len(FLSLNK_ZIP_REFS) == 0
+
+def test_flslnk_chunk_to_npz_resume(tmp_path, monkeypatch, write_flslnk_tmp):
+    """
+    Tests interrupted conversion resumes at the first unconverted chunk and
+    matches an uninterrupted conversion.
+    """
+    monkeypatch.chdir(tmp_path)
+    s = Simulation()
+    s.power, s.velocity = 100, 1.0
+    write_flslnk_tmp("flslnk.tmp", [1E-6, 2E-6, 3E-6, 4E-6])
+    options = {
+        "delete_output": False,
+        "delete_source": False,
+        "zip_output": False,
+        "working_dir": str(tmp_path),
+    }
+    s.chunk_flslnk(**options)
+
+    expected = {}
+    s.flslnk_chunk_to_npz(npz_dir_path = "expected_npz", **options)
+    for file_name in sorted(os.listdir("expected_npz")):
+        with np.load(os.path.join("expected_npz", file_name)) as npz:
+            expected[file_name] = dict(npz)
+
+    converted = []
+    convert_flslnk_chunk_file = s.convert_flslnk_chunk_file
+    def convert(file_path, *args, fail = False, **kwargs):
+        if fail and len(converted) == 2:
+            raise RuntimeError("interrupted")
+        converted.append(os.path.basename(file_path))
+        return convert_flslnk_chunk_file(file_path, *args, **kwargs)
+
+    monkeypatch.setattr(s, "convert_flslnk_chunk_file", functools.partial(convert, fail = True))
+    with pytest.raises(RuntimeError):
+        s.flslnk_chunk_to_npz(**options)
+    assert s.read_stage_progress("flslnk_chunk_to_npz") == 2
+    assert not s.read_stage_manifest("flslnk_chunk_to_npz")["completed"]
+
+    monkeypatch.setattr(s, "convert_flslnk_chunk_file", convert)
+    s.flslnk_chunk_to_npz(**options)
+    assert len(converted) == 4
+    assert converted[2:] == sorted(os.listdir("flslnk_chunks"))[3:5]
+    assert s.read_stage_manifest("flslnk_chunk_to_npz")["completed"]
+
+    assert sorted(os.listdir("flslnk_npz")) == sorted(expected)
+    for file_name, arrays in expected.items():
+        with np.load(os.path.join("flslnk_npz", file_name)) as npz:
+            for key, value in arrays.items():
+                assert np.array_equal(npz[key], value)
+
+    # Completed stage is skipped.
+    s.flslnk_chunk_to_npz(**options)
+    assert len(converted) == 4
+
+@pytest.mark.parametrize("source", ["flslnk.tmp", "flslnk.zip"])
+def test_flslnk_to_npz_resume(tmp_path, monkeypatch, write_flslnk_tmp, source):
+    """
+    Tests interrupted direct conversion resumes at the first unconverted
+    chunk, matches an uninterrupted conversion, and is skipped once
+    completed.
+    """
+    monkeypatch.chdir(tmp_path)
+    s = Simulation()
+    s.power, s.velocity = 100, 1.0
+    write_flslnk_tmp("flslnk.tmp", [1E-6, 2E-6, 3E-6, 4E-6])
+    options = {
+        "delete_output": False,
+        "delete_source": False,
+        "zip_output": False,
+        "working_dir": str(tmp_path),
+    }
+
+    expected = {}
+    s.flslnk_to_npz(npz_dir_path = "expected_npz", **options)
+    for file_name in sorted(os.listdir("expected_npz")):
+        with np.load(os.path.join("expected_npz", file_name)) as npz:
+            expected[file_name] = dict(npz)
+
+    if source == "flslnk.zip":
+        s.zip_file("flslnk.tmp", "flslnk.zip")
+        os.remove("flslnk.tmp")
+
+    # Chunks streamed from lines or read from byte ranges are both converted
+    # through `convert_flslnk_chunk`.
+    converted = []
+    convert_flslnk_chunk = s.convert_flslnk_chunk
+    def convert(chunk_lines, npz_file_path, *args, fail = False, **kwargs):
+        if fail and len(converted) == 2:
+            raise RuntimeError("interrupted")
+        converted.append(npz_file_path)
+        return convert_flslnk_chunk(chunk_lines, npz_file_path, *args, **kwargs)
+
+    for fail in [True, False]:
+        monkeypatch.setattr(s, "convert_flslnk_chunk", functools.partial(convert, fail = fail))
+
+        if fail:
+            with pytest.raises(RuntimeError):
+                s.flslnk_to_npz(**options)
+            assert s.read_stage_progress("flslnk_to_npz") == 2
+            assert not s.read_stage_manifest("flslnk_to_npz")["completed"]
+        else:
+            s.flslnk_to_npz(**options)
+
+    # Only the remaining chunks are converted when resumed.
+    assert [os.path.basename(path) for path in converted] == [
+        "00000001", "00000002", "00000003", "00000004"
+    ]
+    assert s.read_stage_manifest("flslnk_to_npz")["completed"]
+    assert "flslnk_to_npz" in s.check_status(str(tmp_path))["stages"]
+
+    assert sorted(os.listdir("flslnk_npz")) == sorted(expected)
+    for file_name, arrays in expected.items():
+        with np.load(os.path.join("flslnk_npz", file_name)) as npz:
+            for key, value in arrays.items():
+                assert np.array_equal(npz[key], value)
+
+    # Completed stage is skipped.
+    s.flslnk_to_npz(**options)
+    assert len(converted) == 4
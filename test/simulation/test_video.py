@@ -0,0 +1,48 @@
+import imageio
+import numpy as np
+import pytest
+
+from flow3d import Simulation
+
+FRAMES = [
+    np.full((16, 24, 4), value, dtype=np.uint8) for value in [0, 64, 128, 192, 255]
+]
+
+def test_get_video_writer_gif(tmp_path):
+    """
+    Tests streamed GIF is readable with one image per appended frame.
+    """
+    s = Simulation()
+    path = str(tmp_path / "temperature.gif")
+
+    writer = s.get_video_writer(path, video_format = "gif", fps = 5)
+    for frame in FRAMES:
+        s.append_frame(writer, frame)
+    writer.close()
+
+    frames = imageio.mimread(path)
+    assert len(frames) == len(FRAMES)
+    assert frames[0].shape[:2] == (16, 24)
+    assert [int(frame[0, 0, 0]) for frame in frames] == [0, 64, 128, 192, 255]
+
+@pytest.mark.parametrize("video_format", ["mp4", "webp"])
+def test_get_video_writer_ffmpeg(tmp_path, video_format):
+    """
+    Tests ffmpeg encoded videos are written, requires `imageio-ffmpeg`.
+    """
+    pytest.importorskip("imageio_ffmpeg")
+    s = Simulation()
+    path = tmp_path / f"temperature.{video_format}"
+
+    writer = s.get_video_writer(str(path), video_format = video_format, fps = 5)
+    for frame in FRAMES:
+        s.append_frame(writer, frame)
+    writer.close()
+
+    assert path.stat().st_size > 0
+
+def test_get_video_writer_unknown_format(tmp_path):
+    s = Simulation()
+
+    with pytest.raises(ValueError, match="not supported"):
+        s.get_video_writer(str(tmp_path / "temperature.avi"), video_format = "avi")
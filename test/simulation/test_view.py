@@ -0,0 +1,147 @@
+import numpy as np
+import os
+import pytest
+
+from flow3d import Simulation
+
+def test_find_indices():
+    """
+    Tests vectorized `find_index` over an array of distances.
+    """
+    s = Simulation()
+    mesh = np.linspace(0, 0.1, 11)
+    distances = np.array([-0.01, 0, 0.005, 0.01, 0.055, 0.1, 0.2])
+
+    expected = [s.find_index(distance, mesh) for distance in distances]
+    assert s.find_indices(distances, mesh).tolist() == expected
+
+def test_slice_stack():
+    """
+    Tests fixed and per timestep slicing of `(t, z, y, x)` stacks.
+    """
+    s = Simulation()
+    stack = np.arange(3 * 2 * 4 * 5).reshape(3, 2, 4, 5)
+
+    planes = s.slice_stack(stack, "y", 2)
+    assert planes.shape == (3, 2, 5)
+    assert np.array_equal(planes[1], stack[1, :, 2, :][::-1, ::-1])
+
+    # Follows a different `x` index for each timestep.
+    planes = s.slice_stack(stack, "x", np.array([0, 2, 4]))
+    assert planes.shape == (3, 2, 4)
+    for t, index in enumerate([0, 2, 4]):
+        assert np.array_equal(planes[t], stack[t, :, :, index][::-1, ::-1])
+
+def write_view_npz(npz_dir_path, length = 3, shape = (4, 3, 5)):
+    npz_dir_path.mkdir()
+    for index in range(length):
+        np.savez_compressed(
+            npz_dir_path / f"{index + 1}".zfill(8),
+            **{
+                key: np.full((1, *shape), index, dtype=np.float32)
+                for key in ["pressure", "temperature", "fraction_of_fluid", "liquid_label"]
+            },
+            timestep = [index * 1E-6],
+        )
+
+def test_generate_views_without_mesh(tmp_path, monkeypatch):
+    """
+    Tests `xy` cross sections do not require `mesh_x_y_z.npz`.
+    """
+    monkeypatch.chdir(tmp_path)
+    s = Simulation()
+    s.fluid_region_z_end, s.mesh_size = 0.004, 0.002
+    write_view_npz(tmp_path / "flslnk_npz")
+    for key in ["pressure", "temperature", "fraction_of_fluid", "liquid_label"]:
+        os.makedirs(tmp_path / "views" / "cross_section_xy" / key)
+
+    s.generate_views(views = ["cross_section_xy"], working_dir = str(tmp_path))
+
+    assert not (tmp_path / "mesh_x_y_z.npz").exists()
+    frames = sorted(os.listdir(tmp_path / "views" / "cross_section_xy" / "temperature"))
+    assert len(frames) == 3
+
+def test_generate_views_resume(tmp_path, monkeypatch):
+    """
+    Tests interrupted views resume at the first timestep without frames.
+    """
+    monkeypatch.chdir(tmp_path)
+    s = Simulation()
+    s.fluid_region_z_end, s.mesh_size = 0.004, 0.002
+    write_view_npz(tmp_path / "flslnk_npz", length = 4)
+    for key in ["pressure", "temperature", "fraction_of_fluid", "liquid_label"]:
+        os.makedirs(tmp_path / "views" / "cross_section_xy" / key)
+
+    viewed = []
+    view_flslnk_npz = s.view_flslnk_npz
+    def view(*args, fail = False):
+        if fail and len(viewed) == 2:
+            raise RuntimeError("interrupted")
+        viewed.append(args[2])
+        return view_flslnk_npz(*args)
+
+    monkeypatch.setattr(s, "view_flslnk_npz", lambda *args: view(*args, fail = True))
+    with pytest.raises(RuntimeError):
+        s.generate_views(views = ["cross_section_xy"], working_dir = str(tmp_path))
+    assert s.read_stage_progress("views") == 2
+
+    monkeypatch.setattr(s, "view_flslnk_npz", view)
+    s.generate_views(views = ["cross_section_xy"], working_dir = str(tmp_path))
+    assert viewed == [0, 1, 2, 3]
+    assert s.read_stage_manifest("views")["completed"]
+
+    frames = sorted(os.listdir(tmp_path / "views" / "cross_section_xy" / "temperature"))
+    assert len(frames) == 4
+
+def test_load_view_stack(tmp_path, monkeypatch):
+    """
+    Tests stack is opened once per view and field, and reopened once
+    rewritten.
+    """
+    monkeypatch.chdir(tmp_path)
+    s = Simulation()
+    os.makedirs(tmp_path / "views" / "cross_section_xy")
+    np.save("views/cross_section_xy/temperature.npy", np.arange(6.0).reshape(3, 2))
+
+    stack = s.load_view_stack("cross_section_xy", "temperature")
+    assert s.load_view_stack("cross_section_xy", "temperature") is stack
+    assert s.load_view("cross_section_xy", "temperature", 1).tolist() == [2.0, 3.0]
+
+    np.save("views/cross_section_xy/temperature.npy", -np.arange(6.0).reshape(3, 2))
+    stat = os.stat("views/cross_section_xy/temperature.npy")
+    os.utime("views/cross_section_xy/temperature.npy", ns = (stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert s.load_view("cross_section_xy", "temperature", 1).tolist() == [-2.0, -3.0]
+
+    os.remove("views/cross_section_xy/temperature.npy")
+    assert s.load_view_stack("cross_section_xy", "temperature") is None
+
+def test_generate_view_slices_laser(tmp_path, monkeypatch):
+    """
+    Tests laser following slices start at `beam_x` by default, matching
+    laser crops.
+    """
+    monkeypatch.chdir(tmp_path)
+    s = Simulation()
+    mesh_x = 0.005 + np.arange(10) * 0.01
+    np.savez("mesh_x_y_z.npz", x = mesh_x, y = np.arange(2) * 0.01, z = np.arange(3) * 0.01)
+
+    (tmp_path / "flslnk_npz").mkdir()
+    for index, timestep in enumerate([0.0, 1E-4]):
+        np.savez_compressed(
+            tmp_path / "flslnk_npz" / f"{index + 1}".zfill(8),
+            temperature = np.broadcast_to(np.arange(10.0), (1, 3, 2, 10)),
+            timestep = [timestep],
+            velocity = [1.0],
+        )
+
+    views = s.generate_view_slices(
+        laser_offsets = [0.0],
+        keys = ["temperature"],
+        working_dir = str(tmp_path),
+    )
+    stack = np.load(f"views/{views[0]}/temperature.npy")
+
+    # Laser starts at `beam_x` (0.03 cm) and moves 0.01 cm per timestep.
+    assert s.cgs("beam_x") == 0.03
+    assert stack[0].max() == stack[0].min() == 2
+    assert stack[1].max() == stack[1].min() == 3
@@ -0,0 +1,75 @@
+import matplotlib
+import numpy as np
+
+from matplotlib.colors import Normalize
+
+from flow3d import Simulation
+from flow3d.simulation.visualizations import COLUMNS_CONFIG, CrossSectionFigure
+
+def test_cross_section_figure():
+    """
+    Tests that reused figure renders the same pixels as a new figure.
+    """
+    rng = np.random.default_rng(0)
+    frames = rng.uniform(0, 4000, size=(2, 10, 30))
+    configs = COLUMNS_CONFIG["temperature"]
+
+    figure = CrossSectionFigure(frames.shape[1:], configs)
+    first = figure.render(frames[0], "Frame 0")
+    reused = figure.render(frames[1], "Frame 1")
+
+    expected = CrossSectionFigure(frames.shape[1:], configs).render(frames[1], "Frame 1")
+    assert np.array_equal(reused, expected)
+
+    # Frames are copies that are not overwritten by later renders.
+    assert not np.array_equal(first, reused)
+    assert np.array_equal(
+        first,
+        CrossSectionFigure(frames.shape[1:], configs).render(frames[0], "Frame 0"),
+    )
+
+def test_apply_colormap_lut():
+    """
+    Tests lookup table colors against Matplotlib colormap of each value.
+    """
+    s = Simulation()
+    rng = np.random.default_rng(0)
+    frames = rng.uniform(0, 4000, size=(3, 10, 30))
+    configs = COLUMNS_CONFIG["temperature"]
+
+    # Missing values and values at both ends of `clim`.
+    frames[0, 0, :3] = [np.nan, *configs["clim"]]
+
+    lut = s.colormap_lut(configs["cmap"])
+    norm = Normalize(vmin=configs["clim"][0], vmax=configs["clim"][1])
+    cmap = matplotlib.colormaps[configs["cmap"]]
+    expected = cmap(norm(np.ma.masked_invalid(frames)), bytes=True)[..., :3]
+    assert np.array_equal(expected[0, 0, 0], cmap.get_bad()[:3])
+
+    assert np.array_equal(s.apply_colormap_lut(frames, lut, configs["clim"]), expected)
+
+    # Each cell is repeated into a `scale` x `scale` block of pixels.
+    scaled = s.apply_colormap_lut(frames, lut, configs["clim"], scale = 2)
+    assert scaled.shape == (3, 20, 60, 3)
+    assert np.array_equal(scaled[:, ::2, ::2], expected)
+
+def test_view_visualization_isometric(tmp_path, monkeypatch):
+    """
+    Tests isometric frame renders with the field colormap and colorbar.
+    """
+    import os
+
+    monkeypatch.chdir(tmp_path)
+    s = Simulation()
+    os.makedirs("views/isometric")
+    np.save("views/isometric/temperature.npy", np.full((1, 4, 3, 2), 2500.0))
+
+    frames = s.view_visualization_isometric(
+        "isometric",
+        {"power": [100], "velocity": [1.0]},
+        0,
+        renderer = "projection",
+        save_frames = False,
+    )
+    assert list(frames.keys()) == ["temperature"]
+    assert frames["temperature"].ndim == 3